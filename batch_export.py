@@ -0,0 +1,142 @@
+"""Batch export of many quotations into one ZIP of PDFs
+
+Quotations are rendered in a process pool (ReportLab is pure Python, so threads would
+share one core), and every worker reuses the module-level QuotationTemplate of
+pdf_generator. Finished PDFs are written into the archive in input order while the
+rest render, with only a few per worker in flight, so memory holds a handful of PDFs
+rather than the whole batch.
+
+    result = export_quotations_zip(load_quotations(paths), "month-end.zip")
+    print(f"{result.docs_per_sec:.1f} docs/s")
+
+    python batch_export.py quotes/*.json -o month-end.zip [--workers 4]
+
+A saved quotation is a JSON file holding the table rows (the list kept in
+st.session_state.table_data), or an object with "name" and "rows".
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+from pdf_extraction import default_workers
+from pdf_generator import render_pdf_bytes
+
+# Quotations submitted per worker ahead of the one being written
+IN_FLIGHT_PER_WORKER = 2
+
+_UNSAFE_NAME_RE = re.compile(r'[^\w.-]+')
+
+
+@dataclass
+class BatchExport:
+    """Totals of a batch export, reported after each document"""
+    documents: int = 0
+    pdf_bytes: int = 0       # uncompressed size of the PDFs written
+    seconds: float = 0.0
+
+    @property
+    def docs_per_sec(self):
+        return self.documents / self.seconds if self.seconds else 0.0
+
+
+def load_quotations(paths):
+    """Yield (name, rows) for each saved quotation file, reading one file at a time"""
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            saved = json.load(f)
+        name = os.path.splitext(os.path.basename(path))[0]
+        if isinstance(saved, dict):
+            name, saved = saved.get('name') or name, saved.get('rows', [])
+        yield name, saved
+
+
+def _iter_rendered(quotations, workers):
+    """Yield (name, pdf_bytes) in input order, rendering up to workers quotations at once"""
+    quotations = iter(quotations)
+    if workers <= 1:
+        for name, rows in quotations:
+            yield name, render_pdf_bytes(rows)
+        return
+
+    in_flight = deque()
+    try:
+        # spawn: forking a threaded process (e.g. a Streamlit server) is not safe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            while True:
+                for name, rows in itertools.islice(quotations, workers * IN_FLIGHT_PER_WORKER - len(in_flight)):
+                    in_flight.append((name, rows, executor.submit(render_pdf_bytes, rows)))
+                if not in_flight:
+                    break
+                name, rows, future = in_flight[0]
+                pdf_bytes = future.result()
+                in_flight.popleft()
+                yield name, pdf_bytes
+    except BrokenProcessPool:
+        # Workers could not start (e.g. restricted environment): render the rest here instead
+        for name, rows, _ in in_flight:
+            yield name, render_pdf_bytes(rows)
+        for name, rows in quotations:
+            yield name, render_pdf_bytes(rows)
+
+
+def _archive_name(name, used):
+    """Safe, unique "<name>.pdf" entry name"""
+    base = _UNSAFE_NAME_RE.sub('_', str(name)).strip('._') or 'quotation'
+    entry = f"{base}.pdf"
+    counter = 2
+    while entry in used:
+        entry = f"{base}_{counter}.pdf"
+        counter += 1
+    used.add(entry)
+    return entry
+
+
+def export_quotations_zip(quotations, out, workers=None, on_progress=None):
+    """Render (name, rows) quotations into a ZIP written to out (a path or binary file); returns BatchExport.
+
+    on_progress(BatchExport) is called after each document is added to the archive.
+    """
+    workers = workers or default_workers()
+    result = BatchExport()
+    used = set()
+    start = time.perf_counter()
+    with zipfile.ZipFile(out, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, pdf_bytes in _iter_rendered(quotations, workers):
+            archive.writestr(_archive_name(name, used), pdf_bytes)
+            result.documents += 1
+            result.pdf_bytes += len(pdf_bytes)
+            result.seconds = time.perf_counter() - start
+            if on_progress:
+                on_progress(result)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('quotations', nargs='+', help="saved quotation JSON files")
+    parser.add_argument('-o', '--output', default='quotations.zip', help="ZIP file to write")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="render processes (default: available CPUs; 1 renders in this process)")
+    args = parser.parse_args()
+
+    result = export_quotations_zip(load_quotations(args.quotations), args.output, workers=args.workers)
+    print(f"Exported {result.documents} quotation(s) to {args.output} in {result.seconds:.2f}s "
+          f"({result.docs_per_sec:.1f} docs/s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
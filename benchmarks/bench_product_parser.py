@@ -0,0 +1,126 @@
+"""Rows/second of the product-name parser, before and after the compiled tokenizer
+
+Builds a synthetic catalog (default 10,000 rows) mixing the layouts seen in supplier
+price lists: " - " separated names, space separated names, colour notes, repeated
+names, fragmented words ("imma ble") and amperage split across cells ("8.5A", "m",
+"p"). Each row goes through reconstruct (for split rows) and parse, like
+_parse_pdf_tables does, and the results of both implementations are compared.
+
+    python benchmarks/bench_product_parser.py [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import legacy_product_parser as legacy  # noqa: E402
+import product_parser as compiled  # noqa: E402
+
+NAMES = ['SMPS', 'SMPS Slim', 'Waterproof SMPS', 'DALI Dimmable', 'Dimmable 4 in 1',
+         'Triac Dimmable', 'Constant Current Driver', 'Rain Proof SMPS', 'LED Driver']
+FRAGMENTED = {'Dimmable': ['imma ble', 'dimm able', 'di mmable'], 'Waterproof': ['wa terproof', 'wa ter proof']}
+COLOURS = ['(Black)', '(White)', '(Silver)', '(IP67)']
+VOLTS = [5, 12, 24, 36, 48]
+WATTS = [12, 24, 36, 60, 100, 150, 200, 250, 350, 400]
+
+
+def _amp(volt, watt):
+    return round(watt / volt, 1)
+
+
+def _format_amp(amp, rng):
+    value = f"{amp:g}"
+    return rng.choice([f"{value}Amp", f"{value}A", f"{value} Amp", f"{value} A", f"{value}AMP"])
+
+
+def _name(rng):
+    name = rng.choice(NAMES)
+    for word, fragments in FRAGMENTED.items():
+        if word in name and rng.random() < 0.3:
+            name = name.replace(word, rng.choice(fragments))
+    return name
+
+
+def make_catalog(rows, seed=7):
+    """Return a list of table rows (lists of cells) and whether each is split across cells"""
+    rng = random.Random(seed)
+    catalog = []
+    for _ in range(rows):
+        name = _name(rng)
+        volt, watt = rng.choice(VOLTS), rng.choice(WATTS)
+        amp = _amp(volt, watt)
+        price = str(rng.randint(150, 9000))
+        layout = rng.random()
+        if layout < 0.35:
+            cell = f"{name.replace(' ', ' - ', 1)} - {volt}V - {watt}W - {_format_amp(amp, rng)}"
+            catalog.append((False, [cell, price]))
+        elif layout < 0.6:
+            parts = [name, f"{volt}V"]
+            if rng.random() < 0.6:
+                parts.append(f"{watt}W")
+            parts.append(_format_amp(amp, rng))
+            if rng.random() < 0.3:
+                parts.append(rng.choice(COLOURS))
+            if rng.random() < 0.2:
+                parts.append(name)
+            catalog.append((False, [' '.join(parts), price]))
+        elif layout < 0.7:
+            catalog.append((False, [f"DALI Dimmable {volt}V {watt}W {_format_amp(amp, rng)} DALI SMP", price]))
+        else:
+            # Product name split over several cells by the text layer
+            amp_cells = rng.choice([[f"{amp:g}A", "m", "p"], [f"{amp:g}A", "mp"], [f"{amp:g}Amp"], [f"{amp:g} A"]])
+            cells = [name, f"{volt}V", f"{watt}W"] + amp_cells + [None, price]
+            catalog.append((True, cells))
+    return catalog
+
+
+def parse_catalog(parser, catalog):
+    results = []
+    for split, row in catalog:
+        if split:
+            product_name, price = parser.reconstruct_product_name_from_row(list(row))
+        else:
+            product_name, price = row[0], float(row[1])
+        parsed = parser.parse_product_name(product_name) if product_name else None
+        results.append((parsed, price))
+    return results
+
+
+def best_rate(parser, catalog, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse_catalog(parser, catalog)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(catalog) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    catalog = make_catalog(args.rows)
+    before = best_rate(legacy, catalog, args.repeat)
+    after = best_rate(compiled, catalog, args.repeat)
+
+    legacy_results = parse_catalog(legacy, catalog)
+    compiled_results = parse_catalog(compiled, catalog)
+    mismatches = [(row, old, new) for (_, row), old, new in zip(catalog, legacy_results, compiled_results) if old != new]
+
+    print(f"rows:      {len(catalog)}")
+    print(f"legacy:    {before:,.0f} rows/s")
+    print(f"tokenizer: {after:,.0f} rows/s ({after / before:.1f}x)")
+    print(f"identical: {len(catalog) - len(mismatches)}/{len(catalog)}")
+    for row, old, new in mismatches[:10]:
+        print(f"  {row!r}\n    legacy:    {old}\n    tokenizer: {new}")
+
+
+if __name__ == '__main__':
+    main()
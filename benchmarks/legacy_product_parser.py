@@ -0,0 +1,265 @@
+"""Original regex-per-call product-name parser, kept as the benchmark baseline
+
+Verbatim copy of _parse_product_name and _reconstruct_product_name_from_row as they
+were before product_parser.py replaced them. Not used by the app.
+"""
+
+import re
+
+
+def parse_product_name(product_name: str):
+    """
+    Parse product name to extract simplified Name, Volt, Watt, and Amp.
+    Example: "SMPS - Slim - 12V - 36W - 3Amp" -> "smps slim", 12, 36, 3.0
+    Handles fragmented text like "8.5A" + "mp" or "3A" without "mp"
+    """
+    if not product_name:
+        return None
+    
+    # Clean up the product name first - handle fragmented amperage
+    # Fix patterns like "8. mp" -> "8.5Amp" or "3A" -> "3Amp"
+    product_name = re.sub(r'(\d+\.?\d*)\s*A\s*m\s*p', r'\1Amp', product_name, flags=re.IGNORECASE)
+    product_name = re.sub(r'(\d+\.?\d*)\s*A\s*m\s*$', r'\1Amp', product_name, flags=re.IGNORECASE)
+    # Handle cases where "A" is separated from number (e.g., "8.5 A" or "3 A")
+    product_name = re.sub(r'(\d+\.?\d*)\s+A\s*(?:mp)?', r'\1Amp', product_name, flags=re.IGNORECASE)
+    # Handle cases where just "A" is present (e.g., "3A" or "8.5A")
+    product_name = re.sub(r'(\d+\.?\d*)\s*A\s*(?!\w)', r'\1Amp', product_name, flags=re.IGNORECASE)
+    
+    # Extract simplified name
+    # Remove color specifications like "(Black)", "(White)", etc.
+    product_name_clean = re.sub(r'\s*\([^)]+\)\s*', ' ', product_name)
+    
+    # Remove duplicate product names that might appear at the end
+    # Pattern: "Dimmable 4 in 1 ... Dimmable 4 in 1" -> "Dimmable 4 in 1"
+    # Pattern: "Waterproof SMPS ... Waterproof SMPS" -> "Waterproof SMPS"
+    words = product_name_clean.split()
+    if len(words) >= 4:
+        # Check if last words duplicate the first words (check various lengths)
+        # Start from longer matches and work down
+        for check_len in range(min(5, len(words) // 2), 1, -1):
+            if len(words) >= check_len * 2:
+                first_words = ' '.join(words[:check_len]).lower()
+                last_words = ' '.join(words[-check_len:]).lower()
+                if first_words == last_words:
+                    product_name_clean = ' '.join(words[:-check_len])
+                    break
+    
+    # Try splitting by " - " first (for formatted names)
+    parts = product_name_clean.split(' - ')
+    
+    # Extract name - take parts before voltage specification
+    simplified_name = None
+    
+    # Find where voltage starts (first part containing "V")
+    volt_start_idx = None
+    for idx, part in enumerate(parts):
+        if re.search(r'\d+V', part):
+            volt_start_idx = idx
+            break
+    
+    if volt_start_idx is not None and volt_start_idx > 0:
+        # Take all parts before voltage
+        name_parts = parts[:volt_start_idx]
+        simplified_name = ' '.join(name_parts).strip()
+    elif len(parts) == 1:
+        # No " - " separator, extract name by removing voltage/wattage/amperage patterns
+        # Examples:
+        # "Waterproof SMPS 24V 12.5Amp" -> "Waterproof SMPS"
+        # "Waterproof SMPS 12V 8.3Amp" -> "Waterproof SMPS"
+        # "Waterproof SMPS 12V 25Amp" -> "Waterproof SMPS"
+        # "Waterproof SMPS" -> "Waterproof SMPS" (no changes needed)
+        # "imma ble 4 in 1" -> will be fixed by fragmentation fixes below
+        text = parts[0]
+        
+        # Split into words and filter out technical specifications
+        words = text.split()
+        filtered_words = []
+        
+        for word in words:
+            word_clean = word.strip()
+            if not word_clean:
+                continue
+                
+            # Check if word matches voltage pattern (e.g., "24V", "12V", "48V")
+            if re.match(r'^\d+V$', word_clean, re.IGNORECASE):
+                continue
+            # Check if word matches wattage pattern (e.g., "100W", "50W")
+            if re.match(r'^\d+W$', word_clean, re.IGNORECASE):
+                continue
+            # Check if word matches amperage pattern (e.g., "12.5Amp", "8.3Amp", "25Amp", "8.3A", "25A")
+            # Match: digits (optional decimal) followed by A or Amp
+            if re.match(r'^\d+\.?\d*A(?:mp)?$', word_clean, re.IGNORECASE):
+                continue
+            # Keep the word if it doesn't match any technical pattern
+            filtered_words.append(word_clean)
+        
+        simplified_name = ' '.join(filtered_words).strip()
+        
+        # If filtering resulted in empty name, use original text (shouldn't happen, but safety check)
+        if not simplified_name:
+            simplified_name = text.strip()
+    elif len(parts) >= 2:
+        # Fallback: take first two parts
+        simplified_name = f"{parts[0]} {parts[1]}".strip()
+    else:
+        # Fallback: use first part only
+        simplified_name = parts[0].strip() if parts else product_name_clean.strip()
+    
+    # Fix fragmented names (e.g., "imma ble" -> "Dimmable")
+    # Common fragmentation patterns
+    fragmentation_fixes = {
+        r'\bimma\s+ble\b': 'Dimmable',
+        r'\bdimm\s+able\b': 'Dimmable',
+        r'\bdimm\s+ab\s*le\b': 'Dimmable',
+        r'\bwa\s+ter\s*proof\b': 'Waterproof',
+        r'\bwa\s+ter\s*pr\s*oof\b': 'Waterproof',
+        r'\bdi\s+mmab\s*le\b': 'Dimmable',
+        r'\bdi\s+mm\s*able\b': 'Dimmable',
+    }
+    
+    for pattern, replacement in fragmentation_fixes.items():
+        simplified_name = re.sub(pattern, replacement, simplified_name, flags=re.IGNORECASE)
+    
+    # Remove duplicate fragments at the end (e.g., "DALI Dimmable DALI SMP" -> "DALI Dimmable")
+    # Check if last words are fragments/duplicates of the beginning
+    words = simplified_name.split()
+    if len(words) >= 3:
+        # Check if ending is "DALI SMP" or "DALI" and remove it
+        if len(words) >= 2 and words[-2:][0].upper() == 'DALI' and words[-1].upper() in ['SMP', 'SMPS']:
+            simplified_name = ' '.join(words[:-2]).strip()
+        elif len(words) >= 1 and words[-1].upper() == 'DALI' and len(words) > 1:
+            # Only remove if "DALI" appears at the end and there's already "DALI" earlier
+            if 'DALI' in [w.upper() for w in words[:-1]]:
+                simplified_name = ' '.join(words[:-1]).strip()
+    
+    # Final cleanup: remove any remaining technical specifications that might have been missed
+    # Split and filter again to catch any patterns that weren't removed earlier
+    final_words = simplified_name.split()
+    final_filtered = []
+    for word in final_words:
+        word_clean = word.strip()
+        if not word_clean:
+            continue
+        # Skip voltage, wattage, and amperage patterns
+        if (re.match(r'^\d+V$', word_clean, re.IGNORECASE) or
+            re.match(r'^\d+W$', word_clean, re.IGNORECASE) or
+            re.match(r'^\d+\.?\d*A(?:mp)?$', word_clean, re.IGNORECASE)):
+            continue
+        final_filtered.append(word_clean)
+    
+    simplified_name = ' '.join(final_filtered).strip()
+    
+    # Clean up and normalize (remove extra spaces, but keep capitalization)
+    simplified_name = re.sub(r'\s+', ' ', simplified_name).strip()
+    
+    # Extract voltage (e.g., 12V, 24V, 48V)
+    volt_match = re.search(r'(\d+)V', product_name)
+    volt = int(volt_match.group(1)) if volt_match else None
+    
+    # Extract wattage (e.g., 36W, 60W) - make it optional
+    watt_match = re.search(r'(\d+)W', product_name)
+    watt = int(watt_match.group(1)) if watt_match else None
+    
+    # Extract amperage - more flexible patterns
+    # Try full "Amp" first
+    amp_match = re.search(r'(\d+\.?\d*)\s*Amp', product_name, re.IGNORECASE)
+    if not amp_match:
+        # Try just "A" (e.g., "3A", "8.5A", "12.5A")
+        amp_match = re.search(r'(\d+\.?\d*)\s*A\s*(?!\w)', product_name, re.IGNORECASE)
+    
+    amp = float(amp_match.group(1)) if amp_match else None
+    
+    # Volt is required, but watt and amp can be optional for some products
+    if volt is None:
+        return None
+    
+    # If amp is missing, set it to 0 (don't calculate from watt/volt)
+    if amp is None:
+        amp = 0.0
+    
+    # If watt is missing, we can calculate it from volt and amp: W = V * A
+    # But only if amp is greater than 0
+    if watt is None and volt is not None and amp is not None and amp > 0:
+        watt = int(volt * amp)
+    
+    # If both watt and amp are missing (amp is 0), we can't proceed
+    if watt is None and amp == 0:
+        return None
+    
+    return {
+        'Name': simplified_name,
+        'Volt': volt,
+        'Watt': watt,
+        'Amp': amp
+    }
+
+
+def reconstruct_product_name_from_row(row):
+    """Reconstruct product name from fragmented cells in a row"""
+    if not row:
+        return None, None
+    
+    # Combine all non-empty cells to reconstruct the product name
+    combined_parts = []
+    price = None
+    last_part = None
+    
+    for cell in row:
+        if cell:
+            cell_str = str(cell).strip()
+            if not cell_str:
+                continue
+            
+            # Check if it's a price (numeric value, usually at the end)
+            if re.match(r'^\d+\.?\d*$', cell_str):
+                try:
+                    price_val = float(cell_str)
+                    # Price is usually larger (like 460, 600, etc.) and appears later in row
+                    if price_val > 10:  # Reasonable price threshold
+                        price = price_val
+                        continue
+                except:
+                    pass
+            
+            # Handle single characters that might be fragments (like "m", "p" from "Amp")
+            if len(cell_str) == 1:
+                # If previous part ends with a number or "A", this might be part of "Amp"
+                if last_part and (re.search(r'\d+\.?\d*\s*$', last_part) or last_part.endswith('A')):
+                    # Combine with previous part
+                    if combined_parts:
+                        combined_parts[-1] = combined_parts[-1] + cell_str
+                    else:
+                        combined_parts.append(cell_str)
+                else:
+                    # Skip isolated single characters
+                    continue
+            else:
+                # Check if this starts with a fragment that should be combined with previous
+                # (e.g., previous was "8.5A" and this is "mp")
+                if last_part and len(cell_str) <= 3 and re.match(r'^[a-z]+$', cell_str, re.IGNORECASE):
+                    # Check if previous part ends with a number or "A"
+                    if re.search(r'\d+\.?\d*\s*A?\s*$', last_part, re.IGNORECASE):
+                        combined_parts[-1] = combined_parts[-1] + cell_str
+                        last_part = combined_parts[-1]
+                        continue
+                
+                combined_parts.append(cell_str)
+                last_part = cell_str
+    
+    if not combined_parts:
+        return None, None
+    
+    # Join parts and clean up
+    product_name = ' '.join(combined_parts)
+    # Clean up common fragmentation patterns
+    product_name = re.sub(r'\s+', ' ', product_name)  # Multiple spaces
+    product_name = re.sub(r'\s*-\s*', ' - ', product_name)  # Normalize dashes
+    product_name = re.sub(r'\s*([0-9]+V)\s*', r' \1 ', product_name)  # Normalize voltage
+    product_name = re.sub(r'\s*([0-9]+W)\s*', r' \1 ', product_name)  # Normalize wattage
+    # Fix fragmented amperage patterns
+    product_name = re.sub(r'(\d+\.?\d*)\s*A\s*m\s*p', r'\1Amp', product_name, flags=re.IGNORECASE)
+    product_name = re.sub(r'(\d+\.?\d*)\s*A\s*(?!\w)', r'\1Amp', product_name, flags=re.IGNORECASE)
+    product_name = re.sub(r'(\d+\.?\d*)\s+A\s*(?:mp)?', r'\1Amp', product_name, flags=re.IGNORECASE)
+    product_name = product_name.strip()
+    
+    return product_name, price
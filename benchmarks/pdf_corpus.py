@@ -0,0 +1,127 @@
+"""Synthetic supplier price lists for the PDF ingestion benchmark
+
+Each layout is generated locally with ReportLab from a fixed seed, so the same PDF
+(and therefore the same parsed drivers) comes out on every run:
+
+    ruled       PRODUCT / GROUP / PRICE grid, " - " separated names
+    text        text-only listing with dot leaders, no ruling lines
+    fragmented  headerless grid with the name spread over cells ("3A", "m", "p")
+                and amperage spaced out by the text layer ("3 A m p")
+    multipage   30-page ruled list with the header repeated on every page
+"""
+
+import io
+import random
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+
+NAMES = ['SMPS', 'SMPS Slim', 'Waterproof SMPS', 'DALI Dimmable', 'Triac Dimmable', 'LED Driver']
+VOLTS = [12, 24, 48]
+WATTS = [36, 60, 100, 150, 200, 250, 350]
+GROUPS = ['DRIVER', 'SMPS', 'DIMMABLE']
+
+_GRID = TableStyle([
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+    ('FONTSIZE', (0, 0), (-1, -1), 8),
+])
+
+
+def _products(rng, count):
+    """(name, volt, watt, amp, price) tuples"""
+    products = []
+    for _ in range(count):
+        volt, watt = rng.choice(VOLTS), rng.choice(WATTS)
+        products.append((rng.choice(NAMES), volt, watt, round(watt / volt, 1), rng.randint(150, 9000)))
+    return products
+
+
+def _dashed(name, volt, watt, amp):
+    return f"{name.replace(' ', ' - ', 1)} - {volt}V - {watt}W - {amp:g}Amp"
+
+
+def _build_table_pdf(rows, repeat_rows=0):
+    buffer = io.BytesIO()
+    table = Table(rows, repeatRows=repeat_rows)
+    table.setStyle(_GRID)
+    SimpleDocTemplate(buffer, pagesize=A4, invariant=1).build([table])
+    return buffer.getvalue()
+
+
+def ruled_pdf(seed=1, rows=120):
+    rng = random.Random(seed)
+    table = [['PRODUCT', 'GROUP', 'PRICE']]
+    for name, volt, watt, amp, price in _products(rng, rows):
+        table.append([_dashed(name, volt, watt, amp), rng.choice(GROUPS), str(price)])
+    return _build_table_pdf(table)
+
+
+def text_pdf(seed=2, pages=10, rows_per_page=40):
+    rng = random.Random(seed)
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4, invariant=1)
+    for _ in range(pages):
+        pdf.setFont('Helvetica-Bold', 11)
+        pdf.drawString(40, 800, 'PRICE LIST - PRODUCT / PRICE (INR)')
+        pdf.setFont('Helvetica', 9)
+        for line, (name, volt, watt, amp, price) in enumerate(_products(rng, rows_per_page)):
+            y = 775 - line * 18
+            pdf.drawString(40, y, f"{_dashed(name, volt, watt, amp)} " + '.' * 20)
+            pdf.drawRightString(540, y, f"{price:,}")
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def fragmented_pdf(seed=3, rows=120):
+    rng = random.Random(seed)
+    table = []
+    for name, volt, watt, amp, price in _products(rng, rows):
+        amp_cells = rng.choice([[f"{amp:g}A", 'm', 'p'], [f"{amp:g}A", 'mp'], [f"{amp:g} A m p", ''], [f"{amp:g}Amp", '']])
+        cells = [name, f"{volt}V", f"{watt}W"] + amp_cells
+        table.append(cells + [''] * (6 - len(cells)) + [str(price)])
+    return _build_table_pdf(table)
+
+
+def multipage_pdf(seed=4, rows=1200):
+    rng = random.Random(seed)
+    table = [['PRODUCT', 'GROUP', 'PRICE']]
+    for name, volt, watt, amp, price in _products(rng, rows):
+        table.append([_dashed(name, volt, watt, amp), rng.choice(GROUPS), str(price)])
+    return _build_table_pdf(table, repeat_rows=1)
+
+
+LAYOUTS = {
+    'ruled': ruled_pdf,
+    'text': text_pdf,
+    'fragmented': fragmented_pdf,
+    'multipage': multipage_pdf,
+}
+
+# (seed, product count) of each layout's defaults; text_pdf draws its pages from one
+# generator, so its 10 x 40 rows are the same as 400 drawn at once
+_PRODUCT_SPECS = {
+    'ruled': (1, 120),
+    'text': (2, 400),
+    'fragmented': (3, 120),
+    'multipage': (4, 1200),
+}
+
+
+def build(layout):
+    """PDF bytes for one layout"""
+    return LAYOUTS[layout]()
+
+
+def products(layout):
+    """(name, volt, watt, amp, price) of every row the layout lists, in order"""
+    seed, count = _PRODUCT_SPECS[layout]
+    return _products(random.Random(seed), count)
+
+
+def expected_drivers(layout, brand_id):
+    """The drivers a correct ingestion of the layout returns"""
+    return [{'Name': name, 'Volt': volt, 'Watt': watt, 'Amp': amp, 'Price': float(price), 'Bid': brand_id}
+            for name, volt, watt, amp, price in products(layout)]
@@ -0,0 +1,194 @@
+"""Chunked, parallel, idempotent bulk writes of driver rows
+
+Rows are de-duplicated on the natural key (Bid, Name, Volt, Watt), split into chunks
+bounded by row count and JSON payload size, and sent as upserts with limited
+concurrency. Because every chunk is an upsert, a retried or re-run import updates
+rows in place instead of duplicating them.
+
+The upsert needs a unique constraint on the natural key, added (after removing
+duplicate rows left by earlier imports) by migrations/001_drivers_natural_key.sql.
+Until that migration has run, Postgres rejects the upsert (error 42P10) and the
+writer falls back to plain inserts, which is how imports behaved before: they work,
+but re-running one duplicates its rows.
+"""
+
+import asyncio
+import json
+import logging
+import queue
+from dataclasses import dataclass, field
+
+from supabase_async import SupabaseRequestError, insert_drivers_batch, submit, upsert_drivers_batch
+
+logger = logging.getLogger(__name__)
+
+NATURAL_KEY = ('Bid', 'Name', 'Volt', 'Watt')
+
+DEFAULT_CHUNK_ROWS = 500
+DEFAULT_CHUNK_BYTES = 256 * 1024  # well under typical gateway request-size limits
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 3
+
+
+@dataclass
+class BulkProgress:
+    """Running totals of a bulk upsert, emitted once per finished chunk"""
+    total_rows: int
+    total_chunks: int
+    chunks_done: int = 0
+    rows_written: int = 0
+    rows_failed: int = 0
+    duplicates_dropped: int = 0
+    errors: list = field(default_factory=list)
+    last_chunk: int = None
+    insert_fallback: bool = False   # plain inserts were used: re-running duplicates rows
+
+    @property
+    def fraction(self):
+        return self.chunks_done / self.total_chunks if self.total_chunks else 1.0
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+def natural_key(row):
+    """Key identifying a driver across imports"""
+    name = row.get('Name')
+    return (
+        row.get('Bid'),
+        name.strip() if isinstance(name, str) else name,
+        row.get('Volt'),
+        row.get('Watt'),
+    )
+
+
+def dedupe_by_natural_key(rows):
+    """Keep the last row for each natural key (a single upsert can't touch a row twice)"""
+    by_key = {}
+    for row in rows:
+        by_key[natural_key(row)] = row
+    return list(by_key.values())
+
+
+def chunk_rows(rows, max_rows=DEFAULT_CHUNK_ROWS, max_bytes=DEFAULT_CHUNK_BYTES):
+    """Split rows into chunks bounded by row count and serialized size.
+
+    Rows are grouped by their key set first, since PostgREST requires every object
+    in a bulk payload to have the same keys.
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row.keys())), []).append(row)
+
+    chunks = []
+    for group in groups.values():
+        chunk = []
+        chunk_bytes = 2  # the surrounding "[]"
+        for row in group:
+            row_bytes = len(json.dumps(row, default=str).encode('utf-8')) + 1
+            if chunk and (len(chunk) >= max_rows or chunk_bytes + row_bytes > max_bytes):
+                chunks.append(chunk)
+                chunk = []
+                chunk_bytes = 2
+            chunk.append(row)
+            chunk_bytes += row_bytes
+        if chunk:
+            chunks.append(chunk)
+    return chunks
+
+
+def _prepare_row(row):
+    """Strip whitespace from Name so the natural key matches across imports"""
+    if isinstance(row.get('Name'), str):
+        row = dict(row)
+        row['Name'] = row['Name'].strip()
+    return row
+
+
+async def bulk_upsert_drivers(rows, access_token=None, on_progress=None,
+                              max_rows=DEFAULT_CHUNK_ROWS, max_bytes=DEFAULT_CHUNK_BYTES,
+                              concurrency=DEFAULT_CONCURRENCY, retries=DEFAULT_RETRIES):
+    """Upsert rows in parallel chunks; on_progress(BulkProgress) is called after each chunk.
+
+    A chunk that still fails after retries is recorded in progress.errors and the
+    remaining chunks continue. Returns the final BulkProgress.
+    """
+    prepared = [_prepare_row(row) for row in rows]
+    unique_rows = dedupe_by_natural_key(prepared)
+    chunks = chunk_rows(unique_rows, max_rows, max_bytes)
+    progress = BulkProgress(
+        total_rows=len(unique_rows),
+        total_chunks=len(chunks),
+        duplicates_dropped=len(prepared) - len(unique_rows),
+    )
+    on_conflict = ','.join(NATURAL_KEY)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    insert_only = False
+
+    async def write(chunk):
+        nonlocal insert_only
+        if not insert_only:
+            try:
+                await upsert_drivers_batch(chunk, on_conflict, access_token)
+                return
+            except SupabaseRequestError as e:
+                if not e.is_missing_conflict_target:
+                    raise
+                if not insert_only:
+                    logger.warning("Drivers has no unique constraint on %s; inserting instead of upserting "
+                                   "(run migrations/001_drivers_natural_key.sql)", on_conflict)
+                insert_only = progress.insert_fallback = True
+        await insert_drivers_batch(chunk, access_token)
+
+    async def send(index, chunk):
+        error = None
+        async with semaphore:
+            for attempt in range(retries + 1):
+                try:
+                    await write(chunk)
+                    error = None
+                    break
+                except SupabaseRequestError as e:
+                    error = e
+                    if not e.is_transient or attempt == retries:
+                        break
+                    await asyncio.sleep(0.5 * 2 ** attempt)
+        # Runs on the event loop thread, so no locking is needed for the totals
+        progress.chunks_done += 1
+        progress.last_chunk = index
+        if error is None:
+            progress.rows_written += len(chunk)
+        else:
+            progress.rows_failed += len(chunk)
+            progress.errors.append(f"Chunk {index + 1}/{len(chunks)} ({len(chunk)} rows): {error}")
+        if on_progress:
+            on_progress(BulkProgress(**{**vars(progress), 'errors': list(progress.errors)}))
+
+    await asyncio.gather(*(send(index, chunk) for index, chunk in enumerate(chunks)))
+    return progress
+
+
+def iter_bulk_upsert(rows, access_token=None, **options):
+    """Run bulk_upsert_drivers() on the background loop, yielding BulkProgress per chunk.
+
+    Meant for Streamlit: iterate on the script thread and update a progress bar. The
+    last item yielded holds the final totals.
+    """
+    events = queue.Queue()
+    done = object()
+    future = submit(bulk_upsert_drivers(rows, access_token, on_progress=events.put, **options))
+    future.add_done_callback(lambda _: events.put(done))
+    try:
+        yielded = False
+        while True:
+            event = events.get()
+            if event is done:
+                break
+            yielded = True
+            yield event
+        result = future.result()  # re-raise configuration or unexpected errors
+        if not yielded:
+            yield result
+    finally:
+        future.cancel()
@@ -1,7 +1,7 @@
 """Login page component"""
 
 import streamlit as st
-from supabase_client import authenticate_user, check_supabase_config
+from supabase_client import authenticate_user, check_supabase_config, reload_config
 
 
 @st.cache_data
@@ -362,6 +362,10 @@ def render_login():
             SUPABASE_SERVICE_ROLE_KEY=your-service-role-key
             ```
             """)
+            # Configuration is cached per process, so re-read it after updating secrets
+            if st.button("🔄 Reload Configuration", use_container_width=True):
+                reload_config()
+                st.rerun()
             st.stop()
         
         # Check if already logged in
@@ -1,451 +1,777 @@
 """PDF upload component for inserting driver data"""
 
 import streamlit as st
-import pdfplumber
 import re
+import math
+import hashlib
+import threading
+from collections import OrderedDict
 import pandas as pd
 from supabase_client import insert_drivers_batch, authenticate_user, fetch_drivers, fetch_brands_with_ids
+from supabase_client import fetch_drivers_for_brand
+from settings import get_settings
+from bulk_writer import iter_bulk_upsert
+from supabase_async import SessionToken, SupabaseRequestError, run_sync
+from import_planner import plan_import, describe_update
+from cache_utils import SizedLRUCache
+from pdf_extraction import iter_page_tables, default_workers
+from product_parser import parse_product_name as _parse_product_name
+from product_parser import parse_product_column
+from product_parser import reconstruct_product_name_from_row as _reconstruct_product_name_from_row
+from job_runner import JobRunner, QUEUED, DONE, FAILED
+from spreadsheet_import import (
+    FIELDS, guess_column_mapping, import_spreadsheet, iter_chunks, mapping_problems,
+    spreadsheet_columns, to_records, validate_chunk,
+)
 
+# Bump whenever extraction or parsing changes output, so cached results are not reused
+PARSER_VERSION = "5"
 
-def _parse_product_name(product_name: str):
-    """
-    Parse product name to extract simplified Name, Volt, Watt, and Amp.
-    Example: "SMPS - Slim - 12V - 36W - 3Amp" -> "smps slim", 12, 36, 3.0
-    Handles fragmented text like "8.5A" + "mp" or "3A" without "mp"
-    """
-    if not product_name:
-        return None
-    
-    # Clean up the product name first - handle fragmented amperage
-    # Fix patterns like "8. mp" -> "8.5Amp" or "3A" -> "3Amp"
-    product_name = re.sub(r'(\d+\.?\d*)\s*A\s*m\s*p', r'\1Amp', product_name, flags=re.IGNORECASE)
-    product_name = re.sub(r'(\d+\.?\d*)\s*A\s*m\s*$', r'\1Amp', product_name, flags=re.IGNORECASE)
-    # Handle cases where "A" is separated from number (e.g., "8.5 A" or "3 A")
-    product_name = re.sub(r'(\d+\.?\d*)\s+A\s*(?:mp)?', r'\1Amp', product_name, flags=re.IGNORECASE)
-    # Handle cases where just "A" is present (e.g., "3A" or "8.5A")
-    product_name = re.sub(r'(\d+\.?\d*)\s*A\s*(?!\w)', r'\1Amp', product_name, flags=re.IGNORECASE)
-    
-    # Extract simplified name
-    # Remove color specifications like "(Black)", "(White)", etc.
-    product_name_clean = re.sub(r'\s*\([^)]+\)\s*', ' ', product_name)
-    
-    # Remove duplicate product names that might appear at the end
-    # Pattern: "Dimmable 4 in 1 ... Dimmable 4 in 1" -> "Dimmable 4 in 1"
-    # Pattern: "Waterproof SMPS ... Waterproof SMPS" -> "Waterproof SMPS"
-    words = product_name_clean.split()
-    if len(words) >= 4:
-        # Check if last words duplicate the first words (check various lengths)
-        # Start from longer matches and work down
-        for check_len in range(min(5, len(words) // 2), 1, -1):
-            if len(words) >= check_len * 2:
-                first_words = ' '.join(words[:check_len]).lower()
-                last_words = ' '.join(words[-check_len:]).lower()
-                if first_words == last_words:
-                    product_name_clean = ' '.join(words[:-check_len])
-                    break
-    
-    # Try splitting by " - " first (for formatted names)
-    parts = product_name_clean.split(' - ')
-    
-    # Extract name - take parts before voltage specification
-    simplified_name = None
-    
-    # Find where voltage starts (first part containing "V")
-    volt_start_idx = None
-    for idx, part in enumerate(parts):
-        if re.search(r'\d+V', part):
-            volt_start_idx = idx
-            break
-    
-    if volt_start_idx is not None and volt_start_idx > 0:
-        # Take all parts before voltage
-        name_parts = parts[:volt_start_idx]
-        simplified_name = ' '.join(name_parts).strip()
-    elif len(parts) == 1:
-        # No " - " separator, extract name by removing voltage/wattage/amperage patterns
-        # Examples:
-        # "Waterproof SMPS 24V 12.5Amp" -> "Waterproof SMPS"
-        # "Waterproof SMPS 12V 8.3Amp" -> "Waterproof SMPS"
-        # "Waterproof SMPS 12V 25Amp" -> "Waterproof SMPS"
-        # "Waterproof SMPS" -> "Waterproof SMPS" (no changes needed)
-        # "imma ble 4 in 1" -> will be fixed by fragmentation fixes below
-        text = parts[0]
-        
-        # Split into words and filter out technical specifications
-        words = text.split()
-        filtered_words = []
-        
-        for word in words:
-            word_clean = word.strip()
-            if not word_clean:
-                continue
-                
-            # Check if word matches voltage pattern (e.g., "24V", "12V", "48V")
-            if re.match(r'^\d+V$', word_clean, re.IGNORECASE):
-                continue
-            # Check if word matches wattage pattern (e.g., "100W", "50W")
-            if re.match(r'^\d+W$', word_clean, re.IGNORECASE):
-                continue
-            # Check if word matches amperage pattern (e.g., "12.5Amp", "8.3Amp", "25Amp", "8.3A", "25A")
-            # Match: digits (optional decimal) followed by A or Amp
-            if re.match(r'^\d+\.?\d*A(?:mp)?$', word_clean, re.IGNORECASE):
-                continue
-            # Keep the word if it doesn't match any technical pattern
-            filtered_words.append(word_clean)
-        
-        simplified_name = ' '.join(filtered_words).strip()
-        
-        # If filtering resulted in empty name, use original text (shouldn't happen, but safety check)
-        if not simplified_name:
-            simplified_name = text.strip()
-    elif len(parts) >= 2:
-        # Fallback: take first two parts
-        simplified_name = f"{parts[0]} {parts[1]}".strip()
-    else:
-        # Fallback: use first part only
-        simplified_name = parts[0].strip() if parts else product_name_clean.strip()
-    
-    # Fix fragmented names (e.g., "imma ble" -> "Dimmable")
-    # Common fragmentation patterns
-    fragmentation_fixes = {
-        r'\bimma\s+ble\b': 'Dimmable',
-        r'\bdimm\s+able\b': 'Dimmable',
-        r'\bdimm\s+ab\s*le\b': 'Dimmable',
-        r'\bwa\s+ter\s*proof\b': 'Waterproof',
-        r'\bwa\s+ter\s*pr\s*oof\b': 'Waterproof',
-        r'\bdi\s+mmab\s*le\b': 'Dimmable',
-        r'\bdi\s+mm\s*able\b': 'Dimmable',
-    }
-    
-    for pattern, replacement in fragmentation_fixes.items():
-        simplified_name = re.sub(pattern, replacement, simplified_name, flags=re.IGNORECASE)
-    
-    # Remove duplicate fragments at the end (e.g., "DALI Dimmable DALI SMP" -> "DALI Dimmable")
-    # Check if last words are fragments/duplicates of the beginning
-    words = simplified_name.split()
-    if len(words) >= 3:
-        # Check if ending is "DALI SMP" or "DALI" and remove it
-        if len(words) >= 2 and words[-2:][0].upper() == 'DALI' and words[-1].upper() in ['SMP', 'SMPS']:
-            simplified_name = ' '.join(words[:-2]).strip()
-        elif len(words) >= 1 and words[-1].upper() == 'DALI' and len(words) > 1:
-            # Only remove if "DALI" appears at the end and there's already "DALI" earlier
-            if 'DALI' in [w.upper() for w in words[:-1]]:
-                simplified_name = ' '.join(words[:-1]).strip()
-    
-    # Final cleanup: remove any remaining technical specifications that might have been missed
-    # Split and filter again to catch any patterns that weren't removed earlier
-    final_words = simplified_name.split()
-    final_filtered = []
-    for word in final_words:
-        word_clean = word.strip()
-        if not word_clean:
-            continue
-        # Skip voltage, wattage, and amperage patterns
-        if (re.match(r'^\d+V$', word_clean, re.IGNORECASE) or
-            re.match(r'^\d+W$', word_clean, re.IGNORECASE) or
-            re.match(r'^\d+\.?\d*A(?:mp)?$', word_clean, re.IGNORECASE)):
-            continue
-        final_filtered.append(word_clean)
-    
-    simplified_name = ' '.join(final_filtered).strip()
-    
-    # Clean up and normalize (remove extra spaces, but keep capitalization)
-    simplified_name = re.sub(r'\s+', ' ', simplified_name).strip()
-    
-    # Extract voltage (e.g., 12V, 24V, 48V)
-    volt_match = re.search(r'(\d+)V', product_name)
-    volt = int(volt_match.group(1)) if volt_match else None
-    
-    # Extract wattage (e.g., 36W, 60W) - make it optional
-    watt_match = re.search(r'(\d+)W', product_name)
-    watt = int(watt_match.group(1)) if watt_match else None
-    
-    # Extract amperage - more flexible patterns
-    # Try full "Amp" first
-    amp_match = re.search(r'(\d+\.?\d*)\s*Amp', product_name, re.IGNORECASE)
-    if not amp_match:
-        # Try just "A" (e.g., "3A", "8.5A", "12.5A")
-        amp_match = re.search(r'(\d+\.?\d*)\s*A\s*(?!\w)', product_name, re.IGNORECASE)
-    
-    amp = float(amp_match.group(1)) if amp_match else None
-    
-    # Volt is required, but watt and amp can be optional for some products
-    if volt is None:
-        return None
-    
-    # If amp is missing, set it to 0 (don't calculate from watt/volt)
-    if amp is None:
-        amp = 0.0
-    
-    # If watt is missing, we can calculate it from volt and amp: W = V * A
-    # But only if amp is greater than 0
-    if watt is None and volt is not None and amp is not None and amp > 0:
-        watt = int(volt * amp)
-    
-    # If both watt and amp are missing (amp is 0), we can't proceed
-    if watt is None and amp == 0:
-        return None
-    
-    return {
-        'Name': simplified_name,
-        'Volt': volt,
-        'Watt': watt,
-        'Amp': amp
-    }
+# Extracted tables and parsed drivers by content hash, shared by all sessions in the process
+_pdf_cache = SizedLRUCache(max_bytes=64 * 1024 * 1024)
 
+# Rows rendered in the preview table; the full list is still planned and inserted
+PREVIEW_ROWS = 500
 
-def _extract_table_from_pdf(pdf_file):
-    """Extract table data from PDF file"""
-    try:
-        with pdfplumber.open(pdf_file) as pdf:
-            all_tables = []
-            for page_num, page in enumerate(pdf.pages):
-                # Try multiple extraction strategies
-                # First try with explicit line detection
-                tables = page.extract_tables(
-                    table_settings={
-                        "vertical_strategy": "lines_strict",
-                        "horizontal_strategy": "lines_strict",
-                        "snap_tolerance": 3,
-                        "join_tolerance": 3,
-                    }
-                )
-                if tables:
-                    all_tables.extend(tables)
-                else:
-                    # Fallback: try with text-based strategy
-                    tables = page.extract_tables(
-                        table_settings={
-                            "vertical_strategy": "text",
-                            "horizontal_strategy": "text",
-                        }
-                    )
-                    if tables:
-                        all_tables.extend(tables)
-                    else:
-                        # Final fallback: default settings
-                        tables = page.extract_tables()
-                        if tables:
-                            all_tables.extend(tables)
-            return all_tables
-    except Exception as e:
-        st.error(f"Error reading PDF: {e}")
-        return None
+# Rows per page in the raw table viewer
+DEBUG_PAGE_ROWS = 50
 
+# Session key of the cached import plan: ((read job ids, brand id), ImportPlan)
+PLAN_KEY = 'pdf_import_plan'
 
-def _reconstruct_product_name_from_row(row):
-    """Reconstruct product name from fragmented cells in a row"""
-    if not row:
-        return None, None
-    
-    # Combine all non-empty cells to reconstruct the product name
-    combined_parts = []
-    price = None
-    last_part = None
+# Tag added to parsed rows naming the PDF they came from (removed before inserting)
+SOURCE_COLUMN = 'Source'
+
+# Choice shown for a driver field that no spreadsheet column maps to
+NOT_MAPPED = "(not in file)"
+
+# Tables with at least this many data rows are parsed a column at a time; below it the
+# fixed cost of building a DataFrame outweighs the per-row savings
+COLUMN_PARSE_MIN_ROWS = 250
+
+# Header layouts remembered per brand, so later tables (and later imports) with the
+# same header rows skip detection; shared by all sessions in the process
+HEADER_MEMORY_SIZE = 256
+_header_memory = OrderedDict()   # (brand_id, first row signature) -> _HeaderLayout
+_header_memory_lock = threading.Lock()
+
+_NUMBER_RE = re.compile(r'\d+(?:[.,]\d+)*')
+
+
+def _parse_pdf_tables(tables, show_debug=False, brand_id=None, debug_log=None, first_table_idx=0):
+    """Parse extracted tables and extract driver data
     
-    for cell in row:
-        if cell:
-            cell_str = str(cell).strip()
-            if not cell_str:
-                continue
-            
-            # Check if it's a price (numeric value, usually at the end)
-            if re.match(r'^\d+\.?\d*$', cell_str):
-                try:
-                    price_val = float(cell_str)
-                    # Price is usually larger (like 460, 600, etc.) and appears later in row
-                    if price_val > 10:  # Reasonable price threshold
-                        price = price_val
-                        continue
-                except:
-                    pass
-            
-            # Handle single characters that might be fragments (like "m", "p" from "Amp")
-            if len(cell_str) == 1:
-                # If previous part ends with a number or "A", this might be part of "Amp"
-                if last_part and (re.search(r'\d+\.?\d*\s*$', last_part) or last_part.endswith('A')):
-                    # Combine with previous part
-                    if combined_parts:
-                        combined_parts[-1] = combined_parts[-1] + cell_str
-                    else:
-                        combined_parts.append(cell_str)
-                else:
-                    # Skip isolated single characters
-                    continue
-            else:
-                # Check if this starts with a fragment that should be combined with previous
-                # (e.g., previous was "8.5A" and this is "mp")
-                if last_part and len(cell_str) <= 3 and re.match(r'^[a-z]+$', cell_str, re.IGNORECASE):
-                    # Check if previous part ends with a number or "A"
-                    if re.search(r'\d+\.?\d*\s*A?\s*$', last_part, re.IGNORECASE):
-                        combined_parts[-1] = combined_parts[-1] + cell_str
-                        last_part = combined_parts[-1]
-                        continue
-                
-                combined_parts.append(cell_str)
-                last_part = cell_str
-    
-    if not combined_parts:
-        return None, None
-    
-    # Join parts and clean up
-    product_name = ' '.join(combined_parts)
-    # Clean up common fragmentation patterns
-    product_name = re.sub(r'\s+', ' ', product_name)  # Multiple spaces
-    product_name = re.sub(r'\s*-\s*', ' - ', product_name)  # Normalize dashes
-    product_name = re.sub(r'\s*([0-9]+V)\s*', r' \1 ', product_name)  # Normalize voltage
-    product_name = re.sub(r'\s*([0-9]+W)\s*', r' \1 ', product_name)  # Normalize wattage
-    # Fix fragmented amperage patterns
-    product_name = re.sub(r'(\d+\.?\d*)\s*A\s*m\s*p', r'\1Amp', product_name, flags=re.IGNORECASE)
-    product_name = re.sub(r'(\d+\.?\d*)\s*A\s*(?!\w)', r'\1Amp', product_name, flags=re.IGNORECASE)
-    product_name = re.sub(r'(\d+\.?\d*)\s+A\s*(?:mp)?', r'\1Amp', product_name, flags=re.IGNORECASE)
-    product_name = product_name.strip()
-    
-    return product_name, price
-
-
-def _parse_pdf_tables(tables, show_debug=False, brand_id=None):
-    """Parse extracted tables and extract driver data"""
+    Debug messages are written with st.write when show_debug is set, or appended to
+    debug_log (a list) when one is given so they can be cached and replayed.
+    first_table_idx numbers the tables when they arrive a page at a time.
+    """
     drivers = []
+    show_debug = show_debug or debug_log is not None
+    
+    def debug(message):
+        if debug_log is not None:
+            debug_log.append(message)
+        else:
+            st.write(message)
     
     if not tables:
         return drivers
     
-    for table_idx, table in enumerate(tables):
+    for table_idx, table in enumerate(tables, start=first_table_idx):
         if not table:
             continue
         
         if len(table) < 2:  # Need at least header + 1 data row
             if show_debug:
-                st.write(f"Table {table_idx}: Skipped - too few rows ({len(table)})")
+                debug(f"Table {table_idx}: Skipped - too few rows ({len(table)})")
             continue
         
         # Find column indices - check all rows in case header is not first row
-        header_row_idx = 0
-        product_col_idx = None
-        price_col_idx = None
-        
-        # Try to find header row (might not be first row)
-        # Check more rows and be more flexible with column name matching
-        for row_idx, row in enumerate(table[:10]):  # Check first 10 rows for header
-            if not row:
-                continue
-            for idx, col in enumerate(row):
-                if col:
-                    col_str = str(col).upper().strip()
-                    # More flexible matching for PRODUCT column
-                    if product_col_idx is None and ('PRODUCT' in col_str or 'NAME' in col_str or 'ITEM' in col_str):
-                        product_col_idx = idx
-                        header_row_idx = row_idx
-                        if show_debug:
-                            st.write(f"Table {table_idx}: Found PRODUCT column at index {idx} in row {row_idx}: '{col_str}'")
-                    # More flexible matching for PRICE column
-                    if price_col_idx is None and ('PRICE' in col_str or 'COST' in col_str):
-                        price_col_idx = idx
-                        header_row_idx = row_idx
-                        if show_debug:
-                            st.write(f"Table {table_idx}: Found PRICE column at index {idx} in row {row_idx}: '{col_str}'")
+        header_row_idx, product_col_idx, price_col_idx, found = _find_header(table, brand_id)
+        if show_debug:
+            for column_name, idx, row_idx, col_str in found:
+                debug(f"Table {table_idx}: Found {column_name} column at index {idx} in row {row_idx}: '{col_str}'")
         
         # If no header found, try to reconstruct product names from entire rows
         # This handles cases where product names are split across multiple columns
         if product_col_idx is None:
             if show_debug:
-                st.write(f"Table {table_idx}: PRODUCT column not found in headers, trying to reconstruct from row data...")
+                debug(f"Table {table_idx}: PRODUCT column not found in headers, trying to reconstruct from row data...")
             # Process rows directly without column index
             product_col_idx = -1  # Special flag to use row reconstruction
         
         # Extract data rows (skip header row and any rows before it)
-        rows_processed = 0
-        rows_skipped = 0
-        
-        # Determine start row (skip header if found)
         start_row = header_row_idx + 1 if header_row_idx >= 0 else 0
-        
-        for row_idx, row in enumerate(table[start_row:], start=start_row):
-            if not row:
-                rows_skipped += 1
-                continue
-            
-            # If product_col_idx is -1, reconstruct from entire row
-            if product_col_idx == -1:
-                product_name, extracted_price = _reconstruct_product_name_from_row(row)
-                if not product_name:
-                    rows_skipped += 1
-                    continue
-                
-                # Skip if it looks like a header
-                if product_name.upper() in ['PRODUCT', 'NAME', '']:
-                    rows_skipped += 1
-                    continue
-                
-                price = extracted_price
-            else:
-                # Use specific column
-                # Ensure row has enough columns
-                while len(row) <= product_col_idx:
-                    row.append(None)
-                
-                product_cell = row[product_col_idx]
-                
-                # Skip empty cells, header-like cells, and non-string values
-                if not product_cell:
-                    rows_skipped += 1
-                    continue
-                
-                product_name = str(product_cell).strip()
-                
-                # Skip if it looks like a header or empty
-                if not product_name or product_name.upper() in ['PRODUCT', 'NAME', '']:
-                    rows_skipped += 1
-                    continue
-                
-                # Extract price if available
-                price = None
-                if price_col_idx is not None and len(row) > price_col_idx and row[price_col_idx]:
-                    try:
-                        price_str = str(row[price_col_idx]).strip()
-                        # Remove any non-numeric characters except decimal point
-                        price_str = re.sub(r'[^\d.]', '', price_str)
-                        if price_str:
-                            price = float(price_str)
-                    except (ValueError, TypeError):
-                        price = None
-            
-            # Try to parse the product name
-            parsed_data = _parse_product_name(product_name)
-            if not parsed_data:
-                if show_debug:
-                    st.write(f"Row {row_idx}: Skipped - Could not parse: '{product_name}'")
-                    # Show what was found
-                    volt_match = re.search(r'(\d+)V', product_name)
-                    watt_match = re.search(r'(\d+)W', product_name)
-                    amp_match = re.search(r'(\d+\.?\d*)Amp', product_name)
-                    st.write(f"  Volt found: {volt_match.group(1) if volt_match else 'No'}, "
-                           f"Watt found: {watt_match.group(1) if watt_match else 'No'}, "
-                           f"Amp found: {amp_match.group(1) if amp_match else 'No'}")
-                rows_skipped += 1
-                continue
-            
-            # Add price and brand_id
-            parsed_data['Price'] = price
-            parsed_data['Bid'] = brand_id if brand_id else 1  # Use selected brand or default to 1
-            
-            drivers.append(parsed_data)
-            rows_processed += 1
+        if product_col_idx == -1:
+            table_drivers, rows_skipped = _parse_reconstructed_rows(table, start_row, brand_id, show_debug, debug)
+        elif len(table) - start_row < COLUMN_PARSE_MIN_ROWS:
+            table_drivers, rows_skipped = _parse_product_rows(
+                table, start_row, product_col_idx, price_col_idx, brand_id, show_debug, debug
+            )
+        else:
+            table_drivers, rows_skipped = _parse_product_column_rows(
+                table, start_row, product_col_idx, price_col_idx, brand_id, show_debug, debug
+            )
+        drivers.extend(table_drivers)
+        rows_processed = len(table_drivers)
         
         if show_debug:
-            st.write(f"Table {table_idx}: Processed {rows_processed} rows, Skipped {rows_skipped} rows")
+            debug(f"Table {table_idx}: Processed {rows_processed} rows, Skipped {rows_skipped} rows")
     
     return drivers
 
 
+def _row_signature(row):
+    """Normalized header-row content: upper-cased, stripped cell text ('' for empty cells)"""
+    return tuple(str(col).upper().strip() if col else '' for col in row) if row else ()
+
+
+def _detect_header(table):
+    """Scan the first 10 rows for the PRODUCT and PRICE columns
+    
+    Returns (header_row_idx, product_col_idx, price_col_idx, found) where found lists
+    (column, index, row, cell text) in the order the columns were found.
+    """
+    header_row_idx = 0
+    product_col_idx = None
+    price_col_idx = None
+    found = []
+    
+    # Try to find header row (might not be first row)
+    # Check more rows and be more flexible with column name matching
+    for row_idx, row in enumerate(table[:10]):  # Check first 10 rows for header
+        if not row:
+            continue
+        for idx, col in enumerate(row):
+            if col:
+                col_str = str(col).upper().strip()
+                # More flexible matching for PRODUCT column
+                if product_col_idx is None and ('PRODUCT' in col_str or 'NAME' in col_str or 'ITEM' in col_str):
+                    product_col_idx = idx
+                    header_row_idx = row_idx
+                    found.append(('PRODUCT', idx, row_idx, col_str))
+                # More flexible matching for PRICE column
+                if price_col_idx is None and ('PRICE' in col_str or 'COST' in col_str):
+                    price_col_idx = idx
+                    header_row_idx = row_idx
+                    found.append(('PRICE', idx, row_idx, col_str))
+    return header_row_idx, product_col_idx, price_col_idx, found
+
+
+def _find_header(table, brand_id=None):
+    """_detect_header(), reusing the layout remembered for this brand's identical header rows
+    
+    Only layouts where both columns were found are remembered: the result then depends
+    on rows up to the header row alone, so identical rows give an identical result.
+    """
+    key = (brand_id, _row_signature(table[0]))
+    with _header_memory_lock:
+        remembered = _header_memory.get(key)
+        if remembered is not None:
+            _header_memory.move_to_end(key)
+    if remembered is not None:
+        signature, layout = remembered
+        header_row_idx = layout[0]
+        if tuple(_row_signature(row) for row in table[:header_row_idx + 1]) == signature:
+            return layout
+    
+    layout = _detect_header(table)
+    header_row_idx, product_col_idx, price_col_idx, _ = layout
+    if product_col_idx is not None and price_col_idx is not None:
+        signature = tuple(_row_signature(row) for row in table[:header_row_idx + 1])
+        with _header_memory_lock:
+            _header_memory[key] = (signature, layout)
+            _header_memory.move_to_end(key)
+            while len(_header_memory) > HEADER_MEMORY_SIZE:
+                _header_memory.popitem(last=False)
+    return layout
+
+
+def _driver_from_name(product_name, price, row_idx, brand_id, show_debug, debug):
+    """Parse one product name with the full grammar; returns the driver row or None"""
+    parsed_data = _parse_product_name(product_name)
+    if not parsed_data:
+        if show_debug:
+            debug(f"Row {row_idx}: Skipped - Could not parse: '{product_name}'")
+            # Show what was found
+            volt_match = re.search(r'(\d+)V', product_name)
+            watt_match = re.search(r'(\d+)W', product_name)
+            amp_match = re.search(r'(\d+\.?\d*)Amp', product_name)
+            debug(f"  Volt found: {volt_match.group(1) if volt_match else 'No'}, "
+                   f"Watt found: {watt_match.group(1) if watt_match else 'No'}, "
+                   f"Amp found: {amp_match.group(1) if amp_match else 'No'}")
+        return None
+    
+    # Add price and brand_id
+    parsed_data['Price'] = price
+    parsed_data['Bid'] = brand_id if brand_id else 1  # Use selected brand or default to 1
+    return parsed_data
+
+
+def _parse_reconstructed_rows(table, start_row, brand_id, show_debug, debug):
+    """Parse rows of a table without a PRODUCT header, rebuilding names from whole rows
+    
+    Returns (drivers, rows_skipped).
+    """
+    drivers = []
+    rows_skipped = 0
+    for row_idx, row in enumerate(table[start_row:], start=start_row):
+        if not row:
+            rows_skipped += 1
+            continue
+        
+        product_name, price = _reconstruct_product_name_from_row(row)
+        # Skip empty names and ones that look like a header
+        if not product_name or product_name.upper() in ['PRODUCT', 'NAME', '']:
+            rows_skipped += 1
+            continue
+        
+        driver = _driver_from_name(product_name, price, row_idx, brand_id, show_debug, debug)
+        if driver is None:
+            rows_skipped += 1
+        else:
+            drivers.append(driver)
+    return drivers, rows_skipped
+
+
+def _parse_product_rows(table, start_row, product_col_idx, price_col_idx, brand_id, show_debug, debug):
+    """Parse rows of a table with a known PRODUCT column one row at a time
+    
+    Returns (drivers, rows_skipped).
+    """
+    drivers = []
+    rows_skipped = 0
+    for row_idx, row in enumerate(table[start_row:], start=start_row):
+        product_cell = row[product_col_idx] if row and len(row) > product_col_idx else None
+        
+        # Skip empty cells, header-like cells, and non-string values
+        if not product_cell:
+            rows_skipped += 1
+            continue
+        
+        product_name = str(product_cell).strip()
+        
+        # Skip if it looks like a header or empty
+        if not product_name or product_name.upper() in ['PRODUCT', 'NAME', '']:
+            rows_skipped += 1
+            continue
+        
+        # Extract price if available
+        price = None
+        if price_col_idx is not None and len(row) > price_col_idx and row[price_col_idx]:
+            try:
+                # Remove any non-numeric characters except decimal point
+                price_str = re.sub(r'[^\d.]', '', str(row[price_col_idx]).strip())
+                if price_str:
+                    price = float(price_str)
+            except (ValueError, TypeError):
+                price = None
+        
+        driver = _driver_from_name(product_name, price, row_idx, brand_id, show_debug, debug)
+        if driver is None:
+            rows_skipped += 1
+        else:
+            drivers.append(driver)
+    return drivers, rows_skipped
+
+
+def _parse_product_column_rows(table, start_row, product_col_idx, price_col_idx, brand_id, show_debug, debug):
+    """Parse rows of a table with a known PRODUCT column, a column at a time
+    
+    The product and price columns are cleaned and parsed with vectorized string
+    operations; names outside the canonical layouts go through the full grammar one by
+    one, in row order. Returns (drivers, rows_skipped).
+    """
+    rows = [(row_idx, row) for row_idx, row in enumerate(table[start_row:], start=start_row) if row]
+    rows_skipped = len(table) - start_row - len(rows)
+    if not rows:
+        return [], rows_skipped
+    
+    # Short rows are padded with None
+    frame = pd.DataFrame([row for _, row in rows], index=[row_idx for row_idx, _ in rows])
+    
+    def column(idx):
+        """Cells as text, with falsy cells (None, "", 0) as "" like the per-row checks"""
+        if idx is None or idx >= frame.shape[1]:
+            return pd.Series('', index=frame.index, dtype=object)
+        cells = frame[idx]
+        return cells.where(cells.notna() & cells.astype(bool), '').astype(str)
+    
+    # Skip empty cells and header-like cells
+    names = column(product_col_idx).str.strip()
+    keep = names.ne('') & ~names.str.upper().isin(['PRODUCT', 'NAME'])
+    rows_skipped += int((~keep).sum())
+    names = names[keep]
+    
+    # Remove any non-numeric characters except decimal point; unparseable prices are None
+    prices = pd.to_numeric(column(price_col_idx)[keep].str.replace(r'[^\d.]', '', regex=True), errors='coerce')
+    prices = prices.astype(float).astype(object).where(prices.notna(), None)
+    
+    parsed = parse_product_column(names)
+    bid = brand_id if brand_id else 1
+    drivers = []
+    for row_idx, product_name, price, name, volt, watt, amp in zip(
+        names.index, names.tolist(), prices.tolist(), parsed['Name'].tolist(),
+        parsed['Volt'].tolist(), parsed['Watt'].tolist(), parsed['Amp'].tolist()
+    ):
+        if volt == volt:  # not NaN: handled by the vectorized grammar
+            drivers.append({'Name': name, 'Volt': int(volt), 'Watt': int(watt), 'Amp': amp, 'Price': price, 'Bid': bid})
+            continue
+        driver = _driver_from_name(product_name, price, row_idx, brand_id, show_debug, debug)
+        if driver is None:
+            rows_skipped += 1
+        else:
+            drivers.append(driver)
+    return drivers, rows_skipped
+
+
+def _pdf_cache_key(file_bytes):
+    """Content hash of the uploaded PDF combined with the parser version"""
+    return hashlib.sha256(file_bytes).hexdigest(), PARSER_VERSION
+
+
+def _iter_pdf_drivers(file_bytes, brand_id, debug_log=None, table_sink=None, workers=None):
+    """Extract and parse a PDF page by page, yielding (pages_done, page_count, drivers)
+    
+    Each page's tables are parsed as soon as they are extracted and then dropped,
+    unless table_sink (a list) asks to keep them for the raw data view. workers is
+    set when several files are read at once: it caps each file's process pool, and
+    every file is extracted in worker processes (when there is more than one CPU)
+    so concurrent files don't share one core.
+    """
+    table_idx = 0
+    for pages_done, page_count, tables in iter_page_tables(file_bytes, workers=workers, brand=brand_id,
+                                                           concurrent=workers is not None):
+        drivers = _parse_pdf_tables(tables, brand_id=brand_id, debug_log=debug_log, first_table_idx=table_idx)
+        table_idx += len(tables)
+        if table_sink is not None:
+            table_sink.extend(tables)
+        yield pages_done, page_count, drivers
+
+
+_import_jobs = None
+_import_jobs_lock = threading.Lock()
+
+
+def _get_import_jobs():
+    """Background runner shared by all sessions; reading and inserting happen off the script thread"""
+    global _import_jobs
+    with _import_jobs_lock:
+        if _import_jobs is None:
+            # Read jobs keep only keys into _pdf_cache, so finished jobs are small and many can be kept
+            _import_jobs = JobRunner(max_workers=get_settings().import_workers, keep_finished=500, name="pdf-import")
+        return _import_jobs
+
+
+def _cached_pdf_drivers(cache_key, brand_id, keep_tables=False):
+    """Cached (drivers, debug_lines, tables) for this file (by _pdf_cache_key) and brand, or None"""
+    cached = _pdf_cache.get(('drivers', brand_id) + cache_key)
+    tables = _pdf_cache.get(('tables',) + cache_key) if keep_tables else None
+    if cached is None or (keep_tables and tables is None):
+        return None
+    drivers, debug_lines = cached
+    return drivers, debug_lines, tables
+
+
+def _read_pdf_job(progress, file_bytes, brand_id, keep_tables=False, workers=None):
+    """Background job: extract and parse a PDF page by page, reporting pages and rows
+    
+    The results go to _pdf_cache, where they count against its size budget, and the
+    job returns None (see _read_job_result). Only results too large for the cache are
+    returned as (drivers, debug_lines, tables).
+    """
+    debug_lines = []
+    drivers = []
+    tables = [] if keep_tables else None
+    for pages_done, page_count, page_drivers in _iter_pdf_drivers(file_bytes, brand_id, debug_lines, tables, workers):
+        drivers.extend(page_drivers)
+        progress(pages_done=pages_done, page_count=page_count, rows_parsed=len(drivers))
+    cached = _pdf_cache.put(('drivers', brand_id) + _pdf_cache_key(file_bytes), (drivers, debug_lines))
+    if keep_tables:
+        cached = _pdf_cache.put(('tables',) + _pdf_cache_key(file_bytes), tables) and cached
+    return None if cached else (drivers, debug_lines, tables)
+
+
+def _read_job_result(job):
+    """(drivers, debug_lines, tables) of a finished read job, or None once evicted from the cache"""
+    if job.result is not None:
+        return job.result
+    file_hash, parser_version, brand_id, keep_tables, _ = job.key
+    return _cached_pdf_drivers((file_hash, parser_version), brand_id, keep_tables)
+
+
+def _session_token():
+    """This session's token for background writes (None if not signed in), renewed first if expired
+
+    The job refreshes it again if it expires mid-import; either way the new tokens are
+    written back to st.session_state['supabase_session'].
+    """
+    session_data = st.session_state.get('supabase_session')
+    if not session_data or not session_data.get('access_token'):
+        return None
+    token = SessionToken(session_data)
+    if token.expired:
+        try:
+            run_sync(token.refresh())
+        except SupabaseRequestError:
+            # Writes will fail with the auth error, which the job reports
+            pass
+    return token
+
+
+def _insert_rows_job(progress, rows, access_token=None):
+    """Background job: upsert rows in chunks, reporting the running count"""
+    final = None
+    for final in iter_bulk_upsert(rows, access_token=access_token):
+        progress(rows_inserted=final.rows_written, total_rows=final.total_rows, fraction=final.fraction,
+                 chunks_done=final.chunks_done, total_chunks=final.total_chunks)
+    return final
+
+
+def _import_spreadsheet_job(progress, file_bytes, file_name, mapping, brand_id, access_token=None):
+    """Background job: validate and upsert a spreadsheet chunk by chunk, reporting the totals"""
+    return import_spreadsheet(
+        file_bytes, file_name, mapping, brand_id, access_token,
+        on_progress=lambda totals: progress(
+            rows_total=totals.rows_total, rows_read=totals.rows_read, rows_valid=totals.rows_valid,
+            rows_rejected=totals.rows_rejected, rows_written=totals.rows_written
+        ),
+    )
+
+
+def _read_key(file_name, file_bytes, brand_id, keep_tables):
+    """Identity of a read job: content, parser version, brand, raw-table option and file name"""
+    return _pdf_cache_key(file_bytes) + (brand_id, keep_tables, file_name)
+
+
+def _extraction_workers(file_count):
+    """Process-pool cap per file when several files are read at once (None: all CPUs)
+    
+    Reading runs on threads, so without processes concurrent files would share one
+    CPU; the available CPUs are split between the files read in parallel instead, and
+    each file is extracted in worker processes whatever its size.
+    """
+    if file_count < 2:
+        return None
+    in_flight = min(file_count, get_settings().import_workers)
+    return max(1, default_workers() // in_flight)
+
+
+def _start_pdf_read(file_name, file_bytes, brand_id, keep_tables, workers=None):
+    """Reuse a cached result or submit a read job; returns the job id"""
+    key = _read_key(file_name, file_bytes, brand_id, keep_tables)
+    if _cached_pdf_drivers(_pdf_cache_key(file_bytes), brand_id, keep_tables) is not None:
+        return _get_import_jobs().record(file_name, None, key=key)
+    return _get_import_jobs().submit(file_name, _read_pdf_job, file_bytes, brand_id, keep_tables, workers, key=key)
+
+
+def _render_job_progress(job, prefix=""):
+    progress = job.progress
+    if job.status == QUEUED:
+        st.progress(0.0, text=f"{prefix}Waiting for a free import worker...")
+    elif 'rows_read' in progress:
+        total = progress['rows_total']
+        st.progress(
+            min(1.0, progress['rows_read'] / total) if total else 0.0,
+            text=f"{prefix}Read {progress['rows_read']} row(s) - {progress['rows_valid']} valid, "
+                 f"{progress['rows_rejected']} rejected, {progress['rows_written']} written"
+        )
+    elif 'total_rows' in progress:
+        st.progress(
+            progress['fraction'],
+            text=f"{prefix}Inserted {progress['rows_inserted']} of {progress['total_rows']} row(s) "
+                 f"(chunk {progress['chunks_done']}/{progress['total_chunks']})"
+        )
+    elif 'page_count' in progress:
+        st.progress(
+            progress['pages_done'] / progress['page_count'],
+            text=f"{prefix}Read page {progress['pages_done']} of {progress['page_count']} - "
+                 f"{progress['rows_parsed']} driver(s) found"
+        )
+    elif job.finished:
+        st.progress(1.0, text=f"{prefix}Done")
+    else:
+        st.progress(0.0, text=f"{prefix}Reading PDF...")
+
+
+@st.fragment(run_every=1.0)
+def _poll_import_jobs(job_ids):
+    """Show the jobs' progress, refreshing every second; rerun the page once all have finished"""
+    jobs = [job for job in (_get_import_jobs().get(job_id) for job_id in job_ids) if job is not None]
+    if all(job.finished for job in jobs):
+        st.rerun()
+    
+    for job in jobs:
+        _render_job_progress(job, prefix=f"{job.label}: " if len(jobs) > 1 else "")
+    st.caption("You can leave this page - the import keeps running in the background.")
+
+
+def _import_plan(read_jobs, brand_id, drivers):
+    """Import plan for the finished read jobs, kept in st.session_state until an insert finishes
+
+    Planning fetches every stored driver of the brand, so it runs once per set of read
+    jobs rather than on every rerun (widget changes while the preview is open).
+    """
+    key = (tuple(job.id for job in read_jobs), brand_id)
+    cached = st.session_state.get(PLAN_KEY)
+    if cached is None or cached[0] != key:
+        with st.spinner("Comparing with existing drivers..."):
+            cached = (key, plan_import(fetch_drivers_for_brand(brand_id), drivers))
+        st.session_state[PLAN_KEY] = cached
+    return cached[1]
+
+
+def _take_finished_insert(session_key='pdf_insert_job'):
+    """Pop this session's insert job once it has finished, refreshing cached driver lists"""
+    job = _get_import_jobs().get(st.session_state.get(session_key))
+    if job is None or not job.finished:
+        return None
+    st.session_state.pop(session_key, None)
+    # Show newly inserted rows in the existing drivers table, and compare against them next time
+    fetch_drivers.clear()
+    st.session_state.pop(PLAN_KEY, None)
+    return job
+
+
+def _render_insert_fallback_warning():
+    st.warning("⚠️ The Drivers table has no unique key on brand, name, voltage and wattage, so rows were "
+               "inserted rather than updated: changed drivers now appear twice, and importing again "
+               "duplicates every row. Run migrations/001_drivers_natural_key.sql to fix this.")
+
+
+def _render_insert_result(job):
+    """Report a finished insert job"""
+    if job.status == FAILED:
+        st.error(f"Error inserting data: {job.error}")
+        return
+    
+    progress = job.result
+    if progress.duplicates_dropped:
+        st.info(f"ℹ️ Skipped {progress.duplicates_dropped} duplicate row(s) in the PDF (same brand, name, voltage and wattage)")
+    if progress.insert_fallback:
+        _render_insert_fallback_warning()
+    if progress.errors:
+        retry_note = "" if progress.insert_fallback else " Inserting again is safe - existing rows are updated, not duplicated."
+        st.error(f"Inserted {progress.rows_written} driver(s), but {progress.rows_failed} row(s) failed.{retry_note}")
+        for error in progress.errors:
+            st.write(f"- {error}")
+        return
+    
+    st.success(f"✅ Successfully inserted {progress.rows_written} driver(s) into the database!")
+    st.balloons()
+
+
+def _render_spreadsheet_result(job):
+    """Report a finished spreadsheet import"""
+    if job.status == FAILED:
+        st.error(f"Error importing {job.label}: {job.error}")
+        return
+    
+    result = job.result
+    if result.rows_rejected:
+        st.warning(f"⚠️ {result.rows_rejected} row(s) were rejected and not imported")
+        with st.expander("Rejected rows", expanded=False):
+            st.dataframe(pd.DataFrame(result.rejected_sample), use_container_width=True, hide_index=True)
+            if result.rows_rejected > len(result.rejected_sample):
+                st.caption(f"Showing the first {len(result.rejected_sample)} of {result.rows_rejected} rejected row(s).")
+    if result.duplicates_dropped:
+        st.info(f"ℹ️ Skipped {result.duplicates_dropped} duplicate row(s) in the file (same brand, name, voltage and wattage)")
+    if result.insert_fallback:
+        _render_insert_fallback_warning()
+    if result.errors:
+        retry_note = "" if result.insert_fallback else " Importing again is safe - existing rows are updated, not duplicated."
+        st.error(f"Imported {result.rows_written} driver(s), but {result.rows_failed} row(s) failed.{retry_note}")
+        for error in result.errors:
+            st.write(f"- {error}")
+        return
+    
+    st.success(f"✅ Imported {result.rows_written} driver(s) from {job.label}")
+
+
+def _render_spreadsheet_import(brand_names, brand_dict, finished_import=None):
+    """Spreadsheet mode: map columns, preview the first rows, then import the file in the background"""
+    st.markdown("### 📊 Upload Drivers from a Spreadsheet")
+    st.markdown("Upload a CSV or Excel (.xlsx) file with one driver per row. Choose which column holds each "
+                "driver field; every row is checked and valid rows are written in batches.")
+    
+    jobs = _get_import_jobs()
+    if finished_import is not None:
+        _render_spreadsheet_result(finished_import)
+    import_job = jobs.get(st.session_state.get('sheet_import_job'))
+    
+    if brand_names:
+        sheet_brand = st.selectbox("Select Brand for Spreadsheet Upload", brand_names, key="sheet_brand")
+        sheet_brand_id = brand_dict.get(sheet_brand)
+    else:
+        st.warning("⚠️ No brands found in database. Please add brands first.")
+        sheet_brand_id = None
+    
+    uploaded_file = st.file_uploader("Choose a CSV or XLSX file", type=['csv', 'xlsx'], key="sheet_file")
+    if uploaded_file is None:
+        if import_job is not None:
+            _poll_import_jobs([import_job.id])
+        return
+    
+    file_bytes = uploaded_file.getvalue()
+    try:
+        columns = spreadsheet_columns(file_bytes, uploaded_file.name)
+    except Exception as e:
+        st.error(f"Could not read {uploaded_file.name}: {e}")
+        return
+    
+    # Column mapping, pre-filled from the header names
+    guessed = guess_column_mapping(columns)
+    file_key = _pdf_cache_key(file_bytes)[0][:12]
+    options = [NOT_MAPPED] + columns
+    mapping = {}
+    mapping_cols = st.columns(3)
+    for idx, field_name in enumerate(FIELDS):
+        with mapping_cols[idx % 3]:
+            default = guessed.get(field_name)
+            choice = st.selectbox(field_name, options, index=options.index(default) if default else 0,
+                                  key=f"sheet_map_{field_name}_{file_key}")
+        if choice != NOT_MAPPED:
+            mapping[field_name] = choice
+    
+    problems = mapping_problems(mapping)
+    for problem in problems:
+        st.warning(f"⚠️ {problem}")
+    if problems:
+        return
+    
+    # Preview: the first rows, validated exactly as the import will
+    try:
+        first_chunk = next(iter_chunks(file_bytes, uploaded_file.name, chunk_rows=PREVIEW_ROWS), None)
+    except Exception as e:
+        st.error(f"Could not read {uploaded_file.name}: {e}")
+        return
+    if first_chunk is None:
+        st.warning("The file has a header row but no data rows.")
+        return
+    valid, rejected = validate_chunk(first_chunk, mapping, sheet_brand_id)
+    with st.expander("Preview", expanded=True):
+        st.dataframe(pd.DataFrame(to_records(valid)).drop(columns='Bid', errors='ignore'),
+                     use_container_width=True, hide_index=True)
+        st.caption(f"First {len(valid) + len(rejected)} row(s) of the file: {len(valid)} valid, {len(rejected)} rejected. "
+                   "The whole file is checked the same way while importing.")
+        if len(rejected):
+            st.dataframe(rejected, use_container_width=True, hide_index=True)
+    
+    if st.button(f"Import {uploaded_file.name}", type="primary", use_container_width=True,
+                 disabled=import_job is not None):
+        if not sheet_brand_id:
+            st.warning("⚠️ Please select a brand before importing")
+        else:
+            st.session_state['sheet_import_job'] = jobs.submit(
+                uploaded_file.name, _import_spreadsheet_job, file_bytes, uploaded_file.name, mapping,
+                sheet_brand_id, _session_token(),
+                key=(_pdf_cache_key(file_bytes)[0], sheet_brand_id, tuple(sorted(mapping.items())))
+            )
+            st.rerun()
+    
+    if import_job is not None:
+        _poll_import_jobs([import_job.id])
+
+
+def _render_import_plan(plan):
+    """Show the dry-run summary of an import before anything is written"""
+    st.markdown("#### 🧾 Import Plan (dry run)")
+    col_new, col_changed, col_same, col_missing = st.columns(4)
+    col_new.metric("New", len(plan.inserts))
+    col_changed.metric("Changed", len(plan.updates))
+    col_same.metric("Unchanged", len(plan.unchanged))
+    col_missing.metric("Not in PDF", len(plan.missing))
+    
+    if plan.duplicates:
+        st.caption(f"{plan.duplicates} repeated row(s) in the PDF were merged (the last one wins).")
+    if not plan.has_changes:
+        st.info("ℹ️ The database already matches this price list - nothing to write.")
+    
+    if plan.inserts:
+        with st.expander(f"New drivers ({len(plan.inserts)})", expanded=False):
+            st.dataframe(pd.DataFrame(plan.inserts), use_container_width=True, hide_index=True)
+    if plan.updates:
+        with st.expander(f"Changed drivers ({len(plan.updates)})", expanded=True):
+            changes = [
+                {'Name': parsed.get('Name'), 'Volt': parsed.get('Volt'), 'Watt': parsed.get('Watt'),
+                 'Changes': describe_update(existing, parsed)}
+                for existing, parsed in plan.updates
+            ]
+            st.dataframe(pd.DataFrame(changes), use_container_width=True, hide_index=True)
+    if plan.missing:
+        with st.expander(f"In database but not in this PDF ({len(plan.missing)}) - left untouched", expanded=False):
+            st.dataframe(pd.DataFrame(plan.missing), use_container_width=True, hide_index=True)
+
+
+def _column_stats(table):
+    """Per-column summary of a raw table: filled cells, distinct values, numeric share, first values"""
+    width = max((len(row) for row in table if row), default=0)
+    stats = []
+    for col_idx in range(width):
+        values = [str(row[col_idx]).strip() if row and len(row) > col_idx and row[col_idx] else ""
+                  for row in table]
+        filled = [value for value in values if value]
+        numeric = sum(1 for value in filled if _NUMBER_RE.fullmatch(value))
+        stats.append({
+            'Column': col_idx,
+            'Filled': len(filled),
+            'Distinct': len(set(filled)),
+            'Numeric %': round(100 * numeric / len(filled)) if filled else 0,
+            'First values': ' | '.join(values[:5]),
+        })
+    return stats
+
+
+def _cached_column_stats(file_key, table_idx, table):
+    """Column stats are computed once per table of a file and reused across reruns"""
+    key = ('column_stats', table_idx) + file_key
+    stats = _pdf_cache.get(key)
+    if stats is None:
+        stats = _column_stats(table)
+        _pdf_cache.put(key, stats)
+    return stats
+
+
+def _render_raw_tables(tables, file_key, widget_key="pdf_debug"):
+    """Paginated view of the extracted tables: one page of one table per run, whatever the document size"""
+    st.write(f"Found {len(tables)} table(s) in PDF")
+    if len(tables) == 0:
+        st.warning("No tables found in PDF. The PDF might not contain extractable tables.")
+        return
+    
+    col_table, col_page = st.columns([2, 1])
+    with col_table:
+        table_idx = st.selectbox(
+            "Table", range(len(tables)), key=f"{widget_key}_table",
+            format_func=lambda idx: f"Table {idx + 1} ({len(tables[idx])} rows)"
+        )
+    table = tables[table_idx]
+    page_count = max(1, math.ceil(len(table) / DEBUG_PAGE_ROWS))
+    with col_page:
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count,
+                               value=1, step=1, key=f"{widget_key}_page_{table_idx}")
+    
+    start = (page - 1) * DEBUG_PAGE_ROWS
+    rows = [list(row or []) for row in table[start:start + DEBUG_PAGE_ROWS]]
+    width = max((len(row) for row in rows), default=0)
+    page_df = pd.DataFrame(
+        [row + [None] * (width - len(row)) for row in rows],
+        columns=[f"Column {col_idx}" for col_idx in range(width)],
+        index=range(start, start + len(rows)),
+    )
+    st.dataframe(page_df, use_container_width=True)
+    
+    st.write("**Column Analysis:**")
+    st.dataframe(pd.DataFrame(_cached_column_stats(file_key, table_idx, table)),
+                 use_container_width=True, hide_index=True)
+
+
 def render_pdf_upload():
     """Render PDF upload form and handle data insertion"""
     st.subheader("📄 Upload Drivers")
     
     # Authentication section
-    import os
-    service_role_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+    service_role_key = get_settings().service_role_key
     is_authenticated = st.session_state.get('supabase_user') is not None
     
     if not service_role_key and not is_authenticated:
@@ -470,6 +796,10 @@ def render_pdf_upload():
         st.markdown("---")
         return
     
+    # Pick up background inserts that finished since the last run (before listing drivers)
+    finished_insert = _take_finished_insert()
+    finished_sheet_import = _take_finished_insert('sheet_import_job')
+    
     # Check if drivers exist in database
     try:
         existing_drivers = fetch_drivers()
@@ -586,9 +916,19 @@ def render_pdf_upload():
     
     st.markdown("---")
     
+    import_source = st.radio("Import drivers from", ["PDF price list", "Spreadsheet (CSV/XLSX)"],
+                             horizontal=True, key="import_source")
+    if import_source != "PDF price list":
+        if finished_insert is not None:
+            _render_insert_result(finished_insert)
+        _render_spreadsheet_import(brand_names, brand_dict, finished_sheet_import)
+        return
+    if finished_sheet_import is not None:
+        _render_spreadsheet_result(finished_sheet_import)
+    
     # PDF Upload section
     st.markdown("### 📄 Upload Drivers from PDF")
-    st.markdown("Upload a PDF file containing driver product information. The system will extract product details and insert them into the drivers table.")
+    st.markdown("Upload one or more PDF files containing driver product information. The system will extract product details from all of them and insert them into the drivers table in one go.")
     
     # Brand selection for PDF upload
     if brand_names:
@@ -598,65 +938,122 @@ def render_pdf_upload():
         st.warning("⚠️ No brands found in database. Please add brands first.")
         pdf_brand_id = None
     
-    uploaded_file = st.file_uploader(
-        "Choose a PDF file",
+    uploaded_files = st.file_uploader(
+        "Choose PDF files",
         type=['pdf'],
-        help="Upload a PDF file with a table containing PRODUCT, GROUP, and PRICE columns"
+        accept_multiple_files=True,
+        help="Upload one or more PDF files with a table containing PRODUCT, GROUP, and PRICE columns"
     )
     
-    if uploaded_file is not None:
+    # Debug options (raw tables are only kept in memory when asked for)
+    show_debug = st.checkbox("Show parsing debug info", value=True)
+    show_raw_tables = st.checkbox("Show raw table data", value=False,
+                                  help="Keeps every extracted table in memory - use for troubleshooting")
+    
+    jobs = _get_import_jobs()
+    read_jobs = [job for job in (jobs.get(job_id) for job_id in st.session_state.get('pdf_read_jobs', []))
+                 if job is not None]
+    
+    if uploaded_files:
         # Show file info
-        st.info(f"📎 File uploaded: {uploaded_file.name} ({uploaded_file.size} bytes)")
+        st.info(f"📎 {len(uploaded_files)} file(s) uploaded: "
+                + ", ".join(f"{uploaded_file.name} ({uploaded_file.size} bytes)" for uploaded_file in uploaded_files))
         
-        # Extract tables from PDF
-        with st.spinner("Extracting data from PDF..."):
-            tables = _extract_table_from_pdf(uploaded_file)
+        # Read each file in the background (cached by content hash); files that are
+        # unchanged, with the same brand and options, keep their existing job
+        # (unless the job's rows have since been evicted from the cache)
+        existing_jobs = {job.key: job.id for job in read_jobs
+                         if not (job.status == DONE and _read_job_result(job) is None)}
+        workers = _extraction_workers(len(uploaded_files))
+        job_ids = []
+        for uploaded_file in uploaded_files:
+            file_bytes = uploaded_file.getvalue()
+            job_id = existing_jobs.get(_read_key(uploaded_file.name, file_bytes, pdf_brand_id, show_raw_tables))
+            if job_id is None:
+                job_id = _start_pdf_read(uploaded_file.name, file_bytes, pdf_brand_id, show_raw_tables, workers)
+            job_ids.append(job_id)
+        st.session_state['pdf_read_jobs'] = job_ids
+        read_jobs = [jobs.get(job_id) for job_id in job_ids]
+    elif read_jobs:
+        # Came back to the page: the upload widget is empty but the last import is still here
+        st.info("📎 Last upload: " + ", ".join(job.label for job in read_jobs))
+    
+    if finished_insert is not None:
+        _render_insert_result(finished_insert)
+    
+    if read_jobs:
+        if not all(job.finished for job in read_jobs):
+            _poll_import_jobs([job.id for job in read_jobs])
+            return
         
-        if tables is None:
+        for job in read_jobs:
+            if job.status == FAILED:
+                st.error(f"Error reading {job.label}: {job.error}")
+        read_jobs = [job for job in read_jobs if job.status != FAILED]
+        if not read_jobs:
             st.error("Failed to extract tables from PDF.")
             return
         
-        # Show debug info - always expanded if no data found
-        show_debug_expanded = len(tables) == 0 or (len(tables) > 0 and len(tables[0]) == 0)
-        with st.expander("🔍 Debug: Raw Table Data", expanded=show_debug_expanded):
-            st.write(f"Found {len(tables)} table(s) in PDF")
-            if len(tables) == 0:
-                st.warning("No tables found in PDF. The PDF might not contain extractable tables.")
-            for idx, table in enumerate(tables):
-                st.write(f"**Table {idx + 1}** ({len(table)} rows):")
-                if table:
-                    # Show all rows for debugging
-                    for row_idx, row in enumerate(table):
-                        st.write(f"Row {row_idx}: {row}")
-                    # Also show column analysis
-                    if len(table) > 0:
-                        st.write("**Column Analysis:**")
-                        for col_idx in range(max(len(row) for row in table if row)):
-                            col_values = [str(row[col_idx]).strip() if row and len(row) > col_idx and row[col_idx] else "" 
-                                         for row in table[:10]]  # First 10 rows
-                            non_empty = [v for v in col_values if v]
-                            if non_empty:
-                                st.write(f"  Column {col_idx}: First values: {col_values[:5]}")
-        
-        # Parse tables to get driver data
-        show_debug = st.checkbox("Show parsing debug info", value=True)
-        with st.spinner("Parsing driver data..."):
-            drivers = _parse_pdf_tables(tables, show_debug=show_debug, brand_id=pdf_brand_id)
+        # Parsed rows live in the size-bounded PDF cache; with the file still uploaded an
+        # evicted result is simply read again (above), otherwise it has to be re-uploaded
+        results = {job.id: _read_job_result(job) for job in read_jobs}
+        for job in read_jobs:
+            if results[job.id] is None:
+                st.warning(f"⚠️ The rows read from {job.label} are no longer in memory - upload the file again.")
+        read_jobs = [job for job in read_jobs if results[job.id] is not None]
+        if not read_jobs:
+            return
+        
+        # The jobs' brand, not the current selection, is what the rows were parsed for
+        pdf_brand_id = read_jobs[0].key[2]
+        
+        # Combine all files into one set of rows, each tagged with the file it came from
+        # (copies, so the cached rows stay untouched)
+        drivers = []
+        debug_lines = []
+        for job in read_jobs:
+            job_drivers, job_debug_lines, _ = results[job.id]
+            drivers.extend({**driver, SOURCE_COLUMN: job.label} for driver in job_drivers)
+            if len(read_jobs) > 1:
+                debug_lines.extend(f"{job.label}: {line}" for line in job_debug_lines)
+            else:
+                debug_lines.extend(job_debug_lines)
+        
+        table_jobs = [job for job in read_jobs if results[job.id][2] is not None]
+        if table_jobs:
+            tables = [table for job in table_jobs for table in results[job.id][2]]
+            # Show debug info - always expanded if no data found
+            show_debug_expanded = len(tables) == 0 or (len(tables) > 0 and len(tables[0]) == 0)
+            with st.expander("🔍 Debug: Raw Table Data", expanded=show_debug_expanded):
+                file_idx = 0
+                if len(table_jobs) > 1:
+                    file_idx = st.selectbox("File", range(len(table_jobs)), key="pdf_debug_file",
+                                            format_func=lambda idx: table_jobs[idx].label)
+                job = table_jobs[file_idx]
+                _render_raw_tables(results[job.id][2], job.key[:2], widget_key=f"pdf_debug_{file_idx}")
+        
+        if show_debug and debug_lines:
+            # One scrollable element instead of a write per message
+            st.dataframe(pd.DataFrame({'Parsing debug info': debug_lines}),
+                         use_container_width=True, hide_index=True, height=250)
         
         if not drivers:
             st.warning("No driver data found in the PDF. Please check the PDF format.")
             st.info("Expected format: Table with PRODUCT column containing entries like 'SMPS - Slim - 12V - 36W - 3Amp'")
-            st.info("💡 **Tip:** Check the 'Debug: Raw Table Data' section above to see what was extracted from the PDF.")
+            st.info("💡 **Tip:** Tick 'Show raw table data' above to see what was extracted from the PDF.")
             return
         
         # Display parsed data
-        st.success(f"✅ Found {len(drivers)} driver(s) in the PDF")
+        if len(read_jobs) > 1:
+            st.success(f"✅ Found {len(drivers)} driver(s) in {len(read_jobs)} PDF files")
+        else:
+            st.success(f"✅ Found {len(drivers)} driver(s) in the PDF")
         
         # Show preview with brand names instead of Bid
         with st.expander("Preview extracted data", expanded=True):
             # Replace Bid with Brand name for display
             preview_drivers = []
-            for driver in drivers:
+            for driver in drivers[:PREVIEW_ROWS]:
                 preview_driver = driver.copy()
                 bid = driver.get('Bid') or driver.get('bid')
                 if bid and bid in bid_to_brand:
@@ -671,24 +1068,44 @@ def render_pdf_upload():
             
             df = pd.DataFrame(preview_drivers)
             st.dataframe(df, use_container_width=True)
+            if len(drivers) > PREVIEW_ROWS:
+                st.caption(f"Showing the first {PREVIEW_ROWS} of {len(drivers)} driver(s).")
+        
+        # Dry run: compare with what is already stored for this brand
+        plan = None
+        if pdf_brand_id:
+            try:
+                plan = _import_plan(read_jobs, pdf_brand_id, drivers)
+                _render_import_plan(plan)
+            except Exception as e:
+                st.warning(f"Could not compare with existing drivers, all rows will be written: {e}")
         
-        # Insert button
+        # Insert button - one combined write for all files, run as a background job
+        # (one per session at a time); the source tag is not a database column
+        insert_job = jobs.get(st.session_state.get('pdf_insert_job'))
+        rows_to_write = [
+            {column: value for column, value in row.items() if column != SOURCE_COLUMN}
+            for row in (plan.rows_to_write if plan is not None else drivers)
+        ]
+        insert_label = f"Apply {len(rows_to_write)} change(s)" if plan is not None else "Insert into Database"
         col1, col2 = st.columns([1, 1])
         with col1:
-            if st.button("Insert into Database", type="primary", use_container_width=True):
+            if st.button(insert_label, type="primary", use_container_width=True,
+                         disabled=insert_job is not None or (plan is not None and not plan.has_changes)):
                 if not pdf_brand_id:
                     st.warning("⚠️ Please select a brand before inserting")
                 else:
-                    try:
-                        with st.spinner("Inserting data into database..."):
-                            result = insert_drivers_batch(drivers)
-                            st.success(f"✅ Successfully inserted {len(drivers)} driver(s) into the database!")
-                            st.balloons()
-                            st.rerun()
-                    except Exception as e:
-                        st.error(f"Error inserting data: {e}")
+                    st.session_state['pdf_insert_job'] = jobs.submit(
+                        "Insert " + ", ".join(job.label for job in read_jobs), _insert_rows_job, rows_to_write,
+                        _session_token(), key=tuple(job.id for job in read_jobs)
+                    )
+                    st.rerun()
         
         with col2:
             if st.button("Clear Preview", use_container_width=True):
+                st.session_state.pop('pdf_read_jobs', None)
+                st.session_state.pop(PLAN_KEY, None)
                 st.rerun()
-
+        
+        if insert_job is not None:
+            _poll_import_jobs([insert_job.id])
@@ -1,7 +1,11 @@
 """Table display component"""
 
+import uuid
+
 import streamlit as st
-import os
+
+# Session key holding the id of this session's latest PDF render job
+RENDER_JOB_KEY = 'pdf_render_job'
 
 
 def render_table():
@@ -126,30 +130,25 @@ def render_table():
     # PDF Export
     st.markdown("### Export Options")
     
-    col1, col2 = st.columns([1, 1], gap="small")
+    from pdf_generator import quotation_key
+    from quotation_export import CSV_FILENAME, XLSX_FILENAME, XLSX_MIME
+    quote_key = quotation_key(table_data)
+    csv_bytes, xlsx_bytes = _spreadsheet_exports(table_data, quote_key)
+    
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 1], gap="small")
     
     with col1:
-        if st.button("📄 Generate PDF", type="primary", use_container_width=True, help="Generate a PDF document from the table data"):
-            try:
-                # Lazy load PDF generator
-                from pdf_generator import generate_pdf
-                with st.spinner("🔄 Generating PDF..."):
-                    filename = generate_pdf(st.session_state.table_data)
-                    with open(filename, "rb") as pdf_file:
-                        st.download_button(
-                            label="⬇️ Download PDF",
-                            data=pdf_file.read(),
-                            file_name=filename,
-                            mime="application/pdf",
-                            use_container_width=True,
-                            type="primary"
-                        )
-                    os.remove(filename)
-                    st.success("✅ PDF generated successfully!")
-            except Exception as e:
-                st.error(f"❌ Error generating PDF: {e}")
+        _render_pdf_export(table_data, quote_key)
     
     with col2:
+        st.download_button("📑 Download CSV", data=csv_bytes, file_name=CSV_FILENAME, mime="text/csv",
+                           use_container_width=True, help="Quotation rows as CSV, with numeric Price and running Total columns")
+    
+    with col3:
+        st.download_button("📗 Download XLSX", data=xlsx_bytes, file_name=XLSX_FILENAME, mime=XLSX_MIME,
+                           use_container_width=True, help="Quotation rows as an Excel workbook, with numeric Price and running Total columns")
+    
+    with col4:
         if st.button("🗑️ Clear PDF", type="secondary", use_container_width=True, help="Remove all entries from the PDF"):
             if st.session_state.table_data:
                 count = len(st.session_state.table_data)
@@ -160,3 +159,92 @@ def render_table():
             else:
                 st.info("PDF is already empty")
 
+
+@st.fragment(run_every=1.0)
+def _poll_render_job(job_id):
+    """Show the render job's state, refreshing every second; rerun the page once it has finished"""
+    from render_service import get_render_service
+    
+    service = get_render_service()
+    job = service.get(job_id)
+    if job is None or job.finished:
+        st.rerun()
+    
+    position = service.queue_position(job_id)
+    if position is None:
+        st.progress(0.5, text="🔄 Generating PDF...")
+    else:
+        ahead = f" ({position} ahead)" if position else ""
+        st.progress(0.0, text=f"⏳ Waiting for a free PDF worker{ahead}...")
+
+
+def _spreadsheet_exports(table_data, quote_key):
+    """(csv_bytes, xlsx_bytes) of the quotation, rebuilt only when the table changes"""
+    from quotation_export import quotation_csv_bytes, quotation_xlsx_bytes
+    
+    cached = st.session_state.get('quotation_exports')
+    if cached is None or cached[0] != quote_key:
+        cached = (quote_key, quotation_csv_bytes(table_data), quotation_xlsx_bytes(table_data))
+        st.session_state['quotation_exports'] = cached
+    return cached[1], cached[2]
+
+
+def _submit_pdf_render(table_data):
+    """Queue a render of the table for this session; returns False (with a message) if it can't"""
+    from render_service import QueueFull, submit_render
+    
+    # One queue per browser session, so busy sessions can't starve the others
+    owner = st.session_state.setdefault('render_owner', uuid.uuid4().hex)
+    try:
+        st.session_state[RENDER_JOB_KEY] = submit_render(owner, table_data)
+        return True
+    except QueueFull:
+        st.warning("⏳ Many PDFs are being generated right now - please try again in a moment.")
+    except Exception as e:
+        st.error(f"❌ Error generating PDF: {e}")
+    return False
+
+
+def _render_pdf_export(table_data, quote_key):
+    """Generate PDF button, then the pending render or the finished PDF's download button
+    
+    Rendering happens in the background render service, so this session's script
+    thread isn't held while ReportLab runs. The download stays available until the
+    table changes.
+    """
+    from pdf_generator import DEFAULT_FILENAME
+    from render_service import get_render_service, job_pdf_bytes
+    from job_runner import FAILED
+    
+    if st.button("📄 Generate PDF", type="primary", use_container_width=True, help="Generate a PDF document from the table data"):
+        _submit_pdf_render(table_data)
+    
+    job = get_render_service().get(st.session_state.get(RENDER_JOB_KEY))
+    if job is None or job.key != quote_key:
+        # No PDF yet, or it was rendered before the table changed
+        return
+    if not job.finished:
+        _poll_render_job(job.id)
+        return
+    if job.status == FAILED:
+        st.error(f"❌ Error generating PDF: {job.error}")
+        return
+    
+    pdf_bytes = job_pdf_bytes(job)
+    if pdf_bytes is None:
+        # The render cache dropped this PDF to make room: render it again
+        if _submit_pdf_render(table_data):
+            st.rerun()
+        return
+    from_cache = job.result[1]
+    st.download_button(
+        label="⬇️ Download PDF",
+        data=pdf_bytes,
+        file_name=DEFAULT_FILENAME,
+        mime="application/pdf",
+        use_container_width=True,
+        type="primary"
+    )
+    st.success("✅ PDF generated successfully!")
+    if from_cache:
+        st.caption("⚡ Quotation unchanged: served the previously generated PDF")
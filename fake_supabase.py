@@ -0,0 +1,506 @@
+"""Local stand-in for the Supabase client, used for offline load and latency testing
+
+Select it by setting SUPABASE_BACKEND=fake (see settings.py). The fake serves the Particulars, Brand
+and Drivers tables through the same query-builder calls that supabase_client.py
+makes (table().select().eq().limit().execute(), insert(), auth.sign_in_with_password()),
+backed by SQLite so concurrent sessions share one consistent store. http_transport()
+exposes the same store as PostgREST/auth HTTP endpoints for the async data layer.
+
+Tuning (all optional):
+    FAKE_SUPABASE_DB            SQLite path, default in-memory
+    FAKE_SUPABASE_LATENCY_MS    injected latency per request, e.g. "40" or "20-80"
+    FAKE_SUPABASE_FAILURE_RATE  probability (0-1) that a request fails
+    FAKE_SUPABASE_RANDOM_SEED   seed for reproducible latency/failure sequences
+"""
+
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+
+# Column layout of each table (id is added automatically)
+TABLE_COLUMNS = {
+    'Particulars': {'Particulars': 'TEXT'},
+    'Brand': {'Brand': 'TEXT'},
+    'Drivers': {
+        'Name': 'TEXT',
+        'Volt': 'INTEGER',
+        'Watt': 'INTEGER',
+        'Amp': 'REAL',
+        'Price': 'REAL',
+        'Bid': 'INTEGER',
+        'Place': 'TEXT',
+    },
+}
+
+# Seed data so the app is usable right after start-up
+DEFAULT_FIXTURES = {
+    'Particulars': [{'Particulars': 'Drivers'}, {'Particulars': 'LED strips'}],
+    'Brand': [{'Brand': 'Tycoon'}, {'Brand': 'Generic'}],
+    'Drivers': [
+        {'Name': 'SMPS Slim', 'Volt': 12, 'Watt': 36, 'Amp': 3.0, 'Price': 460, 'Bid': 1, 'Place': 'indoor'},
+        {'Name': 'SMPS Slim', 'Volt': 12, 'Watt': 60, 'Amp': 5.0, 'Price': 600, 'Bid': 1, 'Place': 'indoor'},
+        {'Name': 'SMPS Slim', 'Volt': 24, 'Watt': 100, 'Amp': 4.2, 'Price': 820, 'Bid': 1, 'Place': 'indoor'},
+        {'Name': 'Waterproof SMPS', 'Volt': 12, 'Watt': 100, 'Amp': 8.3, 'Price': 1150, 'Bid': 2, 'Place': 'outdoor'},
+        {'Name': 'Waterproof SMPS', 'Volt': 24, 'Watt': 300, 'Amp': 12.5, 'Price': 2400, 'Bid': 2, 'Place': 'outdoor'},
+    ],
+}
+
+
+class FakeSupabaseError(Exception):
+    """Raised for injected failures and invalid requests, like postgrest's APIError"""
+
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+def _parse_latency(value):
+    """Parse "40" or "20-80" (milliseconds) into a (low, high) range in seconds"""
+    if not value:
+        return 0.0, 0.0
+    low, _, high = str(value).partition('-')
+    low = float(low) / 1000.0
+    high = float(high) / 1000.0 if high else low
+    return min(low, high), max(low, high)
+
+
+class FakeStore:
+    """SQLite-backed table store shared by every fake client in the process"""
+
+    def __init__(self, db_path=":memory:", latency_ms=None, failure_rate=0.0, seed=None, fixtures=None):
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self.latency = _parse_latency(latency_ms)
+        self.failure_rate = float(failure_rate or 0.0)
+        self._random = random.Random(seed)
+        self.request_count = 0
+        self.failure_count = 0
+        self._create_tables(DEFAULT_FIXTURES if fixtures is None else fixtures)
+
+    @classmethod
+    def from_env(cls):
+        """Build a store from the FAKE_SUPABASE_* environment variables"""
+        seed = os.getenv("FAKE_SUPABASE_RANDOM_SEED")
+        return cls(
+            db_path=os.getenv("FAKE_SUPABASE_DB") or ":memory:",
+            latency_ms=os.getenv("FAKE_SUPABASE_LATENCY_MS"),
+            failure_rate=float(os.getenv("FAKE_SUPABASE_FAILURE_RATE") or 0.0),
+            seed=int(seed) if seed else None,
+        )
+
+    def _create_tables(self, fixtures):
+        with self._lock:
+            for table, columns in TABLE_COLUMNS.items():
+                exists = self._conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)
+                ).fetchone()
+                if exists:
+                    continue
+                column_sql = ", ".join(f'"{name}" {kind}' for name, kind in columns.items())
+                self._conn.execute(f'CREATE TABLE "{table}" (id INTEGER PRIMARY KEY AUTOINCREMENT, {column_sql})')
+                if fixtures.get(table):
+                    self._insert_rows(table, fixtures[table])
+            self._conn.commit()
+
+    def network_outcome(self):
+        """Draw the latency (seconds) and failure flag for one request"""
+        with self._lock:
+            self.request_count += 1
+            low, high = self.latency
+            delay = self._random.uniform(low, high) if high else 0.0
+            failed = self.failure_rate > 0 and self._random.random() < self.failure_rate
+            if failed:
+                self.failure_count += 1
+        return delay, failed
+
+    def simulate_network(self):
+        """Sleep for the configured latency and raise an injected failure at the configured rate"""
+        delay, failed = self.network_outcome()
+        if delay:
+            time.sleep(delay)
+        if failed:
+            raise FakeSupabaseError("Injected failure: service unavailable", code="503")
+
+    def sign_in(self, email, password):
+        """Issue a session for any non-empty credentials"""
+        if not email or not password:
+            raise FakeSupabaseError("Invalid login credentials", code="400")
+        user = SimpleNamespace(id=str(uuid.uuid5(uuid.NAMESPACE_URL, email)), email=email)
+        return SimpleNamespace(
+            access_token=f"fake-access-{uuid.uuid4().hex}",
+            refresh_token=f"fake-refresh-{uuid.uuid4().hex}",
+            user=user,
+        )
+
+    def refresh(self, refresh_token):
+        """Issue new tokens for a refresh token this store handed out"""
+        if not refresh_token or not str(refresh_token).startswith('fake-refresh-'):
+            raise FakeSupabaseError("Invalid Refresh Token", code="400")
+        return SimpleNamespace(
+            access_token=f"fake-access-{uuid.uuid4().hex}",
+            refresh_token=f"fake-refresh-{uuid.uuid4().hex}",
+            user=SimpleNamespace(),
+        )
+
+    def _check_table(self, table, columns=None):
+        if table not in TABLE_COLUMNS:
+            raise FakeSupabaseError(f'relation "public.{table}" does not exist', code="42P01")
+        known = set(TABLE_COLUMNS[table]) | {'id'}
+        for column in columns or []:
+            if column not in known:
+                raise FakeSupabaseError(f'column {table}.{column} does not exist', code="42703")
+
+    def _insert_rows(self, table, rows):
+        inserted = []
+        for row in rows:
+            self._check_table(table, row.keys())
+            columns = list(row.keys())
+            placeholders = ", ".join("?" for _ in columns)
+            column_sql = ", ".join(f'"{c}"' for c in columns)
+            if columns:
+                cursor = self._conn.execute(
+                    f'INSERT INTO "{table}" ({column_sql}) VALUES ({placeholders})',
+                    [row[c] for c in columns],
+                )
+            else:
+                cursor = self._conn.execute(f'INSERT INTO "{table}" DEFAULT VALUES')
+            inserted.append(cursor.lastrowid)
+        return inserted
+
+    def select(self, table, columns="*", filters=None, order=None, limit=None, offset=None):
+        """Return rows as dicts; filters is a list of (column, op, value)"""
+        selected = [c.strip() for c in columns.split(',')] if columns and columns != '*' else None
+        self._check_table(table, (selected or []) + [f[0] for f in filters or []])
+        column_sql = ", ".join(f'"{c}"' for c in selected) if selected else "*"
+        where_sql, params = self._where(filters)
+        sql = f'SELECT {column_sql} FROM "{table}"{where_sql}'
+        if order:
+            column, descending = order
+            self._check_table(table, [column])
+            sql += f' ORDER BY "{column}"' + (" DESC" if descending else "")
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params += [-1 if limit is None else int(limit), int(offset or 0)]
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    def insert(self, table, rows):
+        """Insert rows and return them as stored (including ids)"""
+        with self._lock:
+            try:
+                ids = self._insert_rows(table, rows)
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+            return self._rows_by_id(table, ids)
+
+    def upsert(self, table, rows, on_conflict, ignore_duplicates=False):
+        """Insert rows, or update the row matching the on_conflict columns (merge-duplicates)"""
+        conflict_columns = [c.strip() for c in on_conflict.split(',') if c.strip()]
+        if not conflict_columns:
+            return self.insert(table, rows)
+        self._check_table(table, conflict_columns)
+        with self._lock:
+            try:
+                ids = []
+                for row in rows:
+                    self._check_table(table, row.keys())
+                    where_sql, params = self._where([(c, 'eq', row.get(c)) for c in conflict_columns])
+                    existing = self._conn.execute(f'SELECT id FROM "{table}"{where_sql}', params).fetchone()
+                    if existing is None:
+                        ids.extend(self._insert_rows(table, [row]))
+                        continue
+                    if not ignore_duplicates:
+                        updates = [c for c in row.keys() if c != 'id']
+                        if updates:
+                            set_sql = ", ".join(f'"{c}" = ?' for c in updates)
+                            self._conn.execute(
+                                f'UPDATE "{table}" SET {set_sql} WHERE id = ?',
+                                [row[c] for c in updates] + [existing['id']],
+                            )
+                        ids.append(existing['id'])
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+            return self._rows_by_id(table, ids)
+
+    def _rows_by_id(self, table, ids):
+        if not ids:
+            return []
+        placeholders = ", ".join("?" for _ in ids)
+        rows = self._conn.execute(f'SELECT * FROM "{table}" WHERE id IN ({placeholders}) ORDER BY id', ids)
+        return [dict(row) for row in rows.fetchall()]
+
+    @staticmethod
+    def _where(filters):
+        if not filters:
+            return "", []
+        clauses = []
+        params = []
+        for column, op, value in filters:
+            if op == 'in':
+                values = list(value)
+                if not values:
+                    clauses.append("0")
+                    continue
+                clauses.append(f'"{column}" IN ({", ".join("?" for _ in values)})')
+                params.extend(values)
+            elif value is None:
+                clauses.append(f'"{column}" IS NULL')
+            else:
+                clauses.append(f'"{column}" = ?')
+                params.append(value)
+        return " WHERE " + " AND ".join(clauses), params
+
+
+class FakeResponse:
+    """Mirror of postgrest's APIResponse (data and count)"""
+
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeQueryBuilder:
+    """Chainable query builder matching the subset of postgrest used by the app"""
+
+    def __init__(self, store, table):
+        self._store = store
+        self._table = table
+        self._action = 'select'
+        self._columns = '*'
+        self._rows = None
+        self._on_conflict = ''
+        self._ignore_duplicates = False
+        self._filters = []
+        self._order = None
+        self._limit = None
+        self._offset = None
+
+    def select(self, columns='*', count=None):
+        self._action = 'select'
+        self._columns = columns
+        return self
+
+    def insert(self, rows):
+        self._action = 'insert'
+        self._rows = [rows] if isinstance(rows, dict) else list(rows)
+        return self
+
+    def upsert(self, rows, on_conflict='', ignore_duplicates=False):
+        self._action = 'upsert'
+        self._rows = [rows] if isinstance(rows, dict) else list(rows)
+        self._on_conflict = on_conflict
+        self._ignore_duplicates = ignore_duplicates
+        return self
+
+    def eq(self, column, value):
+        self._filters.append((column, 'eq', value))
+        return self
+
+    def in_(self, column, values):
+        self._filters.append((column, 'in', values))
+        return self
+
+    def order(self, column, desc=False):
+        self._order = (column, desc)
+        return self
+
+    def limit(self, size):
+        self._limit = size
+        return self
+
+    def range(self, start, end):
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def execute(self):
+        self._store.simulate_network()
+        if self._action == 'insert':
+            data = self._store.insert(self._table, self._rows)
+        elif self._action == 'upsert':
+            data = self._store.upsert(self._table, self._rows, self._on_conflict, self._ignore_duplicates)
+        else:
+            data = self._store.select(self._table, self._columns, self._filters,
+                                      self._order, self._limit, self._offset)
+        return FakeResponse(data, count=len(data))
+
+
+class FakeAuth:
+    """Password auth that accepts any non-empty credentials"""
+
+    def __init__(self, store):
+        self._store = store
+        self.session = None
+
+    def sign_in_with_password(self, credentials):
+        self._store.simulate_network()
+        credentials = credentials or {}
+        self.session = self._store.sign_in(credentials.get('email'), credentials.get('password'))
+        return SimpleNamespace(session=self.session, user=self.session.user)
+
+    def set_session(self, access_token, refresh_token):
+        self.session = SimpleNamespace(access_token=access_token, refresh_token=refresh_token, user=None)
+        return SimpleNamespace(session=self.session, user=None)
+
+
+class FakeClient:
+    """Drop-in replacement for supabase.Client backed by a FakeStore"""
+
+    def __init__(self, store=None, key=None):
+        # Without an explicit store, follow the process-wide one (so reset_store() applies)
+        self._store = store
+        self.key = key
+        self.auth = FakeAuth(self.store)
+
+    @property
+    def store(self):
+        return self._store or get_store()
+
+    def table(self, table_name):
+        return FakeQueryBuilder(self.store, table_name)
+
+    # supabase.Client exposes from_() as an alias of table()
+    from_ = table
+
+
+def _parse_filters(params):
+    """Turn PostgREST query params (col=eq.1, col=in.(1,2)) into store filters"""
+    filters = []
+    for column, expression in params.multi_items():
+        if column in ('select', 'limit', 'offset', 'order', 'on_conflict'):
+            continue
+        op, _, value = expression.partition('.')
+        if op == 'eq':
+            filters.append((column, 'eq', None if value == 'null' else _coerce(value)))
+        elif op == 'in':
+            values = value.strip('()')
+            filters.append((column, 'in', [_coerce(v) for v in values.split(',')] if values else []))
+        elif op == 'is' and value == 'null':
+            filters.append((column, 'eq', None))
+        else:
+            raise FakeSupabaseError(f'unsupported filter operator "{op}"', code="PGRST100")
+    return filters
+
+
+def _coerce(value):
+    """Coerce a query-string value the way PostgREST compares it against typed columns"""
+    value = value.strip('"')
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _error_response(httpx, status, error):
+    return httpx.Response(status, json={'message': error.message, 'code': error.code})
+
+
+def _handle_http_request(httpx, store, request):
+    """Serve one PostgREST/GoTrue request from the store"""
+    path = request.url.path
+    try:
+        if path.startswith('/auth/v1/token'):
+            body = json.loads(request.content or b'{}')
+            if request.url.params.get('grant_type') == 'refresh_token':
+                session = store.refresh(body.get('refresh_token'))
+            else:
+                session = store.sign_in(body.get('email'), body.get('password'))
+            return httpx.Response(200, json={
+                'access_token': session.access_token,
+                'refresh_token': session.refresh_token,
+                'token_type': 'bearer',
+                'user': vars(session.user),
+            })
+        if not path.startswith('/rest/v1/'):
+            return httpx.Response(404, json={'message': f'No route for {path}', 'code': '404'})
+
+        table = path[len('/rest/v1/'):].strip('/')
+        params = request.url.params
+        if request.method == 'GET':
+            order = None
+            if params.get('order'):
+                column, _, direction = params['order'].partition('.')
+                order = (column, direction == 'desc')
+            data = store.select(
+                table,
+                params.get('select', '*'),
+                _parse_filters(params),
+                order,
+                params.get('limit'),
+                params.get('offset'),
+            )
+            return httpx.Response(200, json=data)
+        if request.method == 'POST':
+            rows = json.loads(request.content or b'[]')
+            rows = [rows] if isinstance(rows, dict) else rows
+            prefer = request.headers.get('prefer', '')
+            if 'resolution=' in prefer:
+                data = store.upsert(table, rows, params.get('on_conflict', ''),
+                                    ignore_duplicates='resolution=ignore-duplicates' in prefer)
+            else:
+                data = store.insert(table, rows)
+            if 'return=minimal' in prefer:
+                return httpx.Response(201)
+            return httpx.Response(201, json=data)
+        return httpx.Response(405, json={'message': f'{request.method} not supported', 'code': '405'})
+    except FakeSupabaseError as e:
+        status = 404 if e.code == '42P01' else 400
+        return _error_response(httpx, status, e)
+
+
+def http_transport(store=None):
+    """httpx.AsyncClient transport that answers PostgREST and auth requests from the fake store.
+
+    Latency is injected with asyncio.sleep so concurrent requests overlap like real I/O.
+    """
+    import httpx
+
+    async def handler(request):
+        current = store or get_store()
+        delay, failed = current.network_outcome()
+        if delay:
+            await asyncio.sleep(delay)
+        if failed:
+            return _error_response(httpx, 503, FakeSupabaseError("Injected failure: service unavailable", code="503"))
+        return _handle_http_request(httpx, current, request)
+
+    return httpx.MockTransport(handler)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the process-wide fake store, creating it from the environment on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = FakeStore.from_env()
+        return _store
+
+
+def reset_store(store=None):
+    """Replace the process-wide store (a fresh one from the environment if None)"""
+    global _store
+    with _store_lock:
+        _store = store
+
+
+def create_client(supabase_url=None, supabase_key=None):
+    """Same call shape as supabase.create_client, returning a FakeClient"""
+    return FakeClient(key=supabase_key)
@@ -0,0 +1,83 @@
+"""Diff-based planning for price-list imports
+
+Compares the rows parsed from a brand's price list with the Drivers rows already
+stored for that brand, keyed by the natural key (Bid, Name, Volt, Watt), so that a
+monthly re-upload only writes new and changed rows.
+"""
+
+from dataclasses import dataclass, field
+
+from bulk_writer import natural_key
+
+# Non-key columns compared to decide whether an existing row changed
+COMPARED_COLUMNS = ('Amp', 'Price', 'Place')
+
+
+@dataclass
+class ImportPlan:
+    """Outcome of comparing parsed rows with existing rows"""
+    inserts: list = field(default_factory=list)      # parsed rows with no existing match
+    updates: list = field(default_factory=list)      # (existing, parsed) pairs whose values differ
+    unchanged: list = field(default_factory=list)    # parsed rows identical to the stored row
+    missing: list = field(default_factory=list)      # stored rows not present in the price list
+    duplicates: int = 0                              # parsed rows repeating an earlier key
+
+    @property
+    def rows_to_write(self):
+        """Rows to send to the database (inserts and updated rows)"""
+        return self.inserts + [parsed for _, parsed in self.updates]
+
+    @property
+    def has_changes(self):
+        return bool(self.inserts or self.updates)
+
+
+def _same_value(old, new):
+    """Compare stored and parsed values, tolerating int/float and float rounding differences"""
+    if old is None or new is None:
+        return old is None and new is None
+    if isinstance(old, (int, float)) and isinstance(new, (int, float)):
+        return round(float(old), 4) == round(float(new), 4)
+    return str(old).strip().lower() == str(new).strip().lower()
+
+
+def _changed_columns(existing, parsed):
+    """Columns (present in the parsed row) whose values differ from the stored row"""
+    return [
+        column for column in COMPARED_COLUMNS
+        if column in parsed and not _same_value(existing.get(column), parsed.get(column))
+    ]
+
+
+def plan_import(existing_rows, parsed_rows):
+    """Build an ImportPlan in one pass over each input.
+
+    existing_rows should be the stored rows of the same brand(s) as parsed_rows. When
+    the price list repeats a key, the last occurrence wins (as in the bulk writer).
+    """
+    existing_by_key = {natural_key(row): row for row in existing_rows}
+
+    parsed_by_key = {}
+    for row in parsed_rows:
+        parsed_by_key[natural_key(row)] = row
+    plan = ImportPlan(duplicates=len(parsed_rows) - len(parsed_by_key))
+
+    for key, parsed in parsed_by_key.items():
+        existing = existing_by_key.get(key)
+        if existing is None:
+            plan.inserts.append(parsed)
+        elif _changed_columns(existing, parsed):
+            plan.updates.append((existing, parsed))
+        else:
+            plan.unchanged.append(parsed)
+
+    plan.missing = [row for key, row in existing_by_key.items() if key not in parsed_by_key]
+    return plan
+
+
+def describe_update(existing, parsed):
+    """Human-readable summary of what an update changes, e.g. "Price: 460 → 480" """
+    return ", ".join(
+        f"{column}: {existing.get(column)} → {parsed.get(column)}"
+        for column in _changed_columns(existing, parsed)
+    )
@@ -0,0 +1,172 @@
+"""Background jobs for long-running work started from Streamlit pages
+
+A page submits a function to a JobRunner and keeps the returned job id in
+st.session_state. The work runs on a worker thread, so it survives reruns and page
+changes and doesn't stall the script thread for other users; the function reports
+progress through the callback it is given, and the page polls snapshots with get().
+
+    job_id = runner.submit("Import price list", work, file_bytes, key=file_hash)
+    job = runner.get(job_id)   # job.status, job.progress, job.result, job.error
+
+FairJobRunner additionally takes queued jobs round-robin across owners (e.g. browser
+sessions) and refuses new jobs once max_queued are waiting.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+@dataclass
+class Job:
+    """State of one background job (get() hands out copies)"""
+    id: str
+    label: str
+    key: tuple = None                  # caller-defined identity, e.g. (file hash, brand id)
+    status: str = QUEUED
+    progress: dict = field(default_factory=dict)
+    result: object = None
+    error: str = None
+    created_at: float = field(default_factory=time.time)
+    started_at: float = None
+    finished_at: float = None
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED)
+
+
+class JobRunner:
+    """Thread pool plus an in-memory job table.
+
+    Finished jobs are kept (with their results) until more than keep_finished of
+    them have accumulated; the oldest are dropped first.
+    """
+
+    def __init__(self, max_workers=2, keep_finished=20, name="jobs"):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._keep_finished = keep_finished
+
+    def submit(self, label, fn, *args, key=None, **kwargs):
+        """Queue fn(progress, *args, **kwargs) and return the job id.
+
+        progress(**values) merges values into the job's progress dict; fn's return
+        value becomes job.result, and an exception marks the job failed.
+        """
+        job = Job(id=uuid.uuid4().hex, label=label, key=key)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job.id, fn, args, kwargs)
+        return job.id
+
+    def record(self, label, result, key=None):
+        """Store a job that needed no background work (e.g. a cache hit) and return its id"""
+        now = time.time()
+        job = Job(id=uuid.uuid4().hex, label=label, key=key, status=DONE, result=result,
+                  started_at=now, finished_at=now)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        return job.id
+
+    def _run(self, job_id, fn, args, kwargs):
+        self._set(job_id, status=RUNNING, started_at=time.time())
+        try:
+            result = fn(lambda **values: self.update(job_id, **values), *args, **kwargs)
+        except Exception as e:
+            self._set(job_id, status=FAILED, error=str(e) or type(e).__name__, finished_at=time.time())
+        else:
+            self._set(job_id, status=DONE, result=result, finished_at=time.time())
+        with self._lock:
+            self._prune()
+
+    def _set(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                for name, value in fields.items():
+                    setattr(job, name, value)
+
+    def update(self, job_id, **values):
+        """Record progress for a running job"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.progress = {**job.progress, **values}
+
+    def get(self, job_id):
+        """Snapshot of a job, or None if the id is unknown or has been pruned"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return replace(job, progress=dict(job.progress)) if job is not None else None
+
+    def jobs(self):
+        """Snapshots of all known jobs, oldest first"""
+        with self._lock:
+            return [replace(job, progress=dict(job.progress)) for job in self._jobs.values()]
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self._keep_finished)]:
+            del self._jobs[job_id]
+
+
+class QueueFull(Exception):
+    """Raised by FairJobRunner.submit when max_queued jobs are already waiting"""
+
+
+class FairJobRunner(JobRunner):
+    """JobRunner whose waiting jobs are shared fairly between owners.
+
+    Each owner has its own queue; a free worker takes the oldest job of the owner whose
+    turn it is, and that owner then goes to the back of the line. One owner submitting
+    many jobs therefore delays others by at most one job per round.
+    """
+
+    def __init__(self, max_workers=2, max_queued=20, keep_finished=20, name="jobs"):
+        super().__init__(max_workers=max_workers, keep_finished=keep_finished, name=name)
+        self.max_queued = max_queued
+        self._queues = OrderedDict()  # owner -> deque of (job_id, fn, args, kwargs), in turn order
+
+    def submit(self, label, fn, *args, key=None, owner=None, **kwargs):
+        """Queue fn(progress, *args, **kwargs) for owner and return the job id (QueueFull if saturated)"""
+        job = Job(id=uuid.uuid4().hex, label=label, key=key)
+        with self._lock:
+            if sum(len(queue) for queue in self._queues.values()) >= self.max_queued:
+                raise QueueFull(f"{self.max_queued} job(s) are already waiting")
+            self._jobs[job.id] = job
+            self._queues.setdefault(owner, deque()).append((job.id, fn, args, kwargs))
+        # Each pool task runs whichever job is next in turn, not necessarily this one
+        self._executor.submit(self._run_next)
+        return job.id
+
+    def _run_next(self):
+        with self._lock:
+            owner, queue = next(iter(self._queues.items()))
+            job_id, fn, args, kwargs = queue.popleft()
+            del self._queues[owner]
+            if queue:
+                self._queues[owner] = queue
+        self._run(job_id, fn, args, kwargs)
+
+    def queue_position(self, job_id):
+        """Number of waiting jobs that will start before job_id, or None if it isn't waiting"""
+        with self._lock:
+            queues = [[item[0] for item in queue] for queue in self._queues.values()]
+        for turn, ids in enumerate(queues):
+            if job_id in ids:
+                depth = ids.index(job_id)
+                # Owners ahead in turn order get one extra job in before this one
+                return depth + sum(min(len(other), depth + (other_turn < turn))
+                                   for other_turn, other in enumerate(queues) if other_turn != turn)
+        return None
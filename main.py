@@ -9,6 +9,7 @@ from components.table_display import render_table
 from components.pdf_upload import render_pdf_upload
 from components.login import render_login
 from supabase_client import fetch_particulars, fetch_brands, authenticate_user
+from settings import get_settings
 
 # Page configuration - optimized for mobile
 st.set_page_config(
@@ -81,6 +82,9 @@ components.html(hide_rerun_html, height=0)
 # Initialize session state
 initialize_session_state()
 
+# Resolve and validate configuration once per process (cached afterwards)
+get_settings()
+
 # Check auth status
 is_logged_in = st.session_state.get('supabase_user') is not None
 current_page = st.session_state.get('current_page', 'Home')
@@ -0,0 +1,31 @@
+-- Unique natural key on Drivers, required by the bulk upsert in bulk_writer.py
+-- (POST /rest/v1/Drivers?on_conflict=Bid,Name,Volt,Watt).
+--
+-- Imports made before the upsert existed inserted every row, so re-uploaded price
+-- lists left duplicate (Bid, Name, Volt, Watt) rows behind. Those are removed first,
+-- keeping the most recently inserted row (highest id) of each key, so the constraint
+-- can be added. Names are trimmed first, as bulk_writer does before writing.
+--
+-- Run once in the Supabase SQL editor (or psql). Safe to re-run.
+
+BEGIN;
+
+UPDATE "Drivers" SET "Name" = btrim("Name") WHERE "Name" <> btrim("Name");
+
+DELETE FROM "Drivers" AS older
+USING "Drivers" AS newer
+WHERE older."Bid" = newer."Bid"
+  AND older."Name" = newer."Name"
+  AND older."Volt" = newer."Volt"
+  AND older."Watt" = newer."Watt"
+  AND older.id < newer.id;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'drivers_natural_key') THEN
+        ALTER TABLE "Drivers" ADD CONSTRAINT drivers_natural_key UNIQUE ("Bid", "Name", "Volt", "Watt");
+    END IF;
+END
+$$;
+
+COMMIT;
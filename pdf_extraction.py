@@ -0,0 +1,408 @@
+"""Table extraction from price-list PDFs
+
+Kept free of Streamlit so it can run inside worker processes. Pages are independent
+and extraction is pure CPU work, so large documents are split into page ranges and
+extracted in a process pool. iter_page_tables() streams the results in page order,
+so callers can parse each page and drop it instead of holding every table at once.
+
+Clean text listings ("SMPS - Slim - 12V - 36W - 3Amp ... 460") skip table detection
+altogether: the page text is read once and product/price lines are turned into a
+synthetic PRODUCT/PRICE table (text_layer_table()). Table extraction runs only on
+pages where that fast path finds nothing usable, and the hit rate is logged.
+
+Instead of running the whole strategy cascade on every page, the first few pages are
+probed to find the strategy that works for the document. It is remembered per
+brand/layout fingerprint and used directly on the remaining pages, falling back to
+the cascade only on pages where it finds nothing.
+"""
+
+import io
+import logging
+import os
+import re
+import threading
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+
+import pdfplumber
+
+from product_parser import parse_product_name
+
+# pdfplumber table settings, tried in order until one finds tables on a page
+TABLE_STRATEGIES = [
+    ("lines_strict", {
+        "vertical_strategy": "lines_strict",
+        "horizontal_strategy": "lines_strict",
+        "snap_tolerance": 3,
+        "join_tolerance": 3,
+    }),
+    ("text", {
+        "vertical_strategy": "text",
+        "horizontal_strategy": "text",
+    }),
+    ("default", None),
+]
+
+# A text line holding one product and its price, optionally with dot leaders or a currency
+_PRODUCT_LINE_RE = re.compile(
+    r'(?P<product>.*?\d+V.*?)[\s.]*\s(?:(?:Rs\.?|INR|₹)\s*)?'
+    r'(?P<price>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)'
+)
+_VOLTAGE_RE = re.compile(r'\d+V')
+# A fast-path product has to end with its last rating; anything after it (a second
+# price column, a quantity) means the page is not a plain product/price listing
+_RATING_END_RE = re.compile(r'\d+(?:\.\d+)?\s*(?:V|W|A|Amps?|mA)$', re.IGNORECASE)
+
+# Pages probed with the full cascade to pick a document's strategy
+PROBE_PAGES = 3
+# Remembered strategies (brand/layout fingerprint -> strategy name)
+STRATEGY_MEMORY_SIZE = 256
+
+# Below this many pages, process start-up costs more than it saves
+PARALLEL_MIN_PAGES = 12
+# Aim for a few tasks per worker so uneven pages still balance out
+TASKS_PER_WORKER = 4
+# Page ranges in flight per worker while streaming; finished ranges wait for the consumer
+IN_FLIGHT_PER_WORKER = 2
+
+
+logger = logging.getLogger(__name__)
+
+_strategy_settings = dict(TABLE_STRATEGIES)
+_strategy_memory = OrderedDict()
+_strategy_memory_lock = threading.Lock()
+
+# Pages seen and pages served by the text-layer fast path, for this process
+_fast_path_totals = Counter()
+_fast_path_lock = threading.Lock()
+
+
+def _run_strategy(page, name):
+    settings = _strategy_settings[name]
+    return page.extract_tables(table_settings=settings) if settings else page.extract_tables()
+
+
+def _run_cascade(page, skip=None):
+    """Try strategies in order; returns (winning strategy name or None, tables)"""
+    for name, _ in TABLE_STRATEGIES:
+        if name == skip:
+            continue
+        tables = _run_strategy(page, name)
+        if tables:
+            return name, tables
+    return None, []
+
+
+def extract_page_tables(page, strategy=None):
+    """Extract tables from one page.
+
+    With a strategy, try it first and fall back to the TABLE_STRATEGIES cascade only
+    if it finds nothing; without one, run the cascade.
+    """
+    if strategy is not None:
+        tables = _run_strategy(page, strategy)
+        if tables:
+            return tables
+    return _run_cascade(page, skip=strategy)[1]
+
+
+def text_layer_table(page):
+    """Fast path for clean text listings: one synthetic PRODUCT/PRICE table from the page text.
+
+    Returns None (use table extraction instead) when the page has ruling lines, when no
+    line parses as a product followed by a price, or when any line mentioning a voltage
+    does not - e.g. a product name wrapped onto two lines, or a line with more than one
+    number after the ratings.
+    """
+    if page.lines or page.rects:
+        return None
+    rows = []
+    for line in (page.extract_text() or '').splitlines():
+        if not _VOLTAGE_RE.search(line):
+            continue
+        match = _PRODUCT_LINE_RE.fullmatch(line.strip())
+        if match is None:
+            return None
+        product, price = match.group('product').strip(), match.group('price')
+        if not _RATING_END_RE.search(product.rstrip(' .-')):
+            return None
+        # Same price threshold as rows reconstructed from table cells
+        if float(price.replace(',', '')) <= 10 or parse_product_name(product) is None:
+            return None
+        rows.append([product, price])
+    if not rows:
+        return None
+    return [['PRODUCT', 'PRICE']] + rows
+
+
+def _extract_page(page, strategy=None):
+    """Tables for one page, trying the text-layer fast path first; returns (tables, fast_path_hit)"""
+    table = text_layer_table(page)
+    if table is not None:
+        return [table], True
+    return extract_page_tables(page, strategy), False
+
+
+def _record_fast_path(pages, hits):
+    with _fast_path_lock:
+        _fast_path_totals['pages'] += pages
+        _fast_path_totals['hits'] += hits
+
+
+def _log_fast_path(pages, hits):
+    _record_fast_path(pages, hits)
+    if pages:
+        logger.info("Text-layer fast path served %d of %d page(s) (%.0f%%)", hits, pages, 100 * hits / pages)
+
+
+def fast_path_stats():
+    """Pages extracted in this process and how many the text-layer fast path served"""
+    with _fast_path_lock:
+        pages, hits = _fast_path_totals['pages'], _fast_path_totals['hits']
+    return {'pages': pages, 'fast_path_pages': hits, 'hit_rate': hits / pages if pages else 0.0}
+
+
+def layout_fingerprint(page, brand=None):
+    """Identify a catalog layout: brand, page size, ruling lines and dominant font"""
+    fonts = Counter(char.get('fontname') for char in page.chars[:500])
+    dominant_font = fonts.most_common(1)[0][0] if fonts else None
+    has_rules = bool(page.lines or page.rects)
+    return (brand, round(float(page.width)), round(float(page.height)), has_rules, dominant_font)
+
+
+def remembered_strategy(fingerprint):
+    with _strategy_memory_lock:
+        strategy = _strategy_memory.get(fingerprint)
+        if strategy is not None:
+            _strategy_memory.move_to_end(fingerprint)
+        return strategy
+
+
+def remember_strategy(fingerprint, strategy):
+    with _strategy_memory_lock:
+        _strategy_memory[fingerprint] = strategy
+        _strategy_memory.move_to_end(fingerprint)
+        while len(_strategy_memory) > STRATEGY_MEMORY_SIZE:
+            _strategy_memory.popitem(last=False)
+
+
+def _choose_strategy(pages, brand=None):
+    """Pick the strategy for a document.
+
+    Returns (strategy, probe_page_tables, first_unprocessed_page, fast_path_hits): a
+    remembered strategy needs no probing; otherwise the first PROBE_PAGES pages are
+    extracted (fast path first, then the full cascade; their tables are returned per
+    page) and the most frequent winning strategy is chosen (ties go to the earlier one).
+    """
+    if not pages:
+        return None, [], 0, 0
+    fingerprint = layout_fingerprint(pages[0], brand)
+    strategy = remembered_strategy(fingerprint)
+    if strategy is not None:
+        logger.debug("Using remembered table strategy %r for layout %s", strategy, fingerprint)
+        return strategy, [], 0, 0
+
+    probe_tables = []
+    winners = Counter()
+    fast_path_hits = 0
+    probe_count = min(PROBE_PAGES, len(pages))
+    for page in pages[:probe_count]:
+        table = text_layer_table(page)
+        if table is not None:
+            probe_tables.append([table])
+            fast_path_hits += 1
+        else:
+            name, tables = _run_cascade(page)
+            probe_tables.append(tables)
+            if name:
+                winners[name] += 1
+        page.close()
+    if winners:
+        order = [name for name, _ in TABLE_STRATEGIES]
+        strategy = max(winners, key=lambda name: (winners[name], -order.index(name)))
+        remember_strategy(fingerprint, strategy)
+        logger.info("Chose table strategy %r for layout %s", strategy, fingerprint)
+    return strategy, probe_tables, probe_count, fast_path_hits
+
+
+def _as_stream(pdf_source):
+    """pdfplumber.open() accepts paths and file objects; wrap raw bytes"""
+    if isinstance(pdf_source, (bytes, bytearray)):
+        return io.BytesIO(pdf_source)
+    return pdf_source
+
+
+def count_pages(pdf_source):
+    with pdfplumber.open(_as_stream(pdf_source)) as pdf:
+        return len(pdf.pages)
+
+
+def _iter_pages(pdf, start, strategy, hits):
+    """Yield pages from start on; hits (a Counter) counts fast-path pages"""
+    page_count = len(pdf.pages)
+    for page_num in range(start, page_count):
+        page = pdf.pages[page_num]
+        tables, fast_path_hit = _extract_page(page, strategy)
+        hits['fast_path'] += fast_path_hit
+        # Release the page's parsed objects once we're done with it
+        page.close()
+        yield page_num + 1, page_count, tables
+
+
+def iter_tables_serial(pdf_source, brand=None):
+    """Yield (pages_done, page_count, tables) page by page in this process"""
+    with pdfplumber.open(_as_stream(pdf_source)) as pdf:
+        page_count = len(pdf.pages)
+        strategy, probe_tables, start, probe_hits = _choose_strategy(pdf.pages, brand)
+        hits = Counter(fast_path=probe_hits)
+        try:
+            for page_num, tables in enumerate(probe_tables):
+                yield page_num + 1, page_count, tables
+            yield from _iter_pages(pdf, start, strategy, hits)
+        finally:
+            _log_fast_path(page_count, hits['fast_path'])
+
+
+def extract_tables_serial(pdf_source, brand=None):
+    """Extract all tables page by page in this process"""
+    return [table for _, _, tables in iter_tables_serial(pdf_source, brand) for table in tables]
+
+
+# --- Process pool workers ---------------------------------------------------
+
+_worker_pdf = None
+
+
+def _init_worker(pdf_bytes):
+    """Open the shared PDF bytes once per worker process"""
+    global _worker_pdf
+    _worker_pdf = pdfplumber.open(io.BytesIO(pdf_bytes))
+
+
+def _extract_page_range(start, stop, strategy=None):
+    """Extract tables for pages [start, stop) in a worker; returns (tables, fast_path_hits)"""
+    tables = []
+    fast_path_hits = 0
+    for page_num in range(start, stop):
+        page = _worker_pdf.pages[page_num]
+        page_tables, fast_path_hit = _extract_page(page, strategy)
+        tables.extend(page_tables)
+        fast_path_hits += fast_path_hit
+        page.close()
+    return tables, fast_path_hits
+
+
+def page_ranges(page_count, task_count, first_page=0):
+    """Split pages [first_page, page_count) into at most task_count contiguous (start, stop) ranges"""
+    remaining = page_count - first_page
+    if remaining <= 0:
+        return []
+    task_count = max(1, min(task_count, remaining))
+    size, remainder = divmod(remaining, task_count)
+    ranges = []
+    start = first_page
+    for index in range(task_count):
+        stop = start + size + (1 if index < remainder else 0)
+        if stop > start:
+            ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def default_workers():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def iter_tables_parallel(pdf_bytes, workers=None, brand=None):
+    """Yield (pages_done, page_count, tables) per page range from a process pool, in page order.
+
+    Only a few ranges per worker are in flight at a time, so a slow consumer holds
+    back extraction instead of letting finished results pile up. If the pool cannot
+    run, the remaining pages are extracted in this process.
+    """
+    workers = workers or default_workers()
+    # Probe (or recall) the strategy here, then hand the remaining pages to the workers
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        page_count = len(pdf.pages)
+        strategy, probe_tables, start, probe_hits = _choose_strategy(pdf.pages, brand)
+    hits = Counter(fast_path=probe_hits)
+    try:
+        for page_num, tables in enumerate(probe_tables):
+            yield page_num + 1, page_count, tables
+        yield from _iter_pool_ranges(pdf_bytes, workers, page_count, start, strategy, hits)
+    finally:
+        _log_fast_path(page_count, hits['fast_path'])
+
+
+def _iter_pool_ranges(pdf_bytes, workers, page_count, start, strategy, hits):
+    ranges = deque(page_ranges(page_count, workers * TASKS_PER_WORKER, first_page=start))
+    if not ranges:
+        return
+    pages_done = start
+    try:
+        # spawn: forking a threaded server process (Streamlit) is not safe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges)), mp_context=context,
+                                 initializer=_init_worker, initargs=(bytes(pdf_bytes),)) as executor:
+            in_flight = deque()
+            while ranges or in_flight:
+                while ranges and len(in_flight) < workers * IN_FLIGHT_PER_WORKER:
+                    range_start, range_stop = ranges.popleft()
+                    in_flight.append((range_stop, executor.submit(_extract_page_range, range_start, range_stop, strategy)))
+                range_stop, future = in_flight.popleft()
+                tables, fast_path_hits = future.result()
+                hits['fast_path'] += fast_path_hits
+                pages_done = range_stop
+                yield pages_done, page_count, tables
+    except BrokenProcessPool:
+        # Workers could not start (e.g. restricted environment): do the rest here instead
+        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+            yield from _iter_pages(pdf, pages_done, strategy, hits)
+
+
+def extract_tables_parallel(pdf_bytes, workers=None, brand=None):
+    """Extract all tables using a process pool, preserving page order"""
+    return [table for _, _, tables in iter_tables_parallel(pdf_bytes, workers, brand) for table in tables]
+
+
+def iter_page_tables(pdf_source, parallel=None, workers=None, brand=None, concurrent=False):
+    """Stream tables from a PDF (path, file object or bytes) as (pages_done, page_count, tables).
+
+    parallel=None picks the process pool automatically for documents of at least
+    PARALLEL_MIN_PAGES pages when more than one CPU is available; workers then only
+    caps the pool size. concurrent=True says other documents are being extracted on
+    other threads at the same time: with more than one CPU, smaller documents then go
+    to a single worker process too, instead of competing with them for the GIL. brand
+    is only used to remember the table strategy per brand and layout.
+    """
+    cpus = default_workers()
+    workers = workers or cpus
+    if parallel is None:
+        workers = min(workers, cpus)
+    if parallel is False or (parallel is None and (cpus < 2 or (workers < 2 and not concurrent))):
+        return iter_tables_serial(pdf_source, brand)
+
+    if isinstance(pdf_source, (bytes, bytearray)):
+        pdf_bytes = pdf_source
+    elif isinstance(pdf_source, (str, os.PathLike)):
+        with open(pdf_source, 'rb') as f:
+            pdf_bytes = f.read()
+    else:
+        pdf_source.seek(0)
+        pdf_bytes = pdf_source.read()
+
+    if parallel is None and count_pages(pdf_bytes) < PARALLEL_MIN_PAGES:
+        if not concurrent:
+            return iter_tables_serial(pdf_bytes, brand)
+        workers = 1
+    return iter_tables_parallel(pdf_bytes, workers=workers, brand=brand)
+
+
+def extract_tables(pdf_source, parallel=None, workers=None, brand=None):
+    """Extract all tables from a PDF (path, file object or bytes); see iter_page_tables()"""
+    return [table for _, _, tables in iter_page_tables(pdf_source, parallel, workers, brand) for table in tables]
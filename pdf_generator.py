@@ -1,74 +1,87 @@
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from datetime import datetime
-import pandas as pd
-
-def generate_pdf(data, filename="output.pdf"):
-    """Generate PDF from table data"""
-    doc = SimpleDocTemplate(filename, pagesize=letter)
-    elements = []
-    styles = getSampleStyleSheet()
-    
-    # Header
-    header_style = ParagraphStyle('Header', parent=styles['Heading1'],
-                                   fontSize=24, textColor=colors.HexColor('#1e293b'),
-                                   spaceAfter=30, alignment=1, fontName='Helvetica-Bold')
-    elements.append(Paragraph("Tycoon Lights", header_style))
-    
-    # Subtitle
-    subtitle_style = ParagraphStyle('Subtitle', parent=styles['Normal'],
-                                     fontSize=14, textColor=colors.HexColor('#475569'),
-                                     spaceAfter=10, alignment=1)
-    elements.append(Paragraph("Driver Calculation Report", subtitle_style))
-    
-    # Date
-    date_style = ParagraphStyle('Date', parent=styles['Normal'],
-                                 fontSize=10, textColor=colors.HexColor('#64748b'),
-                                 spaceAfter=20, alignment=1, fontName='Helvetica-Oblique')
-    date_text = datetime.now().strftime("%B %d, %Y at %I:%M %p")
-    elements.append(Paragraph(f"Generated on {date_text}", date_style))
-    elements.append(Spacer(1, 20))
-    
-    # Table
-    if data:
-        df = pd.DataFrame(data)
-        
-        # Calculate total price
-        total_price = 0
-        price_col_idx = None
-        
-        # Find Price column index
-        if 'Price' in df.columns:
-            price_col_idx = df.columns.get_loc('Price')
-            for row in data:
-                price_value = row.get('Price', 0)
-                if isinstance(price_value, (int, float)):
-                    total_price += price_value
-                elif price_value and price_value != '-':
-                    try:
-                        price_str = str(price_value).replace('₹', '').replace(',', '').strip()
-                        total_price += float(price_str)
-                    except (ValueError, AttributeError):
-                        pass
-        
-        # Build table data with total row
-        table_data = [df.columns.tolist()] + df.values.tolist()
-        
-        # Add total row
-        total_row = [''] * len(df.columns)
-        total_row[0] = 'Total'
-        if price_col_idx is not None:
-            total_display = f"{total_price:,.2f}".rstrip('0').rstrip('.')
-            total_row[price_col_idx] = total_display
-        
-        table_data.append(total_row)
-        
-        table = Table(table_data)
-        total_row_idx = len(table_data) - 1
-        
-        table.setStyle(TableStyle([
+import hashlib
+import io
+import json
+import logging
+
+from cache_utils import SizedLRUCache
+
+logger = logging.getLogger(__name__)
+
+# Name offered for the downloaded quotation
+DEFAULT_FILENAME = "output.pdf"
+
+# Bump whenever the layout changes, so cached PDFs are not reused
+TEMPLATE_VERSION = "2"
+
+# Recently generated PDFs by content hash of the quotation, shared by all sessions
+_render_cache = SizedLRUCache(max_bytes=32 * 1024 * 1024, sizeof=len)
+
+# Quotations with more rows than this are laid out one table per page, with fixed
+# row heights and column widths and a subtotal on every page (large-document mode)
+LARGE_QUOTE_ROWS = 200
+HEADER_ROW_HEIGHT = 38
+ROW_HEIGHT = 18
+SUMMARY_ROW_HEIGHT = 34
+CELL_PADDING = 6   # Table's default left/right padding
+
+
+class QuotationTemplate:
+    """Paragraph and table styles of the quotation PDF, built once per process
+
+    The table style addresses the total row as the last row (negative indices), so
+    one TableStyle fits tables of any length.
+    """
+
+    def __init__(self, pagesize=letter):
+        self.pagesize = pagesize
+        styles = getSampleStyleSheet()
+
+        self.header_style = ParagraphStyle('Header', parent=styles['Heading1'],
+                                           fontSize=24, textColor=colors.HexColor('#1e293b'),
+                                           spaceAfter=30, alignment=1, fontName='Helvetica-Bold')
+        self.subtitle_style = ParagraphStyle('Subtitle', parent=styles['Normal'],
+                                             fontSize=14, textColor=colors.HexColor('#475569'),
+                                             spaceAfter=10, alignment=1)
+        self.date_style = ParagraphStyle('Date', parent=styles['Normal'],
+                                         fontSize=10, textColor=colors.HexColor('#64748b'),
+                                         spaceAfter=20, alignment=1, fontName='Helvetica-Oblique')
+        self.empty_style = ParagraphStyle('Empty', parent=styles['Normal'],
+                                          fontSize=12, textColor=colors.HexColor('#64748b'),
+                                          alignment=1, fontName='Helvetica-Oblique')
+
+        self.table_style = TableStyle(self._table_commands(summary_rows=1))
+        # Large-document pages: closed by a page subtotal, the last one also by the total
+        self.page_table_style = TableStyle(self._table_commands(summary_rows=1, subtotal=True))
+        self.last_page_table_style = TableStyle(self._table_commands(summary_rows=2, subtotal=True))
+        # Totals on a page of their own, when they don't fit after the last rows
+        self.total_table_style = TableStyle(self._total_row_commands() + [
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#cbd5e1')),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ])
+
+    @staticmethod
+    def _total_row_commands():
+        return [
+            ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#fbbf24')),
+            ('TEXTCOLOR', (0, -1), (-1, -1), colors.HexColor('#1e293b')),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, -1), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, -1), (-1, -1), 12),
+            ('TOPPADDING', (0, -1), (-1, -1), 12),
+        ]
+
+    @classmethod
+    def _table_commands(cls, summary_rows, subtotal=False):
+        """Table style commands; the last summary_rows rows are subtotal/total rows"""
+        body_end = -1 - summary_rows
+        commands = [
             ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e293b')),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
@@ -76,29 +89,248 @@ def generate_pdf(data, filename="output.pdf"):
             ('FONTSIZE', (0, 0), (-1, 0), 11),
             ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
             ('TOPPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, total_row_idx - 1), colors.HexColor('#f8fafc')),
-            ('TEXTCOLOR', (0, 1), (-1, total_row_idx - 1), colors.HexColor('#1e293b')),
-            ('FONTSIZE', (0, 1), (-1, total_row_idx - 1), 9),
+            ('BACKGROUND', (0, 1), (-1, body_end), colors.HexColor('#f8fafc')),
+            ('TEXTCOLOR', (0, 1), (-1, body_end), colors.HexColor('#1e293b')),
+            ('FONTSIZE', (0, 1), (-1, body_end), 9),
             # Total row styling
-            ('BACKGROUND', (0, total_row_idx), (-1, total_row_idx), colors.HexColor('#fbbf24')),
-            ('TEXTCOLOR', (0, total_row_idx), (-1, total_row_idx), colors.HexColor('#1e293b')),
-            ('FONTNAME', (0, total_row_idx), (-1, total_row_idx), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, total_row_idx), (-1, total_row_idx), 10),
-            ('BOTTOMPADDING', (0, total_row_idx), (-1, total_row_idx), 12),
-            ('TOPPADDING', (0, total_row_idx), (-1, total_row_idx), 12),
+            *cls._total_row_commands(),
             ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#cbd5e1')),
-            ('ROWBACKGROUNDS', (0, 1), (-1, total_row_idx - 1), [colors.white, colors.HexColor('#f1f5f9')]),
+            ('ROWBACKGROUNDS', (0, 1), (-1, body_end), [colors.white, colors.HexColor('#f1f5f9')]),
             ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        elements.append(table)
-        elements.append(Spacer(1, 20))
-        elements.append(Paragraph(f"Total Items: {len(data)}", subtitle_style))
+        ]
+        if subtotal:
+            # Page subtotal: the first summary row, lighter than the total
+            row = -summary_rows
+            commands += [
+                ('BACKGROUND', (0, row), (-1, row), colors.HexColor('#fef3c7')),
+                ('TEXTCOLOR', (0, row), (-1, row), colors.HexColor('#1e293b')),
+                ('FONTNAME', (0, row), (-1, row), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, row), (-1, row), 10),
+                ('BOTTOMPADDING', (0, row), (-1, row), 12),
+                ('TOPPADDING', (0, row), (-1, row), 12),
+            ]
+        return commands
+
+    def title_elements(self):
+        """Title, subtitle and generation date"""
+        date_text = datetime.now().strftime("%B %d, %Y at %I:%M %p")
+        return [
+            Paragraph("Tycoon Lights", self.header_style),
+            Paragraph("Driver Calculation Report", self.subtitle_style),
+            Paragraph(f"Generated on {date_text}", self.date_style),
+            Spacer(1, 20),
+        ]
+
+
+_template = QuotationTemplate()
+
+
+def render_pdf_bytes(data):
+    """Render the quotation PDF in memory and return its bytes (no file is written)"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=_template.pagesize)
+    if len(data) > LARGE_QUOTE_ROWS:
+        elements = _build_large_elements(data, doc)
     else:
-        empty_style = ParagraphStyle('Empty', parent=styles['Normal'],
-                                      fontSize=12, textColor=colors.HexColor('#64748b'),
-                                      alignment=1, fontName='Helvetica-Oblique')
-        elements.append(Paragraph("No data available", empty_style))
-    
+        elements = _build_elements(data)
     doc.build(elements)
+    return buffer.getvalue()
+
+
+def quotation_key(data):
+    """Stable hash of the quotation rows (key order included, it sets the columns), the template version
+    and today's date, so a cached PDF never carries a "Generated on" date from an earlier day"""
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest(), TEMPLATE_VERSION, datetime.now().strftime('%Y-%m-%d')
+
+
+def cached_pdf_bytes(data):
+    """PDF bytes for the quotation, reusing the last render of identical data; returns (bytes, from_cache)"""
+    key = quotation_key(data)
+    pdf_bytes = _render_cache.get(key)
+    from_cache = pdf_bytes is not None
+    if not from_cache:
+        pdf_bytes = render_pdf_bytes(data)
+        _render_cache.put(key, pdf_bytes)
+    logger.info("Quotation render cache: %s (hit rate %.0f%%)",
+                "hit" if from_cache else "miss", 100 * _render_cache.hit_rate)
+    return pdf_bytes, from_cache
+
+
+def is_cached(data):
+    """True if a PDF of this quotation is in the render cache (not counted as a lookup)"""
+    return quotation_key(data) in _render_cache
+
+
+def rendered_pdf_bytes(key):
+    """The cached PDF for a quotation_key(), or None if it was never rendered or has been evicted"""
+    return _render_cache.peek(key)
+
+
+def render_cache_stats():
+    """Counters of the quotation render cache (entries, bytes, hits, misses, hit_rate, ...)"""
+    return _render_cache.stats()
+
+
+def generate_pdf(data, filename=DEFAULT_FILENAME):
+    """Generate PDF from table data and write it to filename"""
+    pdf_bytes = render_pdf_bytes(data)
+    with open(filename, "wb") as f:
+        f.write(pdf_bytes)
     return filename
 
+
+def price_value(value):
+    """Numeric value of a Price cell (number or "₹1,234.50"); 0 when it has none"""
+    if isinstance(value, (int, float)):
+        return value
+    if value and value != '-':
+        try:
+            return float(str(value).replace('₹', '').replace(',', '').strip())
+        except (ValueError, AttributeError):
+            pass
+    return 0
+
+
+def table_columns(data):
+    """Column names in first-seen key order across all rows"""
+    return list(dict.fromkeys(key for row in data for key in row))
+
+
+def table_rows(data):
+    """Header row plus one row per dict; columns from table_columns, '' where a row lacks one"""
+    columns = table_columns(data)
+    return [columns] + [[row.get(column, '') for column in columns] for row in data]
+
+
+def _format_total(total_price):
+    return f"{total_price:,.2f}".rstrip('0').rstrip('.')
+
+
+def _build_elements(data):
+    """Flowables for the quotation: title block, then the table with a total row"""
+    elements = _template.title_elements()
+
+    # Table
+    if data:
+        table_data = table_rows(data)
+        columns = table_data[0]
+
+        # Add total row
+        total_row = [''] * len(columns)
+        total_row[0] = 'Total'
+        if 'Price' in columns:
+            total_price = sum(price_value(row.get('Price', 0)) for row in data)
+            total_row[columns.index('Price')] = _format_total(total_price)
+        table_data.append(total_row)
+
+        table = Table(table_data)
+        table.setStyle(_template.table_style)
+        elements.append(table)
+        elements.append(Spacer(1, 20))
+        elements.append(Paragraph(f"Total Items: {len(data)}", _template.subtitle_style))
+    else:
+        elements.append(Paragraph("No data available", _template.empty_style))
+
+    return elements
+
+
+def _column_widths(table_data, summary_values, available_width):
+    """Column widths from the header and each column's longest value, measured once per quote
+
+    Cells are not measured one by one: the longest string of each column (by length)
+    stands for the column. Widths are scaled down to fit the page if needed.
+    """
+    widths = []
+    for idx, header in enumerate(table_data[0]):
+        longest = max((str(row[idx]) for row in table_data[1:]), key=len, default='')
+        widths.append(max(
+            stringWidth(str(header), 'Helvetica-Bold', 11),
+            stringWidth(longest, 'Helvetica', 9),
+            stringWidth(summary_values[idx], 'Helvetica-Bold', 10),
+        ) + 2 * CELL_PADDING)
+    total_width = sum(widths)
+    if total_width > available_width:
+        widths = [width * available_width / total_width for width in widths]
+    return widths
+
+
+def _page_sizes(row_count, doc, title_height, trailing_height):
+    """Data rows on each page; the first page shares its space with the title block
+
+    The last page also holds the total row and the trailing block (trailing_height)
+    after the table. When they don't fit, a last page of 0 rows holds only them.
+    """
+    # Frame padding, plus one spare row to absorb the frame's own rounding
+    frame_height = doc.height - 12 - ROW_HEIGHT - HEADER_ROW_HEIGHT - SUMMARY_ROW_HEIGHT
+    first_rows = max(1, int((frame_height - title_height) // ROW_HEIGHT))
+    page_rows = int(frame_height // ROW_HEIGHT)
+    sizes = []
+    remaining = row_count
+    while remaining > 0:
+        size = min(first_rows if not sizes else page_rows, remaining)
+        sizes.append(size)
+        remaining -= size
+    # If the total row and the trailing block don't fit after the last rows, they get a page of their own
+    last_capacity = first_rows if len(sizes) == 1 else page_rows
+    if (last_capacity - sizes[-1]) * ROW_HEIGHT < SUMMARY_ROW_HEIGHT + trailing_height:
+        sizes.append(0)
+    return sizes
+
+
+def _build_large_elements(data, doc):
+    """Flowables for a large quotation: one table per page, each closed by a page subtotal
+
+    Every page repeats the header. Row heights and column widths are fixed up front, so
+    laying out a page costs the same whatever the length of the quote. A page with no
+    rows (the totals didn't fit after the last ones) holds only the total row.
+    """
+    def height(flowables):
+        return sum(
+            flowable.wrap(doc.width, doc.height)[1] + flowable.getSpaceBefore() + flowable.getSpaceAfter()
+            for flowable in flowables
+        )
+
+    elements = _template.title_elements()
+    trailing = [Spacer(1, 20), Paragraph(f"Total Items: {len(data)}", _template.subtitle_style)]
+
+    table_data = table_rows(data)
+    columns = table_data[0]
+    price_idx = columns.index('Price') if 'Price' in columns else None
+    prices = [price_value(row.get('Price', 0)) for row in data]
+
+    def summary_row(label, total_price):
+        row = [''] * len(columns)
+        row[0] = label
+        if price_idx is not None:
+            row[price_idx] = _format_total(total_price)
+        return row
+
+    total_row = summary_row('Total', sum(prices))
+    widest_summary = [max(a, b, key=len) for a, b in zip(summary_row('Page subtotal', max(prices)), total_row)]
+    col_widths = _column_widths(table_data, widest_summary, doc.width)
+
+    start = 1
+    sizes = _page_sizes(len(data), doc, height(elements), height(trailing))
+    for page_idx, size in enumerate(sizes):
+        last_page = page_idx == len(sizes) - 1
+        if not size:
+            table = Table([total_row], colWidths=col_widths, rowHeights=[SUMMARY_ROW_HEIGHT])
+            table.setStyle(_template.total_table_style)
+            elements.append(table)
+            continue
+        page_rows = table_data[start:start + size]
+        rows = [columns] + page_rows + [summary_row('Page subtotal', sum(prices[start - 1:start - 1 + size]))]
+        if last_page:
+            rows.append(total_row)
+        start += size
+
+        table = Table(rows, colWidths=col_widths, repeatRows=1,
+                      rowHeights=[HEADER_ROW_HEIGHT] + [ROW_HEIGHT] * size + [SUMMARY_ROW_HEIGHT] * (len(rows) - size - 1))
+        table.setStyle(_template.last_page_table_style if last_page else _template.page_table_style)
+        elements.append(table)
+        if not last_page:
+            elements.append(PageBreak())
+
+    elements.extend(trailing)
+    return elements
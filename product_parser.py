@@ -0,0 +1,297 @@
+"""Product-name tokenizer for price-list rows
+
+Turns a product cell such as "SMPS - Slim - 12V - 36W - 3Amp" into the simplified
+name and its Volt/Watt/Amp ratings. All patterns are compiled once at import; a name
+is split into tokens in one pass and each token is classified (voltage, wattage,
+amperage, separator, colour note or plain word), so the name and the ratings are both
+built from the same token stream.
+
+parse_product_column() does the same for a whole table column at once with vectorized
+pandas string operations, for cells in the two canonical layouts; anything else is left
+to parse_product_name().
+
+Kept free of Streamlit so it can be benchmarked and reused outside the upload page.
+"""
+
+import re
+
+import pandas as pd
+
+# Amperage written in pieces by the PDF text layer ("8.5 A mp", "3A m p", "3 Am" at the
+# end, "3 A", "3A") is normalised to "<n>Amp" before tokenizing
+_AMP_FRAGMENT_RE = re.compile(r'(\d+\.?\d*)\s*A(?:\s*m\s*p|\s*m\s*$|(?!\w))', re.IGNORECASE)
+
+# Colour/variant notes like "(Black)", separators " - ", and plain words
+_TOKEN_RE = re.compile(r'(?P<note>\([^)]+\))|(?P<word>\(?[^\s(]+|\()')
+
+# A whole-token rating; the unit letter's case decides whether it also yields a value
+_RATING_RE = re.compile(r'(\d+)([VvWw])|(\d+\.?\d*)([Aa](?:[Mm][Pp])?)')
+
+# Ratings embedded in a longer token ("DC12V", "12V-36W"), matched like the whole string
+_VOLT_RE = re.compile(r'(\d+)V')
+_WATT_RE = re.compile(r'(\d+)W')
+_AMP_RE = re.compile(r'(\d+\.?\d*)\s*Amp', re.IGNORECASE)
+_HAS_DIGIT_RE = re.compile(r'\d')
+
+# Words split apart by the PDF text layer
+_FRAGMENT_RE = re.compile(
+    r'\b(?:(?P<dimmable>imma\s+ble|dimm\s+ab\s*le|di\s+mmab\s*le|di\s+mm\s*able)'
+    r'|(?P<waterproof>wa\s+ter\s*(?:pr\s*)?oof))\b',
+    re.IGNORECASE,
+)
+
+# Cell handling for rows whose product name is spread across columns
+_PRICE_CELL_RE = re.compile(r'\d+\.?\d*')
+_ENDS_WITH_NUMBER_RE = re.compile(r'\d+\.?\d*\s*$')
+_ENDS_WITH_RATING_RE = re.compile(r'\d+\.?\d*\s*A?\s*$', re.IGNORECASE)
+_LETTERS_RE = re.compile(r'[a-z]+', re.IGNORECASE)
+_SPACING_RE = re.compile(r'\s*(-|[0-9]+[VW])\s*')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Whole cells in the canonical layouts, "SMPS - Slim - 12V - 36W - 3Amp" and
+# "SMPS Slim 12V 36W 3Amp": plain words, then volt, watt and optionally amp (in any
+# spelling _AMP_FRAGMENT_RE turns into "<n>Amp")
+_DASHED_CELL_RE = re.compile(
+    r'^(?P<name>[A-Za-z]+(?:(?: - | )[A-Za-z]+)*) - (?P<volt>\d+)V - (?P<watt>\d+)W'
+    r'(?: - (?P<amp>\d+(?:\.\d+)?) ?[Aa](?:[Mm][Pp]?)?)?\Z'
+)
+_SPACED_CELL_RE = re.compile(
+    r'^(?P<name>[A-Za-z]+(?: [A-Za-z]+)*) (?P<volt>\d+)V (?P<watt>\d+)W'
+    r'(?: (?P<amp>\d+(?:\.\d+)?) ?[Aa](?:[Mm][Pp]?)?)?\Z'
+)
+# Names that _simplify_name may trim ("DALI Dimmable DALI SMP") take the per-row path
+_DALI_RE = re.compile(r'\bDALI\b', re.IGNORECASE)
+
+# Token kinds
+WORD = 'word'
+SEPARATOR = 'separator'
+NOTE = 'note'
+VOLTAGE = 'voltage'
+WATTAGE = 'wattage'
+AMPERAGE = 'amperage'
+
+
+def _is_rating(word):
+    return _RATING_RE.fullmatch(word) is not None
+
+
+def tokenize(product_name):
+    """Split a product name into (kind, text, volt, watt, amp) tokens.
+
+    volt/watt/amp hold the rating found in the token (whole or embedded), else None.
+    Amperage fragments are normalised first, so "3 A mp" arrives as one "3Amp" token.
+    """
+    text = _AMP_FRAGMENT_RE.sub(r'\1Amp', product_name)
+    tokens = []
+    for match in _TOKEN_RE.finditer(text):
+        token = match.group()
+        volt = watt = amp = None
+        if match.lastgroup == 'note':
+            kind = NOTE
+        elif token == '-':
+            kind = SEPARATOR
+        else:
+            rating = _RATING_RE.fullmatch(token)
+            if rating is None:
+                kind = WORD
+            elif rating.group(2):
+                unit = rating.group(2)
+                kind = VOLTAGE if unit in 'Vv' else WATTAGE
+                if unit == 'V':
+                    volt = int(rating.group(1))
+                elif unit == 'W':
+                    watt = int(rating.group(1))
+            else:
+                kind = AMPERAGE
+                if len(rating.group(4)) == 3:
+                    amp = float(rating.group(3))
+        if kind in (WORD, NOTE) and _HAS_DIGIT_RE.search(token):
+            volt_match = _VOLT_RE.search(token)
+            watt_match = _WATT_RE.search(token)
+            amp_match = _AMP_RE.search(token)
+            volt = int(volt_match.group(1)) if volt_match else None
+            watt = int(watt_match.group(1)) if watt_match else None
+            amp = float(amp_match.group(1)) if amp_match else None
+        tokens.append((kind, token, volt, watt, amp))
+    return tokens
+
+
+def _drop_repeated_tail(tokens):
+    """Drop trailing words that repeat the leading ones ("Waterproof SMPS ... Waterproof SMPS")"""
+    words = [token[1].lower() for token in tokens]
+    if len(words) >= 4:
+        for check_len in range(min(5, len(words) // 2), 1, -1):
+            if words[:check_len] == words[-check_len:]:
+                return tokens[:-check_len]
+    return tokens
+
+
+def _split_parts(tokens):
+    """Split on " - " separators (a dash with words on both sides)"""
+    parts = [[]]
+    last = len(tokens) - 1
+    after_separator = False
+    for index, token in enumerate(tokens):
+        # In "A - - B" the second dash has already lost its leading space to the first
+        if token[0] == SEPARATOR and 0 < index < last and not after_separator:
+            parts.append([])
+            after_separator = True
+        else:
+            parts[-1].append(token)
+            after_separator = False
+    return parts
+
+
+def _name_words(parts):
+    """Pick the words that make up the name: everything before the voltage part"""
+    volt_index = None
+    for index, part in enumerate(parts):
+        if any(token[2] is not None for token in part):
+            volt_index = index
+            break
+
+    if volt_index:
+        return [token[1] for part in parts[:volt_index] for token in part]
+    if len(parts) == 1:
+        words = [token[1] for token in parts[0]]
+        filtered = [token[1] for token in parts[0] if token[0] not in (VOLTAGE, WATTAGE, AMPERAGE)]
+        return filtered or words
+    return [token[1] for token in parts[0]] + [token[1] for token in parts[1]]
+
+
+def _fix_fragment(match):
+    return 'Dimmable' if match.lastgroup == 'dimmable' else 'Waterproof'
+
+
+def _simplify_name(words):
+    name = _FRAGMENT_RE.sub(_fix_fragment, ' '.join(words))
+    words = name.split()
+    # Remove duplicate fragments at the end (e.g., "DALI Dimmable DALI SMP" -> "DALI Dimmable")
+    if len(words) >= 3:
+        if words[-2].upper() == 'DALI' and words[-1].upper() in ('SMP', 'SMPS'):
+            words = words[:-2]
+        elif words[-1].upper() == 'DALI' and 'DALI' in [word.upper() for word in words[:-1]]:
+            words = words[:-1]
+    return ' '.join(word for word in words if not _is_rating(word))
+
+
+def parse_product_name(product_name: str):
+    """
+    Parse product name to extract simplified Name, Volt, Watt, and Amp.
+    Example: "SMPS - Slim - 12V - 36W - 3Amp" -> "smps slim", 12, 36, 3.0
+    Handles fragmented text like "8.5A" + "mp" or "3A" without "mp"
+    """
+    if not product_name:
+        return None
+
+    tokens = tokenize(product_name)
+
+    # Ratings come from the first token carrying each one, colour notes included
+    volt = watt = amp = None
+    for _, _, token_volt, token_watt, token_amp in tokens:
+        if volt is None:
+            volt = token_volt
+        if watt is None:
+            watt = token_watt
+        if amp is None:
+            amp = token_amp
+
+    # Volt is required, but watt and amp can be optional for some products
+    if volt is None:
+        return None
+
+    # If amp is missing, set it to 0 (don't calculate from watt/volt)
+    if amp is None:
+        amp = 0.0
+
+    # If watt is missing, calculate it from volt and amp: W = V * A
+    if watt is None and amp > 0:
+        watt = int(volt * amp)
+
+    # If both watt and amp are missing (amp is 0), we can't proceed
+    if watt is None:
+        return None
+
+    words = _drop_repeated_tail([token for token in tokens if token[0] != NOTE])
+    return {
+        'Name': _simplify_name(_name_words(_split_parts(words))),
+        'Volt': volt,
+        'Watt': watt,
+        'Amp': amp
+    }
+
+
+def parse_product_column(product_names):
+    """Vectorized parse_product_name() for a pandas Series of product cells.
+
+    Returns a DataFrame with the same index and Name, Volt, Watt and Amp columns.
+    Cells outside the canonical layouts get NaN in every column (check Volt.notna())
+    and should go through parse_product_name() one by one.
+    """
+    names = product_names.astype(object)
+    parts = names.str.extract(_DASHED_CELL_RE)
+    parts = parts.where(parts['volt'].notna(), names.str.extract(_SPACED_CELL_RE))
+    matched = parts['volt'].notna() & ~parts['name'].str.contains(_DALI_RE, na=False)
+
+    name = parts['name'].str.replace(' - ', ' ', regex=False).str.replace(_FRAGMENT_RE, _fix_fragment, regex=True)
+    return pd.DataFrame({
+        'Name': name,
+        'Volt': pd.to_numeric(parts['volt']),
+        'Watt': pd.to_numeric(parts['watt']),
+        'Amp': pd.to_numeric(parts['amp']).fillna(0.0),
+    }).where(matched)
+
+
+def reconstruct_product_name_from_row(row):
+    """Reconstruct product name from fragmented cells in a row"""
+    if not row:
+        return None, None
+
+    # Combine all non-empty cells to reconstruct the product name
+    combined_parts = []
+    price = None
+    last_part = None
+
+    for cell in row:
+        if not cell:
+            continue
+        cell_str = str(cell).strip()
+        if not cell_str:
+            continue
+
+        # Price is a bare number, usually larger (like 460, 600, etc.) and later in the row
+        if _PRICE_CELL_RE.fullmatch(cell_str):
+            price_val = float(cell_str)
+            if price_val > 10:  # Reasonable price threshold
+                price = price_val
+                continue
+
+        if len(cell_str) == 1:
+            # A single character after a number or "A" is part of "Amp" (like "m", "p")
+            if last_part and (_ENDS_WITH_NUMBER_RE.search(last_part) or last_part.endswith('A')):
+                if combined_parts:
+                    combined_parts[-1] = combined_parts[-1] + cell_str
+                else:
+                    combined_parts.append(cell_str)
+            # Otherwise skip isolated single characters
+            continue
+
+        # A short fragment that continues a rating (e.g., previous was "8.5A" and this is "mp")
+        if (last_part and len(cell_str) <= 3 and _LETTERS_RE.fullmatch(cell_str)
+                and _ENDS_WITH_RATING_RE.search(last_part)):
+            combined_parts[-1] = combined_parts[-1] + cell_str
+            last_part = combined_parts[-1]
+            continue
+
+        combined_parts.append(cell_str)
+        last_part = cell_str
+
+    if not combined_parts:
+        return None, None
+
+    # Space out dashes and voltage/wattage, join amperage fragments, normalise whitespace
+    product_name = _SPACING_RE.sub(r' \1 ', ' '.join(combined_parts))
+    product_name = _AMP_FRAGMENT_RE.sub(r'\1Amp', product_name)
+    product_name = _WHITESPACE_RE.sub(' ', product_name).strip()
+
+    return product_name, price
@@ -0,0 +1,64 @@
+"""Quotation PDFs rendered by a background worker pool
+
+The table page submits the quotation to the process-wide FairJobRunner and polls the
+job instead of rendering under st.spinner on the script thread. Sessions are served
+round-robin, RENDER_WORKERS PDFs render at once and at most RENDER_QUEUE_LIMIT wait;
+a quotation already in the render cache is recorded as finished straight away.
+
+Finished jobs do not hold the PDF: it stays in pdf_generator's size-bounded render
+cache, and the job only keeps it when it is too large for that cache.
+
+    job_id = submit_render(owner, st.session_state.table_data)
+    job = get_render_service().get(job_id)
+    pdf_bytes = job_pdf_bytes(job)   # None once evicted: submit again
+"""
+
+import threading
+
+from job_runner import FairJobRunner, QueueFull  # noqa: F401 (QueueFull re-exported for callers)
+from pdf_generator import cached_pdf_bytes, is_cached, quotation_key, rendered_pdf_bytes
+from settings import get_settings
+
+_render_service = None
+_render_service_lock = threading.Lock()
+
+
+def get_render_service():
+    """Render worker pool shared by all sessions"""
+    global _render_service
+    with _render_service_lock:
+        if _render_service is None:
+            settings = get_settings()
+            _render_service = FairJobRunner(max_workers=settings.render_workers,
+                                            max_queued=settings.render_queue_limit,
+                                            keep_finished=50, name="pdf-render")
+        return _render_service
+
+
+def _render_job(progress, data, key):
+    """(pdf_bytes, from_cache), with pdf_bytes None when the render cache holds the PDF"""
+    pdf_bytes, from_cache = cached_pdf_bytes(data)
+    if rendered_pdf_bytes(key) is not None:
+        pdf_bytes = None
+    return pdf_bytes, from_cache
+
+
+def job_pdf_bytes(job):
+    """The finished job's PDF, or None if it has since been evicted from the render cache"""
+    pdf_bytes, _ = job.result
+    return pdf_bytes if pdf_bytes is not None else rendered_pdf_bytes(job.key)
+
+
+def submit_render(owner, data, label="Quotation PDF"):
+    """Queue a render of the quotation rows for owner (e.g. a session id) and return the job id.
+
+    The job's key is quotation_key(data), so a page can tell whether a finished PDF
+    still matches the table. Raises QueueFull when too many renders are waiting.
+    """
+    # Snapshot: the session may edit its table while the job waits
+    data = [dict(row) for row in data]
+    service = get_render_service()
+    key = quotation_key(data)
+    if is_cached(data):
+        return service.record(label, _render_job(None, data, key), key=key)
+    return service.submit(label, _render_job, data, key, key=key, owner=owner)
@@ -0,0 +1,158 @@
+"""Application settings resolved once per process
+
+Configuration comes from Streamlit secrets (Streamlit Cloud) with a fallback to
+environment variables / .env (local development). It is read and validated the
+first time get_settings() is called and then reused, so client calls don't repeat
+secrets lookups. Call reload_settings() after changing secrets or the environment.
+
+Missing or invalid Supabase credentials are a configuration error (config_error). A
+malformed tuning value (IMPORT_WORKERS, RENDER_WORKERS, ...) is not: it is logged as a
+warning, listed in setting_warnings, and its default is used.
+"""
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Immutable snapshot of the app configuration"""
+    supabase_url: str = None
+    supabase_key: str = None
+    service_role_key: str = None
+    backend: str = "supabase"          # "supabase" or "fake" (see fake_supabase.py)
+    max_concurrency: int = 8           # in-flight requests for the async data layer
+    request_timeout: float = 30.0      # seconds, async data layer
+    import_workers: int = 2            # background PDF import jobs running at once
+    render_workers: int = 2            # quotation PDFs rendered at once
+    render_queue_limit: int = 20       # quotation PDFs allowed to wait for a render worker
+    config_error: str = None           # credentials validation message, None when configured
+    setting_warnings: tuple = ()       # malformed tuning values that fell back to their default
+
+    @property
+    def use_fake_backend(self):
+        return self.backend == "fake"
+
+    @property
+    def is_configured(self):
+        return self.config_error is None
+
+    def credentials(self):
+        """Return (supabase_url, supabase_key), raising ValueError if not configured"""
+        if self.config_error:
+            raise ValueError(self.config_error)
+        return self.supabase_url, self.supabase_key
+
+
+def _read_secrets():
+    """Return Streamlit secrets as a plain dict (empty outside Streamlit or without secrets)"""
+    try:
+        import streamlit as st
+        return {key: st.secrets[key] for key in st.secrets.keys()}
+    except Exception:
+        # No secrets file, not running under Streamlit, or secrets failed to parse
+        return {}
+
+
+def _validate(supabase_url, supabase_key):
+    """Return a configuration error message, or None if the credentials look usable"""
+    if not supabase_url:
+        return (
+            "SUPABASE_URL is not configured. "
+            "For local development: Create a .env file with SUPABASE_URL=your-url. "
+            "For Streamlit Cloud: Add SUPABASE_URL to your app's Secrets (Settings → Secrets). "
+            "See README.md for setup instructions."
+        )
+    if not supabase_key:
+        return (
+            "SUPABASE_KEY is not configured. "
+            "For local development: Create a .env file with SUPABASE_KEY=your-key. "
+            "For Streamlit Cloud: Add SUPABASE_KEY to your app's Secrets (Settings → Secrets). "
+            "See README.md for setup instructions."
+        )
+    # Validate URL format
+    if not supabase_url.startswith(('http://', 'https://')):
+        return (
+            "SUPABASE_URL must start with http:// or https://. "
+            "Current value appears to be invalid. "
+            "Expected format: https://ldatmittxoudwpcgdcbc.supabase.co"
+        )
+    return None
+
+
+def _resolve():
+    """Read secrets and environment once and build a validated Settings"""
+    load_dotenv()
+    secrets = _read_secrets()
+
+    def lookup(key, default=None):
+        # Streamlit secrets first (Streamlit Cloud), then os.environ (.env for local development)
+        value = secrets.get(key)
+        if value is None or value == "":
+            value = os.getenv(key)
+        return default if value is None or value == "" else value
+
+    warnings = []
+
+    def number(key, default, cast=int, minimum=1):
+        # A typo in a tuning knob must neither crash the app nor block login: use the default
+        value = lookup(key, default)
+        try:
+            parsed = cast(value)
+            if parsed >= minimum:
+                return parsed
+            warnings.append(f"{key} must be at least {minimum} (got {value!r}); using {default}.")
+        except (TypeError, ValueError):
+            warnings.append(f"{key} must be a number (got {value!r}); using {default}.")
+        logger.warning(warnings[-1])
+        return default
+
+    backend = str(lookup("SUPABASE_BACKEND", "supabase")).strip().lower()
+    supabase_url = lookup("SUPABASE_URL")
+    supabase_key = lookup("SUPABASE_KEY")
+    if backend == "fake":
+        # The local fake needs no credentials
+        supabase_url = supabase_url or "http://localhost:54321"
+        supabase_key = supabase_key or "fake-anon-key"
+
+    return Settings(
+        supabase_url=supabase_url,
+        supabase_key=supabase_key,
+        service_role_key=lookup("SUPABASE_SERVICE_ROLE_KEY"),
+        backend=backend,
+        max_concurrency=number("SUPABASE_MAX_CONCURRENCY", 8),
+        request_timeout=number("SUPABASE_TIMEOUT_SECONDS", 30.0, cast=float, minimum=0.1),
+        import_workers=number("IMPORT_WORKERS", 2),
+        render_workers=number("RENDER_WORKERS", 2),
+        render_queue_limit=number("RENDER_QUEUE_LIMIT", 20),
+        config_error=_validate(supabase_url, supabase_key),
+        setting_warnings=tuple(warnings),
+    )
+
+
+_settings = None
+_settings_lock = threading.Lock()
+
+
+def get_settings():
+    """Return the process-wide settings, resolving them on first use"""
+    global _settings
+    if _settings is None:
+        with _settings_lock:
+            if _settings is None:
+                _settings = _resolve()
+    return _settings
+
+
+def reload_settings():
+    """Re-read secrets and environment, replacing the cached settings"""
+    global _settings
+    with _settings_lock:
+        _settings = _resolve()
+    return _settings
@@ -0,0 +1,290 @@
+"""CSV/XLSX catalog imports streamed into the bulk writer
+
+A spreadsheet is read in chunks of CHUNK_ROWS rows (pandas for CSV, openpyxl in
+read-only mode for XLSX), its columns are mapped to the Drivers columns, and each
+chunk is validated with vectorized pandas operations. Valid rows are upserted through
+bulk_writer while the next chunk is being read, so memory stays bounded by the chunk
+size whatever the length of the sheet.
+
+    mapping = guess_column_mapping(spreadsheet_columns(file_bytes, "prices.csv"))
+    result = import_spreadsheet(file_bytes, "prices.csv", mapping, brand_id)
+"""
+
+import io
+import itertools
+import re
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from bulk_writer import bulk_upsert_drivers
+from supabase_async import submit
+
+try:
+    import openpyxl
+except ImportError:  # optional: only needed for .xlsx files
+    openpyxl = None
+
+CHUNK_ROWS = 5000
+
+# Rejected rows kept (with their reason) for display; the rest are only counted
+REJECTED_SAMPLE = 50
+
+FIELDS = ('Name', 'Volt', 'Watt', 'Amp', 'Price', 'Place')
+
+# Header names recognised for each field, compared lower-case without punctuation
+COLUMN_ALIASES = {
+    'Name': ('name', 'product', 'product name', 'item', 'description', 'model'),
+    'Volt': ('volt', 'volts', 'voltage', 'v', 'output voltage'),
+    'Watt': ('watt', 'watts', 'wattage', 'w', 'power'),
+    'Amp': ('amp', 'amps', 'amperage', 'a', 'current'),
+    'Price': ('price', 'cost', 'mrp', 'rate', 'list price'),
+    'Place': ('place', 'location', 'usage', 'indoor outdoor'),
+}
+
+PLACES = ('indoor', 'outdoor')
+
+_HEADER_RE = re.compile(r'[^a-z0-9]+')
+# Thousands separators ("1,250"), the one number a cell may hold, and a leading minus sign
+_THOUSANDS_RE = r'(?<=\d),(?=\d{3}(?!\d))'
+_NUMBER_RE = r'(\d+(?:\.\d+)?)'
+_NEGATIVE_RE = r'-\s*\d'
+
+
+@dataclass
+class SpreadsheetImport:
+    """Running totals of a spreadsheet import, reported after each chunk"""
+    rows_total: int = None         # estimated data rows, for progress; None if unknown
+    rows_read: int = 0
+    rows_valid: int = 0
+    rows_rejected: int = 0
+    rows_written: int = 0
+    rows_failed: int = 0
+    duplicates_dropped: int = 0
+    errors: list = field(default_factory=list)
+    insert_fallback: bool = False   # see BulkProgress.insert_fallback
+    rejected_sample: list = field(default_factory=list)   # first rejected rows, with Row and Reason
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+def _is_xlsx(file_name):
+    return file_name.lower().endswith('.xlsx')
+
+
+def _open_workbook(file_bytes):
+    if openpyxl is None:
+        raise ValueError("Reading .xlsx files needs the openpyxl package (pip install openpyxl)")
+    return openpyxl.load_workbook(io.BytesIO(file_bytes), read_only=True, data_only=True)
+
+
+def _column_names(header):
+    """Header cells as unique strings (blank cells become "Column <n>")"""
+    names = []
+    for idx, cell in enumerate(header):
+        name = str(cell).strip() if cell is not None and str(cell).strip() else f"Column {idx + 1}"
+        while name in names:
+            name += '_'
+        names.append(name)
+    return names
+
+
+def iter_chunks(file_bytes, file_name, chunk_rows=CHUNK_ROWS):
+    """Yield DataFrames of up to chunk_rows rows, all values as text.
+
+    The index numbers data rows from 0 across chunks, so index + 2 is the row number
+    a spreadsheet program shows (row 1 being the header).
+    """
+    if not _is_xlsx(file_name):
+        yield from pd.read_csv(io.BytesIO(file_bytes), dtype=str, chunksize=chunk_rows,
+                               skip_blank_lines=True, encoding_errors='replace')
+        return
+
+    workbook = _open_workbook(file_bytes)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        columns = _column_names(next(rows, ()))
+        start = 0
+        while True:
+            batch = list(itertools.islice(rows, chunk_rows))
+            if not batch:
+                break
+            chunk = pd.DataFrame([row[:len(columns)] for row in batch], columns=columns,
+                                 index=pd.RangeIndex(start, start + len(batch)))
+            start += len(batch)
+            yield chunk.astype('string')
+    finally:
+        workbook.close()
+
+
+def spreadsheet_columns(file_bytes, file_name):
+    """Column names from the header row"""
+    if _is_xlsx(file_name):
+        workbook = _open_workbook(file_bytes)
+        try:
+            return _column_names(next(workbook.active.iter_rows(values_only=True), ()))
+        finally:
+            workbook.close()
+    return list(pd.read_csv(io.BytesIO(file_bytes), nrows=0, encoding_errors='replace').columns)
+
+
+def estimate_rows(file_bytes, file_name):
+    """Approximate number of data rows (for progress), or None"""
+    if _is_xlsx(file_name):
+        workbook = _open_workbook(file_bytes)
+        try:
+            max_row = workbook.active.max_row
+        finally:
+            workbook.close()
+        return max_row - 1 if max_row else None
+    return max(0, file_bytes.rstrip(b'\r\n').count(b'\n'))
+
+
+def guess_column_mapping(columns):
+    """Map each field to the best-matching column name (exact alias first, then containment)"""
+    normalized = {column: _HEADER_RE.sub(' ', str(column).lower()).strip() for column in columns}
+    mapping = {}
+    used = set()
+    for field_name in FIELDS:
+        aliases = COLUMN_ALIASES[field_name]
+        exact = [column for column in columns if normalized[column] in aliases and column not in used]
+        partial = [column for column in columns
+                   if column not in used and any(len(alias) > 2 and alias in normalized[column] for alias in aliases)]
+        match = (exact or partial or [None])[0]
+        if match is not None:
+            mapping[field_name] = match
+            used.add(match)
+    return mapping
+
+
+def mapping_problems(mapping):
+    """Reasons the mapping can't be imported (empty when it is usable)"""
+    problems = []
+    if not mapping.get('Name'):
+        problems.append("Choose the column holding the driver name")
+    if not mapping.get('Volt'):
+        problems.append("Choose the column holding the voltage")
+    if not mapping.get('Watt') and not mapping.get('Amp'):
+        problems.append("Choose a wattage or an amperage column (at least one is required)")
+    return problems
+
+
+def _text(chunk, column):
+    if not column:
+        return pd.Series(pd.NA, index=chunk.index, dtype='string')
+    return chunk[column].astype('string').str.strip()
+
+
+def _numbers(chunk, column):
+    """The number in each cell, units and currency symbols ignored ("12V", "₹1,250") -> float.
+
+    NaN if the cell holds no number, more than one ("12-24V", "24V ±5%") or a negative one.
+    """
+    text = _text(chunk, column).str.replace(_THOUSANDS_RE, '', regex=True)
+    numbers = pd.to_numeric(text.str.extract(_NUMBER_RE, expand=False), errors='coerce').astype('float64')
+    ambiguous = text.str.count(_NUMBER_RE).gt(1) | text.str.contains(_NEGATIVE_RE, regex=True)
+    return numbers.mask(ambiguous.fillna(False).astype(bool))
+
+
+def _unreadable(chunk, column, numbers):
+    """Cells that hold something other than a blank but did not give a number"""
+    return (_text(chunk, column).fillna('').ne('') & numbers.isna()).to_numpy()
+
+
+def validate_chunk(chunk, mapping, brand_id):
+    """Validate one chunk; returns (valid rows in Drivers columns, rejected rows with Row and Reason)
+
+    Same rules as parsed PDF rows: Name and Volt are required, a missing wattage is
+    derived from volt x amp, and a missing amperage is stored as 0. Rows with no
+    values at all are dropped without being reported; a wattage, amperage or price
+    cell that does not hold a single number rejects its row.
+    """
+    chunk = chunk.dropna(how='all')
+    name = _text(chunk, mapping.get('Name'))
+    volt = _numbers(chunk, mapping.get('Volt'))
+    amp = _numbers(chunk, mapping.get('Amp'))
+    watt = _numbers(chunk, mapping.get('Watt'))
+    bad_amp = _unreadable(chunk, mapping.get('Amp'), amp)
+    bad_watt = _unreadable(chunk, mapping.get('Watt'), watt)
+    amp = amp.fillna(0.0)
+    watt = watt.fillna(np.floor(volt * amp).where(amp > 0))
+
+    reason = np.select(
+        [name.fillna('').eq(''), ~(volt > 0), bad_watt, bad_amp, ~(watt > 0)],
+        ["Missing name", "Missing or invalid voltage", "Invalid wattage", "Invalid amperage",
+         "Needs a wattage or an amperage"],
+        default='',
+    )
+
+    rows = pd.DataFrame({'Name': name, 'Volt': volt.round(), 'Watt': watt.round(), 'Amp': amp, 'Bid': brand_id},
+                        index=chunk.index)
+    if mapping.get('Price'):
+        rows['Price'] = price = _numbers(chunk, mapping['Price'])
+        bad_price = _unreadable(chunk, mapping['Price'], price)
+        reason = np.where((reason == '') & bad_price, "Invalid price", reason)
+    if mapping.get('Place'):
+        place = _text(chunk, mapping['Place']).str.lower().fillna('')
+        unknown = place.ne('') & ~place.isin(PLACES)
+        reason = np.where((reason == '') & unknown.to_numpy(), "Unknown place (use indoor or outdoor)", reason)
+        rows['Place'] = place.where(place.ne(''))
+
+    ok = reason == ''
+    valid = rows[ok].astype({'Volt': 'int64', 'Watt': 'int64'})
+    rejected = chunk[~ok].assign(Row=chunk.index[~ok] + 2, Reason=reason[~ok])
+    return valid, rejected
+
+
+def to_records(rows):
+    """DataFrame rows as plain dicts (Python numbers, None for missing values) for the writer"""
+    return rows.astype(object).where(rows.notna(), None).to_dict('records')
+
+
+def import_spreadsheet(file_bytes, file_name, mapping, brand_id, access_token=None,
+                       on_progress=None, chunk_rows=CHUNK_ROWS):
+    """Validate and upsert a whole spreadsheet chunk by chunk; returns the final SpreadsheetImport.
+
+    One chunk is written at a time (in order, so a key repeated later in the sheet wins)
+    while the next one is read and validated. on_progress(SpreadsheetImport) is called
+    after each chunk.
+    """
+    result = SpreadsheetImport(rows_total=estimate_rows(file_bytes, file_name))
+    pending = None
+
+    def finish(write):
+        future, row_count = write
+        try:
+            progress = future.result()
+        except Exception as e:
+            result.rows_failed += row_count
+            result.errors.append(str(e) or type(e).__name__)
+            return
+        result.rows_written += progress.rows_written
+        result.rows_failed += progress.rows_failed
+        result.duplicates_dropped += progress.duplicates_dropped
+        result.errors.extend(progress.errors)
+        result.insert_fallback = result.insert_fallback or progress.insert_fallback
+
+    for chunk in iter_chunks(file_bytes, file_name, chunk_rows):
+        valid, rejected = validate_chunk(chunk, mapping, brand_id)
+        result.rows_read += len(chunk)
+        result.rows_valid += len(valid)
+        result.rows_rejected += len(rejected)
+        if len(result.rejected_sample) < REJECTED_SAMPLE and len(rejected):
+            sample = rejected.head(REJECTED_SAMPLE - len(result.rejected_sample))
+            result.rejected_sample.extend(to_records(sample))
+
+        rows = to_records(valid)
+        if pending is not None:
+            finish(pending)
+        pending = (submit(bulk_upsert_drivers(rows, access_token)), len(rows)) if rows else None
+        if on_progress:
+            on_progress(result)
+
+    if pending is not None:
+        finish(pending)
+    if on_progress:
+        on_progress(result)
+    return result
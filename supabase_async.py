@@ -0,0 +1,297 @@
+"""Async Supabase data layer for concurrent fetches and inserts
+
+Asyncio twins of the public functions in supabase_client.py, talking to PostgREST
+and Supabase auth directly over one shared httpx.AsyncClient (connection pool) with
+a bounded semaphore. Streamlit pages are synchronous, so run_sync() bridges a
+coroutine onto a long-lived background event loop:
+
+    particulars, brands = run_sync(gather(fetch_particulars(), fetch_brands()))
+"""
+
+import asyncio
+import base64
+import json
+import threading
+import time
+import weakref
+from types import SimpleNamespace
+
+import httpx
+
+import fake_supabase
+from settings import get_settings
+from supabase_client import (
+    _brands_from_rows,
+    _brands_with_ids_from_rows,
+    _filter_drivers_by_location,
+    _particulars_from_rows,
+)
+
+DRIVER_COLUMNS = 'Name,Volt,Watt,Amp,Price,Bid,Place'
+
+
+class SupabaseRequestError(Exception):
+    """A PostgREST or auth request returned a non-success status"""
+
+    def __init__(self, message, status_code=None, code=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code  # PostgREST / Postgres error code, e.g. "42P10"
+
+    @property
+    def is_transient(self):
+        """True for errors worth retrying (throttling, server or gateway errors)"""
+        return self.status_code is None or self.status_code == 429 or self.status_code >= 500
+
+    @property
+    def is_missing_conflict_target(self):
+        """True when an upsert's on_conflict columns have no matching unique constraint"""
+        return self.code == '42P10'
+
+
+class SessionToken:
+    """A signed-in user's access token for background writes, renewed with the refresh token.
+
+    Wraps the session dict stored in st.session_state['supabase_session'] and updates
+    it in place on refresh, so the page keeps the newest tokens (Supabase rotates
+    refresh tokens). Formats as the current access token.
+    """
+
+    def __init__(self, session_data):
+        self._session = session_data
+        self._lock = None
+
+    def __str__(self):
+        return self._session.get('access_token') or ''
+
+    def __bool__(self):
+        return bool(self._session.get('access_token'))
+
+    @property
+    def expired(self):
+        """True if the access token's exp claim is within a minute (False if it can't be read)"""
+        try:
+            payload = str(self).split('.')[1]
+            claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+            return claims['exp'] <= time.time() + 60
+        except (IndexError, KeyError, TypeError, ValueError):
+            return False
+
+    async def refresh(self, rejected_token=None):
+        """Exchange the refresh token for new tokens, unless another write already did"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if rejected_token is not None and str(self) != rejected_token:
+                return
+            self._session.update(await refresh_session(self._session.get('refresh_token')))
+
+
+# One (client, semaphore) pair per event loop: both are bound to the loop they were created on
+_loop_resources = weakref.WeakKeyDictionary()
+
+
+def _get_resources():
+    loop = asyncio.get_running_loop()
+    resources = _loop_resources.get(loop)
+    if resources is None:
+        settings = get_settings()
+        supabase_url, _ = settings.credentials()
+        # Pool size matches the semaphore: at most max_concurrency requests in flight per loop
+        limits = httpx.Limits(max_connections=settings.max_concurrency,
+                              max_keepalive_connections=settings.max_concurrency)
+        transport = fake_supabase.http_transport() if settings.use_fake_backend else None
+        client = httpx.AsyncClient(
+            base_url=supabase_url.rstrip('/'),
+            limits=limits,
+            timeout=settings.request_timeout,
+            transport=transport,
+        )
+        resources = (client, asyncio.Semaphore(settings.max_concurrency))
+        _loop_resources[loop] = resources
+    return resources
+
+
+def _headers(access_token=None, write=False):
+    """Build PostgREST headers; writes prefer the service role key, then the user's token"""
+    settings = get_settings()
+    _, supabase_key = settings.credentials()
+    bearer = access_token or supabase_key
+    if write and settings.service_role_key:
+        bearer = settings.service_role_key
+    return {
+        'apikey': supabase_key,
+        'Authorization': f"Bearer {bearer}",
+    }
+
+
+async def _request(method, path, **kwargs):
+    client, semaphore = _get_resources()
+    async with semaphore:
+        try:
+            response = await client.request(method, path, **kwargs)
+        except httpx.HTTPError as e:
+            raise SupabaseRequestError(f"Supabase request failed: {e}") from e
+    if response.status_code >= 400:
+        try:
+            payload = response.json()
+            detail, code = payload.get('message') or response.text, payload.get('code')
+        except (ValueError, AttributeError):
+            detail, code = response.text, None
+        raise SupabaseRequestError(f"Supabase error ({response.status_code}): {detail}", response.status_code, code)
+    return response
+
+
+async def _select(table, columns='*', params=None, access_token=None):
+    query = {'select': columns}
+    query.update(params or {})
+    response = await _request('GET', f"/rest/v1/{table}", params=query, headers=_headers(access_token))
+    return response.json() or []
+
+
+async def fetch_particulars():
+    """Fetch distinct particulars from the database"""
+    return _particulars_from_rows(await _select('Particulars'))
+
+
+async def fetch_brands():
+    """Fetch distinct brand names from the database"""
+    return _brands_from_rows(await _select('Brand'))
+
+
+async def fetch_brands_with_ids():
+    """Fetch all brands with their IDs from the database"""
+    return _brands_with_ids_from_rows(await _select('Brand'))
+
+
+async def fetch_drivers(location_type: str = "both"):
+    """Fetch drivers from the Drivers table, filtered by location type if specified"""
+    return _filter_drivers_by_location(await _select('Drivers', DRIVER_COLUMNS), location_type)
+
+
+async def _write(prefer, access_token=None, **kwargs):
+    """POST to Drivers; if a SessionToken is rejected as expired (401), refresh it once and retry"""
+    rejected = str(access_token) if access_token else None
+    for attempt in range(2):
+        headers = _headers(access_token, write=True)
+        headers['Prefer'] = prefer
+        try:
+            return await _request('POST', "/rest/v1/Drivers", headers=headers, **kwargs)
+        except SupabaseRequestError as e:
+            if e.status_code != 401 or attempt or not isinstance(access_token, SessionToken):
+                raise
+        await access_token.refresh(rejected)
+
+
+async def insert_drivers_batch(drivers: list, access_token: str = None):
+    """Insert multiple driver records into the Drivers table (requires authentication)"""
+    response = await _write('return=representation', access_token, json=drivers)
+    return response.json() if response.content else []
+
+
+async def upsert_drivers_batch(drivers: list, on_conflict: str, access_token: str = None):
+    """Upsert driver records, updating rows that match the on_conflict columns.
+
+    Every row must have the same keys (PostgREST requirement for bulk payloads), and
+    the table needs a unique constraint on the on_conflict columns.
+    """
+    await _write('resolution=merge-duplicates,return=minimal', access_token,
+                 params={'on_conflict': on_conflict}, json=drivers)
+    return len(drivers)
+
+
+async def authenticate_user(email: str, password: str):
+    """Authenticate a user with email and password.
+
+    Returns (success, message, session). Unlike the synchronous version this does not
+    touch st.session_state (it may run off the script thread); pass the session to
+    store_session() from the page.
+    """
+    try:
+        response = await _request(
+            'POST',
+            "/auth/v1/token",
+            params={'grant_type': 'password'},
+            json={'email': email, 'password': password},
+            headers=_headers(),
+        )
+    except ValueError as e:
+        # Environment variable validation error
+        return False, str(e), None
+    except SupabaseRequestError as e:
+        return False, f"Authentication error: {e}", None
+
+    payload = response.json()
+    if not payload.get('access_token'):
+        return False, "Authentication failed - no session returned", None
+    session = {
+        'access_token': payload['access_token'],
+        'refresh_token': payload.get('refresh_token'),
+        'user': SimpleNamespace(**(payload.get('user') or {})),
+    }
+    return True, "Authentication successful", session
+
+
+async def refresh_session(refresh_token):
+    """New {'access_token', 'refresh_token'} for a refresh token (SupabaseRequestError if refused)"""
+    response = await _request(
+        'POST',
+        "/auth/v1/token",
+        params={'grant_type': 'refresh_token'},
+        json={'refresh_token': refresh_token},
+        headers=_headers(),
+    )
+    payload = response.json()
+    if not payload.get('access_token'):
+        raise SupabaseRequestError("Session refresh returned no access token", response.status_code)
+    return {'access_token': payload['access_token'], 'refresh_token': payload.get('refresh_token', refresh_token)}
+
+
+def store_session(session):
+    """Store a session returned by authenticate_user() the way supabase_client does"""
+    import streamlit as st
+    st.session_state['supabase_session'] = {
+        'access_token': session['access_token'],
+        'refresh_token': session['refresh_token']
+    }
+    st.session_state['supabase_user'] = session['user']
+
+
+async def gather(*aws):
+    """asyncio.gather that can be built outside a running loop and passed to run_sync()"""
+    return await asyncio.gather(*aws)
+
+
+async def aclose():
+    """Close the HTTP client bound to the current event loop"""
+    resources = _loop_resources.pop(asyncio.get_running_loop(), None)
+    if resources:
+        await resources[0].aclose()
+
+
+# --- Synchronous bridge -----------------------------------------------------
+
+_bridge_loop = None
+_bridge_lock = threading.Lock()
+
+
+def _get_bridge_loop():
+    """Start (once) a daemon thread running the event loop shared by run_sync() callers"""
+    global _bridge_loop
+    with _bridge_lock:
+        if _bridge_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="supabase-async", daemon=True)
+            thread.start()
+            _bridge_loop = loop
+        return _bridge_loop
+
+
+def submit(coro):
+    """Schedule a coroutine on the bridge loop and return a concurrent.futures.Future"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_bridge_loop())
+
+
+def run_sync(coro, timeout=None):
+    """Run a coroutine on the bridge loop from synchronous code and return its result"""
+    return submit(coro).result(timeout)
@@ -1,107 +1,58 @@
 """Supabase client for fetching data"""
 
-import os
 import streamlit as st
-from supabase import create_client
-from dotenv import load_dotenv
-
-load_dotenv()
+from supabase import create_client as _create_supabase_client
+import fake_supabase
+from settings import get_settings, reload_settings
 
 _client = None
 _authenticated_client = None
 
-def _get_env_var(key: str):
-    """Get environment variable from Streamlit secrets or os.environ"""
-    try:
-        import streamlit as st
-        from streamlit.errors import StreamlitSecretNotFoundError
-        # Try Streamlit secrets first (for Streamlit Cloud)
-        try:
-            if hasattr(st, 'secrets') and st.secrets is not None:
-                # Check if key exists in secrets (handles both dict-like and object-like access)
-                try:
-                    if key in st.secrets:
-                        return st.secrets[key]
-                except (TypeError, AttributeError):
-                    # If secrets is not dict-like, try attribute access
-                    if hasattr(st.secrets, key):
-                        return getattr(st.secrets, key)
-        except StreamlitSecretNotFoundError:
-            # Secrets file doesn't exist, fall through to os.environ
-            pass
-        except (KeyError, AttributeError):
-            # Key doesn't exist in secrets, fall through to os.environ
-            pass
-    except (AttributeError, RuntimeError, ImportError):
-        # Not in Streamlit context or secrets not available
-        pass
-    
-    # Fallback to os.environ (for local development with .env file)
-    return os.getenv(key)
+def create_client(supabase_url: str, supabase_key: str):
+    """Create a Supabase client, or the local fake when SUPABASE_BACKEND=fake"""
+    if get_settings().use_fake_backend:
+        return fake_supabase.create_client(supabase_url, supabase_key)
+    return _create_supabase_client(supabase_url, supabase_key)
 
 def _validate_env_vars():
-    """Validate that required environment variables are set"""
-    supabase_url = _get_env_var("SUPABASE_URL")
-    supabase_key = _get_env_var("SUPABASE_KEY")
-    
-    if not supabase_url:
-        raise ValueError(
-            "SUPABASE_URL is not configured. "
-            "For local development: Create a .env file with SUPABASE_URL=your-url. "
-            "For Streamlit Cloud: Add SUPABASE_URL to your app's Secrets (Settings → Secrets). "
-            "See README.md for setup instructions."
-        )
-    if not supabase_key:
-        raise ValueError(
-            "SUPABASE_KEY is not configured. "
-            "For local development: Create a .env file with SUPABASE_KEY=your-key. "
-            "For Streamlit Cloud: Add SUPABASE_KEY to your app's Secrets (Settings → Secrets). "
-            "See README.md for setup instructions."
-        )
-    
-    # Validate URL format
-    if not supabase_url.startswith(('http://', 'https://')):
-        raise ValueError(
-            f"SUPABASE_URL must start with http:// or https://. "
-            f"Current value appears to be invalid. "
-            f"Expected format: https://ldatmittxoudwpcgdcbc.supabase.co"
-        )
-    
-    return supabase_url, supabase_key
+    """Return (supabase_url, supabase_key) from the cached settings, raising ValueError if not configured"""
+    return get_settings().credentials()
+
+def reload_config():
+    """Re-read configuration and drop clients created with the previous settings"""
+    global _client, _authenticated_client
+    reload_settings()
+    _client = None
+    _authenticated_client = None
 
 def check_supabase_config():
     """Public function to check if Supabase is configured"""
-    try:
-        _validate_env_vars()
-        return True, None
-    except ValueError as e:
-        return False, str(e)
+    settings = get_settings()
+    return settings.is_configured, settings.config_error
 
 def test_supabase_connection():
     """Test the Supabase connection and return diagnostic information"""
+    settings = get_settings()
+    if not settings.is_configured:
+        return False, f"Configuration error: {settings.config_error}"
+    supabase_url, supabase_key = settings.supabase_url, settings.supabase_key
+    
+    # Extract hostname for DNS test
+    import re
+    url_match = re.search(r'https?://([^/]+)', supabase_url)
+    hostname = url_match.group(1) if url_match else None
+    
+    # Try to create client and make a simple request
     try:
-        supabase_url, supabase_key = _validate_env_vars()
-        
-        # Extract hostname for DNS test
-        import re
-        url_match = re.search(r'https?://([^/]+)', supabase_url)
-        hostname = url_match.group(1) if url_match else None
-        
-        # Try to create client and make a simple request
-        try:
-            client = create_client(supabase_url, supabase_key)
-            # Try a simple query to test connection
-            response = client.table('Particulars').select('*').limit(1).execute()
-            return True, f"Connection successful to {hostname}"
-        except Exception as e:
-            error_msg = str(e)
-            if "Name or service not known" in error_msg or "[Errno -2]" in error_msg:
-                return False, f"DNS resolution failed for hostname '{hostname}'. Check your SUPABASE_URL."
-            return False, f"Connection failed: {error_msg}"
-    except ValueError as e:
-        return False, f"Configuration error: {str(e)}"
+        client = create_client(supabase_url, supabase_key)
+        # Try a simple query to test connection
+        response = client.table('Particulars').select('*').limit(1).execute()
+        return True, f"Connection successful to {hostname}"
     except Exception as e:
-        return False, f"Unexpected error: {str(e)}"
+        error_msg = str(e)
+        if "Name or service not known" in error_msg or "[Errno -2]" in error_msg:
+            return False, f"DNS resolution failed for hostname '{hostname}'. Check your SUPABASE_URL."
+        return False, f"Connection failed: {error_msg}"
 
 def _get_client():
     """Get unauthenticated client (for reads)"""
@@ -133,10 +84,11 @@ def _get_authenticated_client():
     """Get authenticated client (for writes that require RLS)"""
     global _authenticated_client
     
-    supabase_url, supabase_key = _validate_env_vars()
+    settings = get_settings()
+    supabase_url, supabase_key = settings.credentials()
     
     # Option 1: Use service role key if available (bypasses RLS)
-    service_role_key = _get_env_var("SUPABASE_SERVICE_ROLE_KEY")
+    service_role_key = settings.service_role_key
     if service_role_key:
         if _authenticated_client is None:
             _authenticated_client = create_client(supabase_url, service_role_key)
@@ -194,53 +146,112 @@ def fetch_data(table_name: str):
     response = supabase.table(table_name).select("*").execute()
     return response.data or []
 
+def _particulars_from_rows(rows):
+    """Extract sorted distinct particulars from Particulars rows"""
+    particulars_list = []
+    for item in rows or []:
+        # Try common column name variations
+        if 'Particulars' in item:
+            value = item.get('Particulars')
+            if value:
+                particulars_list.append(str(value))
+        elif 'particulars' in item:
+            value = item.get('particulars')
+            if value:
+                particulars_list.append(str(value))
+        elif 'name' in item:
+            value = item.get('name')
+            if value:
+                particulars_list.append(str(value))
+        elif 'Name' in item:
+            value = item.get('Name')
+            if value:
+                particulars_list.append(str(value))
+        else:
+            # Fallback: find any string column except 'id'
+            for key in item.keys():
+                value = item.get(key)
+                if value and isinstance(value, str) and key.lower() != 'id':
+                    particulars_list.append(str(value))
+                    break
+    
+    return sorted(set(particulars_list))
+
+def _brands_from_rows(rows):
+    """Extract sorted distinct brand names from Brand rows"""
+    brands_list = []
+    for item in rows or []:
+        # Try common column name variations
+        if 'Brand' in item and item['Brand']:
+            brands_list.append(str(item['Brand']))
+        elif 'brand' in item and item['brand']:
+            brands_list.append(str(item['brand']))
+        elif 'name' in item and item['name']:
+            brands_list.append(str(item['name']))
+        elif 'Name' in item and item['Name']:
+            brands_list.append(str(item['Name']))
+        else:
+            # Fallback: find any string column except 'id'
+            for key, value in item.items():
+                if key.lower() != 'id' and isinstance(value, str) and value:
+                    brands_list.append(str(value))
+                    break
+    
+    return sorted(set(brands_list))
+
+def _brands_with_ids_from_rows(rows):
+    """Extract {'id', 'name'} dicts sorted by name from Brand rows"""
+    brands = []
+    for item in rows or []:
+        brand_id = item.get('id') or item.get('Id') or item.get('ID')
+        brand_name = None
+        
+        if 'Brand' in item and item['Brand']:
+            brand_name = str(item['Brand'])
+        else:
+            for key, value in item.items():
+                if key.lower() != 'id' and isinstance(value, str) and value:
+                    brand_name = str(value)
+                    break
+        
+        if brand_id and brand_name:
+            brands.append({
+                'id': brand_id,
+                'name': brand_name
+            })
+    
+    return sorted(brands, key=lambda x: x['name'])
+
+def _filter_drivers_by_location(all_drivers, location_type: str = "both"):
+    """Filter driver rows by Place (case-insensitive); "both" keeps everything"""
+    if location_type == "both":
+        return all_drivers
+    
+    # Filter drivers by Place column (case-insensitive)
+    filtered_drivers = []
+    location_type_lower = location_type.lower()
+    
+    for driver in all_drivers:
+        driver_place = driver.get('Place') or driver.get('place') or ''
+        # Case-insensitive comparison
+        if driver_place.lower() == location_type_lower:
+            filtered_drivers.append(driver)
+    
+    return filtered_drivers
+
 @st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes, hide spinner
 def fetch_particulars():
     """Fetch distinct particulars from the database"""
     try:
         supabase = _get_client()
         # Use select('*') to handle different column name variations
-        # The fallback logic below will find the correct column
+        # The fallback logic in _particulars_from_rows will find the correct column
         response = supabase.table('Particulars').select('*').execute()
         
         if hasattr(response, 'error') and response.error:
             raise Exception(f"Supabase error: {response.error}")
         
-        if response.data and len(response.data) > 0:
-            # Extract values from the 'Particulars' column (or fallback to any string column)
-            particulars_list = []
-            for item in response.data:
-                # Try common column name variations
-                if 'Particulars' in item:
-                    value = item.get('Particulars')
-                    if value:
-                        particulars_list.append(str(value))
-                elif 'particulars' in item:
-                    value = item.get('particulars')
-                    if value:
-                        particulars_list.append(str(value))
-                elif 'name' in item:
-                    value = item.get('name')
-                    if value:
-                        particulars_list.append(str(value))
-                elif 'Name' in item:
-                    value = item.get('Name')
-                    if value:
-                        particulars_list.append(str(value))
-                else:
-                    # Fallback: find any string column except 'id'
-                    for key in item.keys():
-                        value = item.get(key)
-                        if value and isinstance(value, str) and key.lower() != 'id':
-                            particulars_list.append(str(value))
-                            break
-            
-            if particulars_list:
-                return sorted(list(set(particulars_list)))
-            else:
-                return []
-        else:
-            return []
+        return _particulars_from_rows(response.data)
     except Exception as e:
         raise
 
@@ -250,31 +261,13 @@ def fetch_brands():
     try:
         supabase = _get_client()
         # Use select('*') to handle different column name variations
-        # The fallback logic below will find the correct column
+        # The fallback logic in _brands_from_rows will find the correct column
         response = supabase.table('Brand').select('*').execute()
         
         if hasattr(response, 'error') and response.error:
             raise Exception(f"Supabase error: {response.error}")
         
-        brands_list = []
-        for item in response.data or []:
-            # Try common column name variations
-            if 'Brand' in item and item['Brand']:
-                brands_list.append(str(item['Brand']))
-            elif 'brand' in item and item['brand']:
-                brands_list.append(str(item['brand']))
-            elif 'name' in item and item['name']:
-                brands_list.append(str(item['name']))
-            elif 'Name' in item and item['Name']:
-                brands_list.append(str(item['Name']))
-            else:
-                # Fallback: find any string column except 'id'
-                for key, value in item.items():
-                    if key.lower() != 'id' and isinstance(value, str) and value:
-                        brands_list.append(str(value))
-                        break
-        
-        return sorted(set(brands_list))
+        return _brands_from_rows(response.data)
     except Exception as e:
         raise
 
@@ -288,26 +281,7 @@ def fetch_brands_with_ids():
         if hasattr(response, 'error') and response.error:
             raise Exception(f"Supabase error: {response.error}")
         
-        brands = []
-        for item in response.data or []:
-            brand_id = item.get('id') or item.get('Id') or item.get('ID')
-            brand_name = None
-            
-            if 'Brand' in item and item['Brand']:
-                brand_name = str(item['Brand'])
-            else:
-                for key, value in item.items():
-                    if key.lower() != 'id' and isinstance(value, str) and value:
-                        brand_name = str(value)
-                        break
-            
-            if brand_id and brand_name:
-                brands.append({
-                    'id': brand_id,
-                    'name': brand_name
-                })
-        
-        return sorted(brands, key=lambda x: x['name'])
+        return _brands_with_ids_from_rows(response.data)
     except Exception as e:
         raise
 
@@ -342,6 +316,31 @@ def insert_drivers_batch(drivers: list):
     except Exception as e:
         raise
 
+def fetch_drivers_for_brand(brand_id, page_size: int = 1000):
+    """Fetch all drivers of one brand, uncached and paginated (PostgREST caps rows per request)"""
+    try:
+        supabase = _get_client()
+        drivers = []
+        start = 0
+        while True:
+            response = (supabase.table('Drivers')
+                        .select('Name,Volt,Watt,Amp,Price,Bid,Place')
+                        .eq('Bid', brand_id)
+                        .order('id')
+                        .range(start, start + page_size - 1)
+                        .execute())
+
+            if hasattr(response, 'error') and response.error:
+                raise Exception(f"Supabase error: {response.error}")
+
+            page = response.data or []
+            drivers.extend(page)
+            if len(page) < page_size:
+                return drivers
+            start += page_size
+    except Exception as e:
+        raise
+
 @st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes, hide spinner
 def fetch_drivers(location_type: str = "both"):
     """Fetch drivers from the Drivers table, filtered by location type if specified"""
@@ -353,22 +352,7 @@ def fetch_drivers(location_type: str = "both"):
         if hasattr(response, 'error') and response.error:
             raise Exception(f"Supabase error: {response.error}")
         
-        all_drivers = response.data or []
-        
         # Filter by location type if not "both" (case-insensitive matching)
-        if location_type == "both":
-            return all_drivers
-        
-        # Filter drivers by Place column (case-insensitive)
-        filtered_drivers = []
-        location_type_lower = location_type.lower()
-        
-        for driver in all_drivers:
-            driver_place = driver.get('Place') or driver.get('place') or ''
-            # Case-insensitive comparison
-            if driver_place.lower() == location_type_lower:
-                filtered_drivers.append(driver)
-        
-        return filtered_drivers
+        return _filter_drivers_by_location(response.data or [], location_type)
     except Exception as e:
         raise
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""Page layout of large quotations (pdf_generator._build_large_elements)
+
+    python -m pytest tests
+"""
+
+import io
+import os
+import sys
+
+import pdfplumber
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pdf_generator  # noqa: E402
+
+
+def _row(i):
+    return {"Brand": "Tycoon", "Length": f"{i % 9 + 1} m", "Voltage": 12, "LED": 120,
+            "Wattage": f"{60 + i % 50}W", "Driver": f"SMPS Slim 12V {100 + i % 5 * 50}W x{i % 3 + 1}",
+            "Price": 460.0 + i, "Discount": "-"}
+
+
+def _render(row_count, monkeypatch):
+    """(page texts, planned page sizes) of a quotation with row_count rows"""
+    planned = []
+    page_sizes = pdf_generator._page_sizes
+
+    def spy(*args):
+        planned[:] = page_sizes(*args)
+        return list(planned)
+
+    monkeypatch.setattr(pdf_generator, '_page_sizes', spy)
+    pdf_bytes = pdf_generator.render_pdf_bytes([_row(i) for i in range(row_count)])
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        return [page.extract_text() or '' for page in pdf.pages], planned
+
+
+@pytest.fixture(scope='module')
+def totals_boundary():
+    """(row_count, pages, planned) of the first large quotation whose totals no longer fit
+    after its last rows, while one row fewer still fits them"""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        row_count = pdf_generator.LARGE_QUOTE_ROWS + 1
+        fits = False
+        while True:
+            pages, planned = _render(row_count, monkeypatch)
+            if fits and planned[-1] == 0:
+                return row_count, pages, planned
+            fits = planned[-1] > 0
+            row_count += 1
+
+
+def test_totals_page_has_no_header_or_subtotal(totals_boundary):
+    _, pages, planned = totals_boundary
+    assert len(pages) == len(planned)
+    last = pages[-1]
+    assert 'Total Items' in last
+    assert 'Total' in last.replace('Total Items', '')
+    assert 'Page subtotal' not in last
+    assert 'Driver' not in last
+    assert 'Page subtotal' in pages[-2]
+
+
+def test_totals_fit_one_row_below_the_boundary(totals_boundary, monkeypatch):
+    row_count, _, _ = totals_boundary
+    pages, planned = _render(row_count - 1, monkeypatch)
+    assert planned[-1] > 0
+    assert len(pages) == len(planned)
+    assert 'Page subtotal' in pages[-1]
+    assert 'Total Items' in pages[-1]